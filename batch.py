@@ -0,0 +1,8 @@
+"""배치 처리 진입점"""
+import sys
+
+from image_processing.batch import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""필터 / 변환 함수 마이크로 벤치마크
+
+filters.py와 transforms.py의 모든 함수를 해상도(VGA ~ 50MP), 채널 수, 자료형,
+파라미터 조합별로 실행해 메가픽셀당 시간과 메모리 사용량을 측정한다.
+
+    python -m benchmarks.bench_ops --quick
+    python -m benchmarks.bench_ops --save baseline.json
+    python -m benchmarks.bench_ops --compare baseline.json
+
+메모리는 tracemalloc으로 측정한다. NumPy 배열과 OpenCV가 돌려주는 결과 배열은
+NumPy 할당자를 거치므로 추적되지만, OpenCV 내부의 임시 버퍼는 보이지 않는다.
+peak_buffers는 최대 메모리를 입력 이미지 크기로 나눈 값으로, 동시에 살아 있던
+이미지 크기 버퍼 수(중간 할당 수)를 나타낸다.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+import image_processing.filters as filters
+import image_processing.transforms as transforms
+
+
+# 이름 -> (너비, 높이)
+RESOLUTIONS = {
+    'vga': (640, 480),
+    'hd': (1280, 720),
+    'fhd': (1920, 1080),
+    '12mp': (4000, 3000),
+    '50mp': (8192, 6144),
+}
+QUICK_RESOLUTIONS = ('vga', 'hd')
+
+DTYPES = {'uint8': np.uint8, 'uint16': np.uint16, 'float32': np.float32}
+
+# (함수, 파라미터 조합 목록)
+CASES = [
+    (filters.apply_grayscale, [{}]),
+    (filters.apply_gaussian_blur, [{'kernel_size': (5, 5)}, {'kernel_size': (15, 15)},
+                                   {'kernel_size': (31, 31)}]),
+    (filters.apply_gaussian_sigma, [{'sigma': 2.0}, {'sigma': 8.0}, {'sigma': 32.0},
+                                    {'sigma': 32.0, 'exact': True}]),
+    (filters.apply_sharpening, [{}]),
+    (filters.apply_canny, [{'threshold1': 100, 'threshold2': 200}]),
+    (filters.apply_sobel, [{}]),
+    (filters.apply_laplacian, [{}]),
+    (filters.apply_erode, [{'kernel_size': (5, 5)}, {'kernel_size': (15, 15), 'iterations': 2}]),
+    (filters.apply_dilate, [{'kernel_size': (5, 5)}, {'kernel_size': (15, 15), 'iterations': 2}]),
+    (filters.apply_threshold, [{'threshold': 127}]),
+    (filters.apply_histogram_stretching, [{}, {'clip_percent': 1.0}]),
+    (filters.apply_histogram_eq, [{}]),
+    (filters.apply_sepia, [{}]),
+    (filters.apply_emboss, [{}]),
+    (filters.apply_median_blur, [{'ksize': 3}, {'ksize': 9}, {'ksize': 15}]),
+    (filters.apply_unsharp_mask, [{'sigma': 2.0, 'strength': 1.5}, {'sigma': 8.0, 'strength': 1.5}]),
+    (filters.apply_opening, [{'kernel_size': (5, 5)}, {'kernel_size': (15, 15)}]),
+    (filters.apply_closing, [{'kernel_size': (5, 5)}, {'kernel_size': (15, 15)}]),
+    (filters.to_gray, [{}]),
+    (filters.threshold_gray, [{'threshold': 127}]),
+    (filters.canny_gray, [{'threshold1': 100, 'threshold2': 200}]),
+    (filters.sobel_gray, [{}]),
+    (filters.laplacian_gray, [{}]),
+    (transforms.adjust_brightness, [{'value': 40}]),
+    (transforms.adjust_contrast, [{'value': 1.5}]),
+    (transforms.scale_image, [{'scale_percent': 50}, {'scale_percent': 200}]),
+    (transforms.translate_image, [{'tx': 50, 'ty': 30}]),
+    (transforms.rotate_image, [{'angle': 30}]),
+]
+
+# 기본 비교 허용치: 1.10 = 10% 이상 느려지면 회귀로 표시
+DEFAULT_THRESHOLD = 1.10
+
+
+def missing_cases():
+    """벤치마크 케이스가 없는 공개 함수 이름 목록"""
+    covered = {func for func, _ in CASES}
+    missing = []
+    for module in (filters, transforms):
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if func.__module__ == module.__name__ and not name.startswith('_') and func not in covered:
+                missing.append(f"{module.__name__}.{name}")
+    return missing
+
+
+def make_image(width, height, channels, dtype):
+    """재현 가능한 합성 이미지 (그라데이션 + 잡음)"""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    base = (x + y) * 0.5
+    info = np.iinfo(dtype) if np.issubdtype(dtype, np.integer) else None
+    peak = info.max if info is not None else 1.0
+    planes = []
+    for c in range(channels):
+        noise = rng.random((height, width), dtype=np.float32) * 0.3
+        planes.append(np.clip(base * 0.7 + noise + c * 0.05, 0, 1) * peak)
+    image = np.stack(planes, axis=2) if channels > 1 else planes[0]
+    return image.astype(dtype)
+
+
+def case_id(func, params, size, channels, dtype):
+    """결과 비교에 쓰는 케이스 식별자"""
+    args = ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return f"{func.__name__}({args})@{size}/{channels}ch/{dtype}"
+
+
+def time_call(func, image, params, repeat, min_time):
+    """min_time 이상 걸리도록 반복해 1회 소요 시간의 최솟값 / 중앙값 반환"""
+    times = []
+    total = 0.0
+    while len(times) < repeat or (total < min_time and len(times) < repeat * 10):
+        start = time.perf_counter()
+        func(image, **params)
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return min(times), statistics.median(times)
+
+
+def measure_memory(func, image, params):
+    """한 번 실행하는 동안의 추적 메모리 최댓값 (바이트)"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func(image, **params)
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def run_case(func, params, size, channels, dtype_name, repeat, min_time):
+    """케이스 하나 측정 -> 결과 기록"""
+    width, height = RESOLUTIONS[size]
+    megapixels = width * height / 1e6
+    record = {
+        'id': case_id(func, params, size, channels, dtype_name),
+        'op': func.__name__, 'params': {k: list(v) if isinstance(v, tuple) else v
+                                        for k, v in params.items()},
+        'size': size, 'width': width, 'height': height,
+        'channels': channels, 'dtype': dtype_name, 'status': 'ok',
+    }
+    image = make_image(width, height, channels, DTYPES[dtype_name])
+    try:
+        # 첫 실행은 OpenCV 초기화 비용이 섞이므로 측정에서 제외
+        func(image, **params)
+        best, median = time_call(func, image, params, repeat, min_time)
+        peak = measure_memory(func, image, params)
+    except Exception as e:
+        # 그레이스케일 / 16비트를 지원하지 않는 연산 등
+        record['status'] = 'unsupported'
+        # cv2.error는 err에 여러 줄짜리 요약 메시지가 들어 있으므로 한 줄로 합침
+        message = getattr(e, 'err', None) or str(e)
+        record['error'] = f"{type(e).__name__}: {' '.join(message.replace('>', ' ').split())}"
+        return record
+    record.update({
+        'time_s': best,
+        'median_s': median,
+        'ms_per_mp': best * 1000 / megapixels,
+        'peak_bytes': peak,
+        'peak_buffers': peak / image.nbytes,
+    })
+    return record
+
+
+def environment():
+    """결과 파일에 남길 실행 환경"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'cv_threads': cv2.getNumThreads(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def run_benchmarks(sizes, channels_list, dtypes, name_filter=None, repeat=5,
+                   min_time=0.2, progress=None):
+    """전체 케이스 행렬 실행"""
+    results = []
+    for func, param_sets in CASES:
+        if name_filter and name_filter not in func.__name__:
+            continue
+        for params in param_sets:
+            for size in sizes:
+                for channels in channels_list:
+                    for dtype_name in dtypes:
+                        record = run_case(func, params, size, channels, dtype_name,
+                                          repeat, min_time)
+                        results.append(record)
+                        if progress is not None:
+                            progress(record)
+    return {'environment': environment(), 'results': results}
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """기준 결과와 비교 -> (케이스 식별자, 기준 ms/MP, 현재 ms/MP, 비율, 회귀 여부) 목록"""
+    old = {r['id']: r for r in baseline['results'] if r['status'] == 'ok'}
+    rows = []
+    for record in current['results']:
+        previous = old.get(record['id'])
+        if previous is None or record['status'] != 'ok':
+            continue
+        ratio = record['ms_per_mp'] / previous['ms_per_mp'] if previous['ms_per_mp'] else 0.0
+        rows.append((record['id'], previous['ms_per_mp'], record['ms_per_mp'], ratio,
+                     ratio > threshold))
+    return rows
+
+
+def format_record(record):
+    """진행 상황 한 줄 출력 형식"""
+    if record['status'] != 'ok':
+        return f"  -  {record['id']:<70} {record['error']}"
+    return (f"{record['id']:<75} {record['ms_per_mp']:9.2f} ms/MP "
+            f"{record['peak_bytes'] / 1e6:9.1f} MB  x{record['peak_buffers']:.1f}")
+
+
+def main(argv=None):
+    """벤치마크 명령행 진입점"""
+    parser = argparse.ArgumentParser(description="필터 / 변환 마이크로 벤치마크")
+    parser.add_argument('--sizes', default=",".join(RESOLUTIONS),
+                        help=f"해상도 목록 ({', '.join(RESOLUTIONS)})")
+    parser.add_argument('--quick', action='store_true',
+                        help=f"작은 해상도만 측정 ({', '.join(QUICK_RESOLUTIONS)})")
+    parser.add_argument('--channels', default='3,1', help="채널 수 목록 (기본: 3,1)")
+    parser.add_argument('--dtypes', default='uint8', help=f"자료형 목록 ({', '.join(DTYPES)})")
+    parser.add_argument('--filter', default=None, help="함수 이름에 포함된 문자열로 선택")
+    parser.add_argument('--repeat', type=int, default=5, help="최소 반복 횟수")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="케이스별 최소 측정 시간(초)")
+    parser.add_argument('--cv-threads', type=int, default=None, help="OpenCV 스레드 수")
+    parser.add_argument('--save', default=None, help="결과를 저장할 JSON 파일")
+    parser.add_argument('--compare', default=None, help="비교할 기준 JSON 파일")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="회귀로 표시할 시간 비율 (기본: 1.10)")
+    args = parser.parse_args(argv)
+
+    if args.cv_threads is not None:
+        cv2.setNumThreads(args.cv_threads)
+    sizes = list(QUICK_RESOLUTIONS) if args.quick else args.sizes.split(',')
+    for size in sizes:
+        if size not in RESOLUTIONS:
+            parser.error(f"알 수 없는 해상도: {size}")
+    channels_list = [int(c) for c in args.channels.split(',')]
+    dtypes = args.dtypes.split(',')
+    for dtype_name in dtypes:
+        if dtype_name not in DTYPES:
+            parser.error(f"알 수 없는 자료형: {dtype_name}")
+
+    for name in missing_cases():
+        print(f"⚠️ 벤치마크 케이스 없음: {name}")
+
+    report = run_benchmarks(sizes, channels_list, dtypes, args.filter, args.repeat,
+                            args.min_time, progress=lambda r: print(format_record(r), flush=True))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        regressions = [row for row in rows if row[4]]
+        print(f"\n기준 대비 ({args.compare}, {len(rows)}개 케이스)")
+        for case, old, new, ratio, regressed in rows:
+            mark = "❌" if regressed else "  "
+            print(f"{mark} {case:<75} {old:9.2f} -> {new:9.2f} ms/MP  x{ratio:.2f}")
+        print(f"회귀 {len(regressions)}개 (허용치 x{args.threshold:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""최적화 실행 경로의 결과 동치 검사
+
+무작위로 만든 레이어 스택을 최적화한 경로와 그렇지 않은 경로로 각각 실행해
+결과가 비트 단위로 같은지 확인한다. 하나라도 다르면 종료 코드 1로 끝난다.
+
+    python -m benchmarks.check_equivalence
+    python -m benchmarks.check_equivalence --stacks 500 --seed 7 --seeds 5
+
+fusion  run_layers(fuse=True)와 fuse=False를 비교한다. BGR 입력은 채널 배치와 융합을
+        모두 끈 실행(원래 함수를 순서대로 호출)과도 비교한다. 기하학적 변환은 합치면
+        보간이 한 번만 일어나 의도적으로 결과가 다르므로(fusion 참고) 넣지 않는다.
+tiling  tiling.run_tiled와 전체 이미지 실행을 무작위 타일 크기 / 작업자 수로 비교한다.
+        무작위 스택이 어떤 연산을 뽑는지와 관계없이, 모든 연산을 자료형마다 하나씩
+        단독으로도 검사한다.
+        피라미드로 근사하는 gaussian_sigma는 타일마다 피라미드 격자가 달라 화소 단위로
+        같지 않으므로 따로 오차 한도(blur 참고) 안에 드는지만 확인한다.
+
+입력 자료형은 uint8과 uint16, 채널 수는 3과 1 중에서 고른다. 시드마다 결과가
+달라지므로 기본으로 여러 시드(--seeds)를 이어서 검사한다. 두 경로가 모두 같은
+종류의 예외를 내면(16비트를 지원하지 않는 연산 등) 지원하지 않는 조합으로 센다.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from image_processing.pipeline import LayerSpec, Pipeline, run_layers
+from image_processing.tiling import run_tiled
+
+
+# 연산 이름 -> 파라미터 후보 목록
+FUSION_OPS = {
+    'brightness': [{'value': 40}, {'value': -25}],
+    'contrast': [{'value': 1.4}, {'value': 0.7}],
+    'threshold': [{'threshold': 90}, {'threshold': 160}],
+    'grayscale': [{}],
+    'sepia': [{}],
+    'gaussian_blur': [{'kernel_size': (5, 5)}],
+    'sobel': [{}],
+    'canny': [{'threshold1': 100, 'threshold2': 200}],
+    'erode': [{'kernel_size': (3, 3)}],
+    'histogram_eq': [{}],
+}
+
+# 타일로 나눌 수 있는 연산 (gaussian_sigma는 직접 계산하는 시그마만)
+TILING_OPS = {
+    'brightness': [{'value': 40}],
+    'contrast': [{'value': 1.4}],
+    'threshold': [{'threshold': 120}],
+    'grayscale': [{}],
+    'sepia': [{}],
+    'gaussian_blur': [{'kernel_size': (5, 5)}, {'kernel_size': (15, 15)}],
+    'gaussian_sigma': [{'sigma': 2.5}, {'sigma': 9.0, 'exact': True}],
+    'median_blur': [{'ksize': 3}, {'ksize': 5}],
+    'erode': [{'kernel_size': (5, 5)}, {'kernel_size': (3, 3), 'iterations': 3}],
+    'dilate': [{'kernel_size': (5, 5)}],
+    'opening': [{'kernel_size': (5, 5)}],
+    'closing': [{'kernel_size': (7, 7)}],
+    'sharpening': [{}],
+    'emboss': [{}],
+    'sobel': [{}],
+    'laplacian': [{}],
+    'unsharp_mask': [{'sigma': 2.0, 'strength': 1.5}, {'sigma': 5.0, 'strength': 1.2}],
+}
+
+# 피라미드 근사 시그마와 자료형별 허용 오차 (값 범위 대비 비율)
+PYRAMID_SIGMAS = [12.0, 24.0]
+PYRAMID_TOLERANCE = {'uint8': 2 / 255, 'uint16': 0.002}
+
+TILE_SIZES = [32, 48, 64, 100]
+
+DTYPES = {'uint8': np.uint8, 'uint16': np.uint16}
+
+DEFAULT_STACKS = 200
+DEFAULT_SEEDS = 3
+MAX_STACK_LENGTH = 7
+
+
+def random_image(rng, height, width, channels, dtype):
+    """자료형 전체 범위의 잡음에 부드러운 그라데이션을 섞은 이미지"""
+    peak = np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else 1.0
+    x = np.linspace(0, 1, width)
+    y = np.linspace(0, 1, height)[:, None]
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    noise = rng.random(shape)
+    base = ((x + y) * 0.5)[..., None] if channels > 1 else (x + y) * 0.5
+    return (np.clip(base * 0.6 + noise * 0.4, 0, 1) * peak).astype(dtype)
+
+
+def random_steps(rng, ops, max_length=MAX_STACK_LENGTH):
+    """ops에서 무작위로 고른 레이어들의 (이름, 함수, 파라미터, 캐시 키) 목록"""
+    pipeline = Pipeline()
+    names = list(ops)
+    for _ in range(rng.integers(1, max_length + 1)):
+        op = names[rng.integers(len(names))]
+        candidates = ops[op]
+        pipeline.add(LayerSpec.create(op, candidates[rng.integers(len(candidates))]))
+    return pipeline.steps()
+
+
+def single_step(op, params):
+    """레이어 하나짜리 단계 목록"""
+    pipeline = Pipeline()
+    pipeline.add(LayerSpec.create(op, params))
+    return pipeline.steps()
+
+
+def describe_steps(steps):
+    """실패 보고용 스택 설명"""
+    return " -> ".join(f"{name}{dict(params) or ''}" for name, _, params, _ in steps)
+
+
+def max_difference(a, b):
+    """두 결과의 최대 차이 (모양이나 자료형이 다르면 None)"""
+    if a.shape != b.shape or a.dtype != b.dtype:
+        return None
+    return float(np.abs(a.astype(np.float64) - b.astype(np.float64)).max())
+
+
+def compare_runs(expected, actual, tolerance=0):
+    """두 실행 함수의 결과 비교 -> ('ok' | 'unsupported' | 'mismatch', 설명)"""
+    try:
+        reference = expected()
+    except Exception as e:
+        try:
+            actual()
+        except Exception as other:
+            if type(other) is type(e):
+                return 'unsupported', type(e).__name__
+            return 'mismatch', f"예외가 다름: {type(e).__name__} / {type(other).__name__}: {other}"
+        return 'mismatch', f"기준 실행만 실패: {type(e).__name__}: {e}"
+    try:
+        result = actual()
+    except Exception as e:
+        return 'mismatch', f"최적화 실행만 실패: {type(e).__name__}: {e}"
+    difference = max_difference(reference, result)
+    if difference is None:
+        return 'mismatch', (f"모양/자료형이 다름: {reference.shape} {reference.dtype}"
+                            f" / {result.shape} {result.dtype}")
+    if difference > tolerance:
+        return 'mismatch', f"최대 차이 {difference:g} (허용 {tolerance:g})"
+    return 'ok', ""
+
+
+def check_fusion(rng, count, height, width):
+    """융합 / 채널 배치를 켠 실행과 끈 실행 비교 -> 결과 목록"""
+    results = []
+    for _ in range(count):
+        steps = random_steps(rng, FUSION_OPS)
+        dtype_name = list(DTYPES)[rng.integers(len(DTYPES))]
+        channels = 3 if rng.random() < 0.7 else 1
+        image = random_image(rng, height, width, channels, DTYPES[dtype_name])
+        label = f"{dtype_name}/{channels}ch: {describe_steps(steps)}"
+
+        def fused():
+            return run_layers(image, steps)
+
+        def unfused():
+            return run_layers(image, steps, fuse=False)
+
+        results.append(('fusion', label) + compare_runs(unfused, fused))
+        if channels == 3:
+            def plain():
+                return run_layers(image, steps, fuse=False, layouts=False)
+            results.append(('fusion', f"{label} (원래 함수)") + compare_runs(plain, fused))
+    return results
+
+
+def check_tiling(rng, count, height, width):
+    """타일 실행과 전체 이미지 실행 비교 -> 결과 목록"""
+    results = []
+    cases = [(random_steps(rng, TILING_OPS), 0.0, None) for _ in range(count)]
+    # 모든 연산을 자료형마다 단독으로 (3채널)
+    for op, candidates in TILING_OPS.items():
+        for params in candidates:
+            for dtype_name in DTYPES:
+                cases.append((single_step(op, params), 0.0, dtype_name))
+    for sigma in PYRAMID_SIGMAS:
+        cases.append((single_step('gaussian_sigma', {'sigma': sigma}), None, None))
+    for steps, tolerance, dtype_name in cases:
+        if dtype_name is None:
+            dtype_name = list(DTYPES)[rng.integers(len(DTYPES))]
+            channels = 3 if rng.random() < 0.7 else 1
+        else:
+            channels = 3
+        dtype = DTYPES[dtype_name]
+        image = random_image(rng, height, width, channels, dtype)
+        tile_size = TILE_SIZES[rng.integers(len(TILE_SIZES))]
+        workers = int(rng.integers(1, 3))
+        if tolerance is None:
+            tolerance = PYRAMID_TOLERANCE[dtype_name] * np.iinfo(dtype).max
+        label = (f"{dtype_name}/{channels}ch, 타일 {tile_size} x 작업자 {workers}:"
+                 f" {describe_steps(steps)}")
+
+        def whole():
+            return run_layers(image, steps)
+
+        def tiled():
+            return run_tiled(image, steps, tile_size, workers)
+
+        results.append(('tiling', label) + compare_runs(whole, tiled, tolerance))
+    return results
+
+
+def report(results):
+    """검사 결과 출력 -> 불일치 수"""
+    mismatches = [r for r in results if r[2] == 'mismatch']
+    for check, label, _, detail in mismatches:
+        print(f"❌ [{check}] {label}\n     {detail}")
+    for check in dict.fromkeys(r[0] for r in results):
+        rows = [r for r in results if r[0] == check]
+        counts = {status: sum(1 for r in rows if r[2] == status)
+                  for status in ('ok', 'unsupported', 'mismatch')}
+        print(f"{check:<8} 일치 {counts['ok']} · 지원 안 함 {counts['unsupported']}"
+              f" · 불일치 {counts['mismatch']}")
+    return len(mismatches)
+
+
+def main(argv=None):
+    """동치 검사 명령행 진입점"""
+    parser = argparse.ArgumentParser(description="융합 / 타일 실행 결과 동치 검사")
+    parser.add_argument('--stacks', type=int, default=DEFAULT_STACKS,
+                        help=f"검사별 무작위 스택 수 (기본: {DEFAULT_STACKS})")
+    parser.add_argument('--seed', type=int, default=0, help="첫 난수 시드 (기본: 0)")
+    parser.add_argument('--seeds', type=int, default=DEFAULT_SEEDS,
+                        help=f"--seed부터 이어서 검사할 시드 수 (기본: {DEFAULT_SEEDS})")
+    parser.add_argument('--size', default='157x211', help="입력 크기 높이x너비 (기본: 157x211)")
+    args = parser.parse_args(argv)
+
+    height, width = (int(v) for v in args.size.lower().split('x'))
+    results = []
+    for seed in range(args.seed, args.seed + args.seeds):
+        rng = np.random.default_rng(seed)
+        results += check_fusion(rng, args.stacks, height, width)
+        results += check_tiling(rng, args.stacks, height, width)
+    mismatches = report(results)
+    print("✅ 모두 일치" if not mismatches else f"❌ 불일치 {mismatches}개")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""레이어 파이프라인 배치 처리 (GUI 없이 여러 이미지에 적용)"""
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from image_processing.buffer_pool import BufferPool
+from image_processing.pipeline import Pipeline
+from image_processing.tiling import pipeline_halo, run_tiled
+from utils.file_handler import read_image, write_image
+from utils.memmap_io import create_image_memmap, flush, is_memmap_format
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.npy')
+
+# 작업 중 중단되어도 이어서 처리할 수 있도록 완료된 이미지를 한 줄씩 기록
+MANIFEST_NAME = 'batch_manifest.jsonl'
+SUMMARY_JSON_NAME = 'batch_summary.json'
+SUMMARY_CSV_NAME = 'batch_summary.csv'
+
+SUMMARY_FIELDS = ['input', 'output', 'status', 'read_s', 'process_s', 'write_s',
+                  'total_s', 'error']
+
+# 작업자 프로세스별 파이프라인과 타일 크기 (초기화 함수에서 한 번만 생성)
+_worker_pipeline = None
+_worker_tile_size = None
+_worker_memmap = False
+# 같은 크기의 이미지가 이어지면 레이어 출력 버퍼를 다시 씀
+_worker_pool = None
+
+
+def collect_inputs(patterns):
+    """디렉터리 또는 glob 패턴 목록에서 이미지 경로 수집 (중복 제거, 정렬)"""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for name in os.listdir(pattern):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.add(os.path.join(pattern, name))
+        else:
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path):
+                    paths.add(path)
+    return sorted(paths)
+
+
+def input_root(inputs):
+    """입력 경로들의 공통 상위 디렉터리 (드라이브가 달라 구할 수 없으면 None)"""
+    if not inputs:
+        return None
+    try:
+        return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs])
+    except ValueError:
+        return None
+
+
+def output_path_for(input_path, output_dir, extension=None, root=None):
+    """입력 경로에 대응하는 출력 경로 (root가 주어지면 그 아래 하위 디렉터리 구조를 유지)"""
+    if root is None:
+        relative = os.path.basename(input_path)
+    else:
+        relative = os.path.relpath(os.path.abspath(input_path), root)
+    stem, ext = os.path.splitext(relative)
+    return os.path.join(output_dir, stem + (extension or ext))
+
+
+def output_paths(inputs, output_dir, extension=None):
+    """입력 목록의 출력 경로 목록
+
+    서로 다른 디렉터리의 같은 이름 파일이 덮어쓰지 않도록 공통 상위 디렉터리 기준
+    상대 경로를 출력 디렉터리에 그대로 옮긴다. 그래도 겹치거나(--ext로 확장자만 다른
+    입력) 입력 파일을 덮어쓰게 되면 ValueError.
+    """
+    root = input_root(inputs)
+    sources = {os.path.normcase(os.path.abspath(p)): p for p in inputs}
+    owners = {}
+    outputs = []
+    for input_path in inputs:
+        output_path = output_path_for(input_path, output_dir, extension, root)
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in owners:
+            raise ValueError(f"출력 경로가 겹칩니다: {owners[key]}, {input_path} -> {output_path}")
+        if key in sources:
+            raise ValueError(f"출력이 입력 파일을 덮어씁니다: {sources[key]}")
+        owners[key] = input_path
+        outputs.append(output_path)
+    return outputs
+
+
+def run_signature(pipeline, extension=None, tile_size=None):
+    """출력 결과를 정하는 설정(활성 레이어, 출력 확장자, 타일 크기)의 해시
+
+    이어서 처리할 때 파이프라인이나 출력 옵션이 바뀌었으면 이전 결과를 다시 쓰지 않도록
+    매니페스트 기록마다 남긴다.
+    """
+    layers = [{'op': spec.op, 'params': spec.kwargs} for spec in pipeline.enabled_layers]
+    data = {'layers': layers, 'extension': extension, 'tile_size': tile_size}
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def load_manifest(output_dir):
+    """이전 실행에서 완료된 기록 (입력 경로 -> 기록)"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 중단 시점에 잘린 마지막 줄은 무시
+                continue
+            records[record['input']] = record
+    return records
+
+
+def _init_worker(pipeline_data, cv_threads, tile_size=None, memmap=False):
+    """작업자 프로세스 초기화 (OpenCV 스레드 수 제한 후 파이프라인 생성)"""
+    global _worker_pipeline, _worker_tile_size, _worker_memmap, _worker_pool
+    # 프로세스 수 x OpenCV 내부 스레드 수가 코어 수를 넘지 않도록 제한
+    cv2.setNumThreads(cv_threads)
+    _worker_pipeline = Pipeline.from_dict(pipeline_data)
+    _worker_tile_size = tile_size
+    _worker_memmap = memmap
+    _worker_pool = BufferPool()
+
+
+def read_input(input_path):
+    """입력 이미지 읽기
+
+    .npy는 cv2.imread로 읽을 수 없으므로 모드와 관계없이 file_handler로 읽고,
+    메모리 맵 모드에서는 비압축 TIFF도 원래 자료형 그대로 메모리 맵으로 연다.
+    """
+    if _worker_memmap or input_path.lower().endswith('.npy'):
+        return read_image(input_path, raw=True)
+    return cv2.imread(input_path)
+
+
+def process_image(input_path, output_path):
+    """이미지 한 장 처리 후 단계별 소요 시간 기록 반환"""
+    record = {'input': input_path, 'output': output_path, 'status': 'ok',
+              'read_s': 0.0, 'process_s': 0.0, 'write_s': 0.0, 'total_s': 0.0,
+              'error': ''}
+    start = time.perf_counter()
+    try:
+        # 메모리 맵으로 열면 .npy / 비압축 TIFF를 풀지 않고 필요한 영역만 읽음
+        image = read_input(input_path)
+        if image is None:
+            raise ValueError("이미지를 읽을 수 없습니다")
+        read_done = time.perf_counter()
+        steps = _worker_pipeline.steps()
+        tiled = _worker_tile_size and pipeline_halo(steps, image.dtype) is not None
+        # 타일 결과를 메모리 맵 출력 파일에 바로 기록하면 출력 전체를 메모리에 두지 않음
+        if tiled and _worker_memmap and is_memmap_format(output_path):
+            result = run_tiled(image, steps, _worker_tile_size,
+                               out=lambda shape, dtype: create_image_memmap(output_path, shape, dtype))
+            process_done = time.perf_counter()
+            flush(result)
+            del result
+        else:
+            # 타일로 나눌 수 있는 스택이면 중간 결과 메모리를 타일 크기로 제한
+            if tiled:
+                result = run_tiled(image, steps, _worker_tile_size)
+            else:
+                result = _worker_pipeline.run(image, pool=_worker_pool)
+            process_done = time.perf_counter()
+            # .npy 출력도 같은 경로로 기록 (다른 형식은 cv2.imencode)
+            written = write_image(output_path, result)
+            _worker_pool.release(result)
+            if not written:
+                raise ValueError("이미지를 저장할 수 없습니다")
+        write_done = time.perf_counter()
+        record['read_s'] = read_done - start
+        record['process_s'] = process_done - read_done
+        record['write_s'] = write_done - process_done
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['total_s'] = time.perf_counter() - start
+    return record
+
+
+def write_summary(output_dir, records, wall_time):
+    """이미지별 소요 시간과 실패 목록을 JSON / CSV로 저장"""
+    ok = [r for r in records if r['status'] == 'ok']
+    failed = [r for r in records if r['status'] != 'ok']
+    summary = {
+        'total': len(records),
+        'succeeded': len(ok),
+        'failed': len(failed),
+        'wall_time_s': wall_time,
+        'mean_total_s': sum(r['total_s'] for r in ok) / len(ok) if ok else 0.0,
+        'failures': [{'input': r['input'], 'error': r['error']} for r in failed],
+        'images': records,
+    }
+    with open(os.path.join(output_dir, SUMMARY_JSON_NAME), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(output_dir, SUMMARY_CSV_NAME), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+    return summary
+
+
+def run_batch(pipeline, inputs, output_dir, workers=None, cv_threads=1,
+              extension=None, resume=True, progress=None, tile_size=None, memmap=False):
+    """이미지 목록에 파이프라인을 병렬 적용
+
+    이미 매니페스트에 같은 설정(run_signature)으로 성공이 기록되고 출력 파일이 남아 있는
+    이미지는 건너뛴다.
+    progress(완료 수, 전체 수, 기록)가 주어지면 이미지마다 호출한다.
+    memmap이 참이면 .npy / 비압축 TIFF 입출력을 메모리 맵으로 처리한다.
+    출력 경로가 겹치면 작업을 시작하기 전에 ValueError.
+    """
+    outputs = output_paths(inputs, output_dir, extension)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    signature = run_signature(pipeline, extension, tile_size)
+    done = load_manifest(output_dir) if resume else {}
+    records = []
+    jobs = []
+    for input_path, output_path in zip(inputs, outputs):
+        previous = done.get(input_path)
+        if (previous and previous['status'] == 'ok' and previous.get('signature') == signature
+                and os.path.exists(output_path)):
+            records.append(previous)
+        else:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            jobs.append((input_path, output_path))
+
+    start = time.perf_counter()
+    manifest_mode = 'a' if resume else 'w'
+    with open(os.path.join(output_dir, MANIFEST_NAME), manifest_mode, encoding='utf-8') as manifest:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(pipeline.to_dict(), cv_threads, tile_size, memmap)) as executor:
+            futures = [executor.submit(process_image, *job) for job in jobs]
+            for future in as_completed(futures):
+                record = future.result()
+                record['signature'] = signature
+                records.append(record)
+                manifest.write(json.dumps(record, ensure_ascii=False) + '\n')
+                manifest.flush()
+                if progress is not None:
+                    progress(len(records), len(inputs), record)
+
+    records.sort(key=lambda r: r['input'])
+    return write_summary(output_dir, records, time.perf_counter() - start)
+
+
+def main(argv=None):
+    """배치 처리 명령행 진입점"""
+    parser = argparse.ArgumentParser(description="레이어 파이프라인 배치 처리")
+    parser.add_argument('pipeline', help="Pipeline.save로 저장한 레이어 JSON 파일")
+    parser.add_argument('inputs', nargs='+', help="이미지 디렉터리 또는 glob 패턴")
+    parser.add_argument('-o', '--output', required=True, help="출력 디렉터리")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="작업자 프로세스 수 (기본: 코어 수)")
+    parser.add_argument('--cv-threads', type=int, default=1,
+                        help="작업자별 OpenCV 스레드 수 (기본: 1)")
+    parser.add_argument('--ext', default=None, help="출력 확장자 (예: .png)")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="이전 실행 기록을 무시하고 처음부터 처리")
+    parser.add_argument('--tile-size', type=int, default=None,
+                        help="타일 단위 처리 크기 (타일로 나눌 수 있는 스택에만 적용)")
+    parser.add_argument('--memmap', action='store_true',
+                        help=".npy / 비압축 TIFF 입출력을 메모리 맵으로 처리 (--tile-size와 함께 사용)")
+    args = parser.parse_args(argv)
+
+    pipeline = Pipeline.load(args.pipeline)
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("처리할 이미지가 없습니다.")
+        return 1
+
+    def progress(count, total, record):
+        mark = "✅" if record['status'] == 'ok' else "❌"
+        print(f"{mark} [{count}/{total}] {record['input']} ({record['total_s']:.2f}s)")
+
+    try:
+        summary = run_batch(pipeline, inputs, args.output, args.workers, args.cv_threads,
+                            args.ext, not args.no_resume, progress, args.tile_size,
+                            args.memmap)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"완료: {summary['succeeded']}개 성공, {summary['failed']}개 실패, "
+          f"{summary['wall_time_s']:.1f}s")
+    return 0 if summary['failed'] == 0 else 1
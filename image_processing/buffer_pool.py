@@ -0,0 +1,127 @@
+"""출력 버퍼 풀과 스레드별 임시 버퍼
+
+모든 연산은 선택 인자 dst를 받아 크기와 자료형이 맞으면 결과를 그 안에 쓴다
+(맞지 않으면 OpenCV가 새로 할당한다). 캐시 없이 스택을 실행할 때는 지난 레이어의
+입력 버퍼를 풀에 돌려주고 다음 레이어의 출력으로 다시 꺼내 쓰므로, 같은 크기의
+이미지를 반복 처리하면 두 버퍼를 번갈아 쓰게 되어 새 할당이 없다.
+
+레이어별 출력 모양은 처음 실행할 때 (캐시 키, 입력 모양, 자료형)별로 기억해
+두었다가 다음 실행에서 맞는 버퍼를 미리 꺼내는 데 쓴다. allocations / reuses
+카운터로 정상 상태의 렌더가 새 할당 없이 도는지 확인할 수 있다.
+"""
+import threading
+
+import numpy as np
+
+
+# 모양별로 남겨 둘 빈 버퍼 수 (번갈아 쓰기에는 두 개면 충분)
+DEFAULT_BUFFERS_PER_SHAPE = 2
+
+
+class BufferPool:
+    """(모양, 자료형)별 출력 버퍼 재사용"""
+
+    def __init__(self, buffers_per_shape=DEFAULT_BUFFERS_PER_SHAPE):
+        self.buffers_per_shape = buffers_per_shape
+        self._lock = threading.Lock()
+        self._free = {}
+        self._leased = {}
+        self._shapes = {}
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, shape, dtype):
+        """빈 버퍼 꺼내기 (없으면 새로 할당)"""
+        dtype = np.dtype(dtype)
+        with self._lock:
+            free = self._free.get((shape, dtype.str))
+            if free:
+                buffer = free.pop()
+                self.reuses += 1
+            else:
+                buffer = np.empty(shape, dtype)
+                self.allocations += 1
+            self._leased[id(buffer)] = buffer
+        return buffer
+
+    def adopt(self, array):
+        """연산이 직접 할당한 결과를 풀이 관리하는 버퍼로 등록"""
+        with self._lock:
+            self.allocations += 1
+            self._leased[id(array)] = array
+        return array
+
+    def release(self, array):
+        """버퍼 돌려주기 (뷰를 주면 원래 버퍼를 찾고, 풀 밖의 배열은 무시)"""
+        with self._lock:
+            while id(array) not in self._leased:
+                array = array.base
+                if not isinstance(array, np.ndarray):
+                    return
+            del self._leased[id(array)]
+            free = self._free.setdefault((array.shape, array.dtype.str), [])
+            if len(free) < self.buffers_per_shape:
+                free.append(array)
+
+    def call(self, func, image, params, key=None):
+        """연산을 실행하되 예상 출력 모양의 버퍼를 dst로 넘기고,
+        다 쓴 입력 버퍼는 풀에 돌려줌"""
+        memo = (key, image.shape, image.dtype.str)
+        expected = self._shapes.get(memo)
+        dst = self.acquire(*expected) if expected is not None else None
+        output = func(image, dst=dst, **params)
+        if output is not dst:
+            # 처음 실행했거나 예상이 틀려 연산이 새로 할당한 경우
+            if dst is not None:
+                self.release(dst)
+            if output is not image and id(output) not in self._leased:
+                self.adopt(output)
+            self._shapes[memo] = (output.shape, output.dtype)
+        if output is not image:
+            self.release(image)
+        return output
+
+    def stats(self):
+        """할당 / 재사용 횟수와 남아 있는 빈 버퍼"""
+        with self._lock:
+            free = [buffer for buffers in self._free.values() for buffer in buffers]
+            return {
+                'allocations': self.allocations,
+                'reuses': self.reuses,
+                'leased': len(self._leased),
+                'free_buffers': len(free),
+                'free_bytes': sum(buffer.nbytes for buffer in free),
+            }
+
+    def reset_counters(self):
+        """할당 / 재사용 카운터 초기화"""
+        with self._lock:
+            self.allocations = 0
+            self.reuses = 0
+
+    def clear(self):
+        """빈 버퍼와 기억한 출력 모양 모두 버림"""
+        with self._lock:
+            self._free.clear()
+            self._shapes.clear()
+
+
+# 스레드별 임시 버퍼 (렌더 작업자, 타일 스레드가 서로 덮어쓰지 않도록 분리)
+_scratch = threading.local()
+
+
+def scratch_buffer(name, shape, dtype):
+    """연산 내부에서 이름별로 재사용하는 임시 버퍼 (크기나 자료형이 바뀌면 새로 할당)"""
+    buffers = getattr(_scratch, 'buffers', None)
+    if buffers is None:
+        buffers = _scratch.buffers = {}
+    buffer = buffers.get(name)
+    if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+        buffer = np.empty(shape, dtype)
+        buffers[name] = buffer
+    return buffer
+
+
+def clear_scratch_buffers():
+    """현재 스레드의 임시 버퍼 해제"""
+    _scratch.buffers = {}
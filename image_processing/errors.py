@@ -0,0 +1,17 @@
+"""렌더 중 발생하는 예외
+
+무거운 모듈(cv2, numpy)을 불러오지 않고도 잡을 수 있도록 따로 둔다.
+"""
+
+
+class LayerError(Exception):
+    """레이어 적용 중 발생한 오류"""
+
+    def __init__(self, layer_name, cause):
+        super().__init__(f"{layer_name}: {cause}")
+        self.layer_name = layer_name
+        self.cause = cause
+
+
+class RenderCancelled(Exception):
+    """더 새로운 요청에 밀려 중단된 렌더"""
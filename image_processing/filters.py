@@ -1,73 +1,155 @@
-"""이미지 필터 함수들"""
+"""이미지 필터 함수들
+
+모든 함수는 선택 인자 dst를 받아 크기와 자료형이 맞으면 결과를 그 안에 쓴다
+(buffer_pool 참고). dst는 입력과 다른 배열이어야 한다.
+"""
 import cv2
 import numpy as np
 
+from image_processing.blur import gaussian_blur
+from image_processing.buffer_pool import scratch_buffer
+
+
+def _gray_scratch(name, image):
+    """입력과 같은 크기의 단일 채널 uint8 임시 버퍼"""
+    return scratch_buffer(name, image.shape[:2], np.uint8)
+
+
+def to_gray(image, dst=None):
+    """단일 채널 그레이스케일 (이미 회색이면 그대로)"""
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=dst)
 
-def apply_grayscale(image):
+
+def apply_grayscale(image, dst=None):
     """그레이스케일 변환"""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+    gray = to_gray(image, _gray_scratch('gray_result', image))
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=dst)
 
 
-def apply_gaussian_blur(image, kernel_size=(15, 15)):
+def apply_gaussian_blur(image, kernel_size=(15, 15), dst=None):
     """가우시안 블러"""
-    return cv2.GaussianBlur(image, kernel_size, 0)
+    return cv2.GaussianBlur(image, kernel_size, 0, dst=dst)
+
+
+def apply_gaussian_sigma(image, sigma=4.0, exact=False, dst=None):
+    """시그마로 세기를 정하는 가우시안 블러 (시그마가 크면 피라미드 근사, exact면 항상 직접 계산)"""
+    return gaussian_blur(image, sigma, 'direct' if exact else 'auto', dst=dst)
 
 
-def apply_sharpening(image):
+def apply_sharpening(image, dst=None):
     """샤프닝 효과"""
     kernel = np.array([[-1, -1, -1],
                       [-1,  9, -1],
                       [-1, -1, -1]])
-    return cv2.filter2D(image, -1, kernel)
+    return cv2.filter2D(image, -1, kernel, dst=dst)
+
+
+def canny_gray(image, threshold1=100, threshold2=200, dst=None):
+    """Canny 엣지 검출 (단일 채널 결과)"""
+    gray = to_gray(image, _gray_scratch('gray_input', image))
+    return cv2.Canny(gray, threshold1, threshold2, edges=dst)
 
 
-def apply_canny(image, threshold1=100, threshold2=200):
+def apply_canny(image, threshold1=100, threshold2=200, dst=None):
     """Canny 엣지 검출"""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, threshold1, threshold2)
-    return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+    edges = canny_gray(image, threshold1, threshold2, _gray_scratch('gray_result', image))
+    return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR, dst=dst)
 
 
-def apply_sobel(image):
+def sobel_gray(image, dst=None):
+    """Sobel 엣지 검출 (float32 기울기 크기, 255 초과는 포화, 단일 채널 결과)"""
+    gray = to_gray(image, _gray_scratch('gray_input', image))
+    shape = gray.shape
+    dx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, dst=scratch_buffer('sobel_dx', shape, np.float32), ksize=3)
+    dy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, dst=scratch_buffer('sobel_dy', shape, np.float32), ksize=3)
+    magnitude = cv2.magnitude(dx, dy, dx)
+    return cv2.convertScaleAbs(magnitude, dst=dst)
+
+
+def apply_sobel(image, dst=None):
     """Sobel 엣지 검출"""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-    sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-    sobel = np.sqrt(sobelx**2 + sobely**2)
-    sobel = np.uint8(sobel)
-    return cv2.cvtColor(sobel, cv2.COLOR_GRAY2BGR)
+    sobel = sobel_gray(image, _gray_scratch('gray_result', image))
+    return cv2.cvtColor(sobel, cv2.COLOR_GRAY2BGR, dst=dst)
+
 
+def laplacian_gray(image, dst=None):
+    """라플라시안 필터 (int16 계산 후 절댓값, 255 초과는 포화, 단일 채널 결과)"""
+    gray = to_gray(image, _gray_scratch('gray_input', image))
+    laplacian = cv2.Laplacian(gray, cv2.CV_16S,
+                              dst=scratch_buffer('laplacian', gray.shape, np.int16))
+    return cv2.convertScaleAbs(laplacian, dst=dst)
 
-def apply_laplacian(image):
+
+def apply_laplacian(image, dst=None):
     """라플라시안 필터"""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-    laplacian = np.uint8(np.abs(laplacian))
-    return cv2.cvtColor(laplacian, cv2.COLOR_GRAY2BGR)
+    laplacian = laplacian_gray(image, _gray_scratch('gray_result', image))
+    return cv2.cvtColor(laplacian, cv2.COLOR_GRAY2BGR, dst=dst)
 
 
-def apply_erode(image, kernel_size=(5, 5), iterations=1):
+def apply_erode(image, kernel_size=(5, 5), iterations=1, dst=None):
     """침식 효과"""
     kernel = np.ones(kernel_size, np.uint8)
-    return cv2.erode(image, kernel, iterations=iterations)
+    return cv2.erode(image, kernel, dst=dst, iterations=iterations)
 
 
-def apply_dilate(image, kernel_size=(5, 5), iterations=1):
+def apply_dilate(image, kernel_size=(5, 5), iterations=1, dst=None):
     """팽창 효과"""
     kernel = np.ones(kernel_size, np.uint8)
-    return cv2.dilate(image, kernel, iterations=iterations)
+    return cv2.dilate(image, kernel, dst=dst, iterations=iterations)
 
 
-def apply_threshold(image, threshold=127):
-    """이진화"""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
-    return cv2.cvtColor(thresh, cv2.COLOR_GRAY2BGR)
+def threshold_gray(image, threshold=127, dst=None):
+    """이진화 (단일 채널 결과)"""
+    gray = to_gray(image, _gray_scratch('gray_input', image))
+    _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY, dst=dst)
+    return thresh
 
 
-def apply_histogram_stretching(image):
-    """히스토그램 스트레칭"""
+def apply_threshold(image, threshold=127, dst=None):
+    """이진화"""
+    thresh = threshold_gray(image, threshold, _gray_scratch('gray_result', image))
+    return cv2.cvtColor(thresh, cv2.COLOR_GRAY2BGR, dst=dst)
+
+
+def _stretch_range(hist, clip_percent):
+    """히스토그램에서 스트레칭 구간 (하한, 상한) 찾기 (양 끝 clip_percent%는 잘라냄)"""
+    nonzero = np.flatnonzero(hist)
+    low, high = nonzero[0], nonzero[-1]
+    if clip_percent > 0:
+        cumulative = np.cumsum(hist)
+        cut = cumulative[-1] * clip_percent / 100.0
+        low = max(low, int(np.searchsorted(cumulative, cut, side='right')))
+        high = min(high, int(np.searchsorted(cumulative, cumulative[-1] - cut, side='left')))
+    return low, high
+
+
+def _stretch_lut(low, high):
+    """[low, high]를 [0, 255]로 늘이는 256개 항목 LUT (기존 실수 계산과 같은 버림)"""
+    if high <= low:
+        return np.arange(256, dtype=np.uint8)
+    values = np.arange(256, dtype=np.float64)
+    lut = (values - low) / (high - low) * 255
+    return np.clip(lut, 0, 255).astype(np.uint8)
+
+
+def apply_histogram_stretching(image, clip_percent=0.0, dst=None):
+    """히스토그램 스트레칭 (clip_percent: 양 끝에서 잘라낼 화소 비율 %)"""
+    if image.dtype != np.uint8:
+        return _stretch_float(image)
+    # 채널별 히스토그램 한 번으로 최소/최대를 구하고 LUT 한 번으로 적용
+    channels = image.shape[2] if image.ndim == 3 else 1
+    luts = []
+    for i in range(channels):
+        hist = cv2.calcHist([image], [i], None, [256], [0, 256]).ravel()
+        luts.append(_stretch_lut(*_stretch_range(hist, clip_percent)))
+    lut = np.stack(luts, axis=1).reshape(256, 1, channels)
+    return cv2.LUT(image, lut, dst=dst)
+
+
+def _stretch_float(image):
+    """uint8이 아닌 이미지의 히스토그램 스트레칭"""
     if len(image.shape) == 3:
         result = np.zeros_like(image)
         for i in range(3):
@@ -88,49 +170,67 @@ def apply_histogram_stretching(image):
         return image
 
 
-def apply_histogram_eq(image):
+def apply_histogram_eq(image, dst=None):
     """히스토그램 평활화"""
-    yuv = cv2.cvtColor(image, cv2.COLOR_BGR2YUV)
-    yuv[:, :, 0] = cv2.equalizeHist(yuv[:, :, 0])
-    return cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR)
-
-
-def apply_sepia(image):
-    """세피아 톤 효과"""
-    kernel = np.array([[0.272, 0.534, 0.131],
-                      [0.349, 0.686, 0.168],
-                      [0.393, 0.769, 0.189]])
-    result = cv2.transform(image, kernel)
-    return np.clip(result, 0, 255).astype(np.uint8)
-
-
-def apply_emboss(image):
+    yuv = cv2.cvtColor(image, cv2.COLOR_BGR2YUV,
+                       dst=scratch_buffer('yuv', image.shape, image.dtype))
+    luma = cv2.extractChannel(yuv, 0, dst=_gray_scratch('yuv_luma', image))
+    cv2.equalizeHist(luma, dst=luma)
+    cv2.insertChannel(luma, yuv, 0)
+    return cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR, dst=dst)
+
+
+SEPIA_KERNEL = np.array([[0.272, 0.534, 0.131],
+                         [0.349, 0.686, 0.168],
+                         [0.393, 0.769, 0.189]])
+
+
+def apply_sepia(image, dst=None):
+    """세피아 톤 효과 (결과는 항상 0~255로 포화한 uint8)"""
+    if image.dtype == np.uint8 or image.ndim != 3:
+        # uint8 입력이면 cv2.transform이 0~255로 포화시키므로 따로 자를 필요 없음
+        return cv2.transform(image, SEPIA_KERNEL, dst=dst)
+    # 다른 자료형은 cv2.transform의 SIMD 본체와 나머지 화소 처리가 ±1 다르게 반올림해
+    # 같은 화소라도 위치에 따라 결과가 달라지므로 float64로 화소마다 직접 계산
+    channels = image.astype(np.float64)
+    planes = []
+    for row in SEPIA_KERNEL:
+        value = channels[:, :, 0] * row[0] + channels[:, :, 1] * row[1] + channels[:, :, 2] * row[2]
+        # 정수 입력은 cv2.transform처럼 반올림, 실수 입력은 uint8 변환에서 버림
+        if np.issubdtype(image.dtype, np.integer):
+            value = np.rint(value)
+        planes.append(np.clip(value, 0, 255).astype(np.uint8))
+    return cv2.merge(planes, dst=dst)
+
+
+def apply_emboss(image, dst=None):
     """엠보싱 효과"""
     kernel = np.array([[-2, -1, 0],
                       [-1,  1, 1],
                       [ 0,  1, 2]])
-    return cv2.filter2D(image, -1, kernel)
+    return cv2.filter2D(image, -1, kernel, dst=dst)
 
 
-def apply_median_blur(image, ksize=9):
+def apply_median_blur(image, ksize=9, dst=None):
     """미디언 블러"""
-    return cv2.medianBlur(image, ksize)
+    return cv2.medianBlur(image, ksize, dst=dst)
 
 
-def apply_unsharp_mask(image, sigma=2.0, strength=1.5):
+def apply_unsharp_mask(image, sigma=2.0, strength=1.5, dst=None):
     """언샤프 마스크 (샤프닝)"""
-    blurred = cv2.GaussianBlur(image, (0, 0), sigma)
-    return cv2.addWeighted(image, strength, blurred, -(strength - 1), 0)
+    blurred = cv2.GaussianBlur(image, (0, 0), sigma,
+                               dst=scratch_buffer('unsharp_blur', image.shape, image.dtype))
+    return cv2.addWeighted(image, strength, blurred, -(strength - 1), 0, dst=dst)
 
 
-def apply_opening(image, kernel_size=(5, 5)):
+def apply_opening(image, kernel_size=(5, 5), dst=None):
     """모폴로지 열림 (Opening) = 침식 후 팽창"""
     kernel = np.ones(kernel_size, np.uint8)
-    return cv2.morphologyEx(image, cv2.MORPH_OPEN, kernel)
+    return cv2.morphologyEx(image, cv2.MORPH_OPEN, kernel, dst=dst)
 
 
-def apply_closing(image, kernel_size=(5, 5)):
+def apply_closing(image, kernel_size=(5, 5), dst=None):
     """모폴로지 닫힘 (Closing) = 팽창 후 침식"""
     kernel = np.ones(kernel_size, np.uint8)
-    return cv2.morphologyEx(image, cv2.MORPH_CLOSE, kernel)
+    return cv2.morphologyEx(image, cv2.MORPH_CLOSE, kernel, dst=dst)
 
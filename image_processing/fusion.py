@@ -0,0 +1,269 @@
+"""연속된 화소 단위 연산 / 기하학적 변환 융합
+
+밝기, 대비, 이진화처럼 화소값만 바꾸는 레이어가 이어지면 매번 전체 이미지를
+새로 만들지 않고 256 항목 LUT 하나(cv2.LUT) 또는 3x3 색 행렬 하나
+(cv2.transform)로 합쳐 한 번에 적용한다. 확대/축소, 평행이동, 회전이 이어지면
+2x3 아핀 행렬 하나로 합쳐 cv2.warpAffine 한 번으로 재표본화한다.
+
+오차 범위
+    * LUT끼리의 합성은 각 연산을 0~255 램프에 직접 적용해 만든 표를 이어 붙이므로
+      원래 결과와 비트 단위로 같다.
+    * 단독 행렬 연산(그레이스케일, 세피아)은 원래 함수와 같은 방식으로 실행하므로 같다.
+      채널 배치(layouts)가 바꿔 넣은 회색 커널(to_gray, threshold_gray)은 단일 채널로
+      줄이는 'gray' 단계가 되며, 그 뒤의 LUT는 단일 채널에 그대로 적용되므로 같다.
+      그레이스케일이 반복되는 경우도 그레이스케일 한 번과 정확히 같으므로 합친다.
+    * exact=False일 때만 서로 다른 행렬을 곱해 합친다. 앞 행렬이 값 범위를 넘지 않는
+      경우(음수가 없고 행 합이 1 이하)로 제한하므로 사라지는 것은 중간 반올림뿐이며,
+      합성 직후 차이는 채널당 ceil(0.5 x 뒤 행렬의 최대 행 합) 이내다
+      (그레이스케일 -> 세피아: ±1). 다만 이 차이는 뒤따르는 세피아(행 합 1.35)에서 ±2로
+      커지고, 이진화처럼 계단형 LUT를 만나면 경계값에서 0/255가 뒤바뀔 수 있으므로
+      파이프라인은 기본적으로 exact=True로 실행한다.
+    * 기하학적 변환을 합치면 보간이 한 번만 일어나므로 단계별로 따로 적용한 결과보다
+      덜 흐려진다. 즉 의도적으로 원래 결과와 다르며, 변환이 하나뿐이면 합치지 않는다.
+"""
+import cv2
+import numpy as np
+
+import image_processing.filters as filters
+import image_processing.transforms as transforms
+
+
+# cv2.COLOR_BGR2GRAY 가중치 (세 행 모두 같은 값 -> 결과는 회색)
+GRAY_MATRIX = np.array([[0.114, 0.587, 0.299],
+                        [0.114, 0.587, 0.299],
+                        [0.114, 0.587, 0.299]])
+
+SEPIA_MATRIX = np.array([[0.272, 0.534, 0.131],
+                         [0.349, 0.686, 0.168],
+                         [0.393, 0.769, 0.189]])
+
+_RAMP = np.arange(256, dtype=np.uint8).reshape(1, 256)
+
+
+def _ramp_lut(func):
+    """채널별 연산을 0~255 램프에 적용해 LUT 생성"""
+    def describe(params):
+        return [('lut', func(_RAMP, **params).reshape(256))]
+    return describe
+
+
+def _threshold_lut(params):
+    """이진화의 계단 LUT"""
+    # 회색 램프는 그레이스케일 변환 후에도 값이 그대로이므로 계단 모양만 남음
+    return filters.threshold_gray(_RAMP, **params).reshape(256)
+
+
+def _threshold_stages(params):
+    """이진화 = 그레이스케일 행렬 + 계단 LUT"""
+    return [('matrix', GRAY_MATRIX), ('lut', _threshold_lut(params))]
+
+
+def _gray_threshold_stages(params):
+    """단일 채널 이진화 = 단일 채널로 줄이기 + 계단 LUT"""
+    return [('gray', None), ('lut', _threshold_lut(params))]
+
+
+# 화소 단위 연산과 그 단계(LUT / 색 행렬) 설명
+POINT_OPS = {
+    transforms.adjust_brightness: _ramp_lut(transforms.adjust_brightness),
+    transforms.adjust_contrast: _ramp_lut(transforms.adjust_contrast),
+    filters.apply_threshold: _threshold_stages,
+    filters.apply_grayscale: lambda params: [('matrix', GRAY_MATRIX)],
+    filters.apply_sepia: lambda params: [('matrix', SEPIA_MATRIX)],
+    # layouts.GRAY_KERNELS가 바꿔 넣은 단일 채널 커널
+    filters.to_gray: lambda params: [('gray', None)],
+    filters.threshold_gray: _gray_threshold_stages,
+}
+
+
+def _scale_affine(params, size):
+    """확대/축소 행렬 (cv2.resize와 같은 화소 중심 기준)"""
+    width, height = size
+    scale_factor = params['scale_percent'] / 100.0
+    new_size = (int(width * scale_factor), int(height * scale_factor))
+    sx = new_size[0] / width
+    sy = new_size[1] / height
+    matrix = np.array([[sx, 0, 0.5 * (sx - 1)],
+                       [0, sy, 0.5 * (sy - 1)],
+                       [0, 0, 1]])
+    return matrix, new_size
+
+
+def _translate_affine(params, size):
+    """평행이동 행렬"""
+    matrix = np.array([[1, 0, params['tx']],
+                       [0, 1, params['ty']],
+                       [0, 0, 1]], dtype=np.float64)
+    return matrix, size
+
+
+def _rotate_affine(params, size):
+    """중심점 기준 회전 행렬 (transforms.rotate_image와 같은 중심)"""
+    width, height = size
+    center = (width // 2, height // 2)
+    matrix = np.vstack([cv2.getRotationMatrix2D(center, params['angle'], 1.0), [0, 0, 1]])
+    return matrix, size
+
+
+# 기하학적 변환과 그 (3x3 행렬, 출력 크기) 계산 함수
+AFFINE_OPS = {
+    transforms.scale_image: _scale_affine,
+    transforms.translate_image: _translate_affine,
+    transforms.rotate_image: _rotate_affine,
+}
+
+
+def is_point_op(func):
+    """융합 가능한 화소 단위 연산인지 여부"""
+    return func in POINT_OPS
+
+
+def is_affine_op(func):
+    """융합 가능한 기하학적 변환인지 여부"""
+    return func in AFFINE_OPS
+
+
+def _is_gray_matrix(matrix):
+    return np.allclose(matrix, GRAY_MATRIX, atol=1e-9)
+
+
+def _fits_range(matrix):
+    """결과가 0~255를 벗어나지 않는 행렬인지 (중간 포화 없음)"""
+    return (matrix >= 0).all() and (matrix.sum(axis=1) <= 1.0 + 1e-9).all()
+
+
+def compose_stages(stages, exact=True):
+    """이웃한 LUT끼리, 합성 가능한 행렬끼리 하나로 합침"""
+    composed = []
+    single = False
+    for kind, value in stages:
+        if kind == 'gray':
+            # LUT는 채널 수를 바꾸지 않으므로 앞에서 이미 단일 채널로 줄였으면 그대로
+            if single:
+                continue
+            single = True
+        elif kind == 'matrix':
+            single = False
+        if composed and composed[-1][0] == kind:
+            prev = composed[-1][1]
+            if kind == 'lut':
+                composed[-1] = ('lut', value[prev])
+                continue
+            if _is_gray_matrix(prev) and _is_gray_matrix(value):
+                continue
+            if not exact and _fits_range(prev):
+                composed[-1] = ('matrix', value @ prev)
+                continue
+        composed.append((kind, value))
+    return composed
+
+
+def apply_stages(image, stages, dst=None):
+    """LUT / 색 행렬 단계를 순서대로 한 번씩 적용 (마지막 단계는 dst에 씀)"""
+    result = image
+    last = len(stages) - 1
+    for i, (kind, value) in enumerate(stages):
+        out = dst if i == last else None
+        if kind == 'lut':
+            result = cv2.LUT(result, value, dst=out)
+        elif kind == 'gray':
+            result = filters.to_gray(result, dst=out)
+        elif _is_gray_matrix(value):
+            gray = cv2.cvtColor(result, cv2.COLOR_BGR2GRAY)
+            result = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=out)
+        else:
+            result = cv2.transform(result, value, dst=out)
+    return result
+
+
+class FusedPointOp:
+    """여러 화소 단위 레이어를 합친 단일 연산
+
+    LUT는 uint8 입력에만 쓸 수 있으므로 다른 자료형이 들어오면 합치기 전의
+    레이어(layers: (함수, 파라미터) 목록)를 순서대로 실행한다.
+    """
+
+    def __init__(self, stages, exact=True, layers=()):
+        self.stages = compose_stages(stages, exact)
+        self.layers = list(layers)
+
+    def __call__(self, image, dst=None):
+        if image.dtype == np.uint8 or not self.layers:
+            return apply_stages(image, self.stages, dst)
+        result = image
+        last = len(self.layers) - 1
+        for i, (func, params) in enumerate(self.layers):
+            result = func(result, dst=dst if i == last else None, **params)
+        return result
+
+
+class FusedAffineOp:
+    """여러 기하학적 변환을 합친 단일 warpAffine"""
+
+    def __init__(self, affines):
+        self.affines = affines
+
+    def compose(self, size):
+        """입력 크기에 대한 합성 2x3 행렬과 최종 출력 크기"""
+        matrix = np.eye(3)
+        for describe, params in self.affines:
+            step, size = describe(params, size)
+            matrix = step @ matrix
+        return matrix[:2], size
+
+    def __call__(self, image, dst=None):
+        height, width = image.shape[:2]
+        matrix, size = self.compose((width, height))
+        # 확대/축소만 있으면 cv2.resize처럼 가장자리를 복제하고,
+        # 이동/회전이 있으면 드러난 영역을 원래 변환처럼 검은색으로 채움
+        if all(describe is _scale_affine for describe, _ in self.affines):
+            border = cv2.BORDER_REPLICATE
+        else:
+            border = cv2.BORDER_CONSTANT
+        return cv2.warpAffine(image, matrix, size, dst=dst, flags=cv2.INTER_LINEAR,
+                              borderMode=border)
+
+
+def _op_family(func):
+    """융합 묶음 종류 ('point', 'affine', 없으면 None)"""
+    if is_point_op(func):
+        return 'point'
+    if is_affine_op(func):
+        return 'affine'
+    return None
+
+
+def fuse_steps(steps, exact=True):
+    """(이름, 함수, 파라미터, 캐시 키) 목록에서 연속된 화소 단위 연산과
+    기하학적 변환을 각각 하나로 합침
+
+    합쳐진 단계는 마지막 레이어의 캐시 키를 물려받는다.
+    """
+    fused = []
+    run = []
+
+    def flush():
+        if len(run) == 1:
+            fused.append(run[0])
+        elif run:
+            name = " + ".join(step[0] for step in run)
+            if _op_family(run[0][1]) == 'point':
+                stages = []
+                for _, func, params, _ in run:
+                    stages.extend(POINT_OPS[func](params))
+                op = FusedPointOp(stages, exact, [(func, params) for _, func, params, _ in run])
+            else:
+                op = FusedAffineOp([(AFFINE_OPS[func], params) for _, func, params, _ in run])
+            fused.append((name, op, {}, run[-1][3]))
+        run.clear()
+
+    for step in steps:
+        family = _op_family(step[1])
+        if run and _op_family(run[-1][1]) != family:
+            flush()
+        if family is None:
+            fused.append(step)
+        else:
+            run.append(step)
+    flush()
+    return fused
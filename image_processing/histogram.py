@@ -0,0 +1,116 @@
+"""히스토그램 / 채널 통계
+
+화면에 표시하는 결과(프록시 또는 현재 이미지)를 일정 화소 수 이하로 솎아낸 표본에서
+cv2.calcHist로 채널별 히스토그램을 구한다. 솎아낸 표본의 분포는 원본과 거의 같으므로
+원본 크기와 무관하게 수 ms 안에 끝난다. 최솟값 / 최댓값 / 포화 비율은 표본 기준이며,
+8비트보다 넓은 자료형은 구간 시작값으로 근사한다.
+
+결과는 상태 키별로 HistogramCache에 보관해, 실행 취소 / 다시 실행처럼 같은 화소로
+돌아오면 다시 계산하지 않는다.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+# 히스토그램 표본의 최대 화소 수
+HISTOGRAM_MAX_PIXELS = 256 * 1024
+HISTOGRAM_BINS = 256
+
+CHANNEL_NAMES = {1: ('L',), 3: ('B', 'G', 'R'), 4: ('B', 'G', 'R', 'A')}
+
+
+def sample_for_histogram(image, max_pixels=HISTOGRAM_MAX_PIXELS):
+    """max_pixels 이하가 되도록 일정 간격으로 솎아낸 표본"""
+    height, width = image.shape[:2]
+    step = math.ceil(math.sqrt(height * width / max_pixels))
+    if step > 1:
+        image = image[::step, ::step]
+    return np.ascontiguousarray(image)
+
+
+def value_range(dtype):
+    """히스토그램 범위 (정수는 자료형 전체, 실수는 0 ~ 1)"""
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        return float(info.min), float(info.max) + 1
+    return 0.0, 1.0
+
+
+def compute_histogram(image, bins=HISTOGRAM_BINS, max_pixels=HISTOGRAM_MAX_PIXELS):
+    """채널별 히스토그램과 통계 목록
+
+    각 항목은 {'name', 'hist'(표본 비율, float32), 'mean', 'std', 'min', 'max',
+    'low', 'high'(범위 양 끝 값 비율, %)} 딕셔너리이다.
+    """
+    sample = sample_for_histogram(image, max_pixels)
+    channels = 1 if sample.ndim == 2 else sample.shape[2]
+    names = CHANNEL_NAMES.get(channels, tuple(str(i) for i in range(channels)))
+    low, high = value_range(sample.dtype)
+    total = sample.shape[0] * sample.shape[1]
+    means, stds = cv2.meanStdDev(sample)
+    bin_width = (high - low) / bins
+
+    results = []
+    for channel, name in enumerate(names):
+        hist = cv2.calcHist([sample], [channel], None, [bins], [low, high]).ravel() / total
+        used = np.flatnonzero(hist)
+        results.append({
+            'name': name,
+            'hist': hist,
+            'mean': float(means[channel, 0]),
+            'std': float(stds[channel, 0]),
+            'min': low + used[0] * bin_width if used.size else low,
+            'max': low + used[-1] * bin_width if used.size else low,
+            'low': float(hist[0]) * 100,
+            'high': float(hist[-1]) * 100,
+        })
+    return results
+
+
+def describe_channel(stats):
+    """상태 표시용 한 줄 (채널 이름, 평균, 표준편차, 범위, 포화 비율)"""
+    text = (f"{stats['name']}  평균 {stats['mean']:.1f} · σ {stats['std']:.1f}"
+            f" · {stats['min']:.0f}–{stats['max']:.0f}")
+    clipped = stats['low'] + stats['high']
+    if clipped >= 0.1:
+        text += f" · 포화 {clipped:.1f}%"
+    return text
+
+
+class HistogramCache:
+    """상태 키별 히스토그램 결과 (개수 제한, LRU 삭제)"""
+
+    DEFAULT_MAX_ENTRIES = 64
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """캐시된 결과 반환 (없으면 None)"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        """결과 저장 후 한도를 넘은 만큼 오래된 것부터 삭제"""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """모든 결과 삭제"""
+        with self._lock:
+            self._entries.clear()
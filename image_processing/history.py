@@ -0,0 +1,166 @@
+"""레이어 편집 실행 취소 / 다시 실행
+
+편집은 전체 레이어 목록 대신 바뀐 부분만 담은 변경(delta)으로 기록한다.
+
+    ('add', 인덱스, 스펙)        레이어 추가
+    ('remove', 인덱스, 스펙)     레이어 삭제
+    ('enable', 인덱스, 활성 여부) 활성화 상태 변경
+    ('replace', 이전 목록, 이후 목록)  모두 삭제 / 원본 복원처럼 목록 전체가 바뀌는 경우
+
+LayerSpec은 불변이므로 목록 튜플을 그대로 보관해도 복사가 필요 없다.
+되돌아간 상태의 결과 이미지는 먼저 LayerCache에서 찾고, 캐시에서 밀려났을 때를
+위해 떠나는 상태의 결과를 zlib으로 압축한 스냅샷으로 바이트 예산 안에서 보관한다
+(오래 쓰지 않은 것부터 삭제). 프록시 크기를 넘는 결과는 축소해서 보관하므로
+그런 스냅샷은 즉시 표시용이며 원본 해상도 결과는 다시 계산해야 한다.
+"""
+import threading
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from image_processing.proxy import PROXY_MAX_HEIGHT, PROXY_MAX_WIDTH, make_proxy
+
+
+DEFAULT_MAX_STEPS = 200
+DEFAULT_SNAPSHOT_BYTES = 64 * 1024 * 1024
+
+
+def apply_delta(pipeline, delta, reverse=False):
+    """파이프라인에 변경 적용 (reverse면 되돌림)"""
+    kind = delta[0]
+    if kind == 'add':
+        _, index, spec = delta
+        if reverse:
+            pipeline.remove(index)
+        else:
+            pipeline.insert(index, spec)
+    elif kind == 'remove':
+        _, index, spec = delta
+        if reverse:
+            pipeline.insert(index, spec)
+        else:
+            pipeline.remove(index)
+    elif kind == 'enable':
+        _, index, enabled = delta
+        pipeline.set_enabled(index, enabled != reverse)
+    elif kind == 'replace':
+        _, before, after = delta
+        pipeline.layers = list(before if reverse else after)
+    else:
+        raise ValueError(f"알 수 없는 변경: {kind}")
+
+
+def describe_delta(delta):
+    """상태바에 표시할 변경 설명"""
+    kind = delta[0]
+    if kind == 'add':
+        return f"레이어 추가 ({delta[2].name})"
+    if kind == 'remove':
+        return f"레이어 삭제 ({delta[2].name})"
+    if kind == 'enable':
+        return "레이어 활성화" if delta[2] else "레이어 비활성화"
+    return "레이어 목록 변경"
+
+
+class EditHistory:
+    """변경 단위의 실행 취소 / 다시 실행 스택"""
+
+    def __init__(self, max_steps=DEFAULT_MAX_STEPS):
+        self._undo = deque(maxlen=max_steps)
+        self._redo = []
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def record(self, delta):
+        """새 편집 기록 (다시 실행 목록은 버림)"""
+        self._undo.append(delta)
+        self._redo.clear()
+
+    def undo(self, pipeline):
+        """마지막 편집 되돌리기 (되돌린 변경 반환, 없으면 None)"""
+        if not self._undo:
+            return None
+        delta = self._undo.pop()
+        apply_delta(pipeline, delta, reverse=True)
+        self._redo.append(delta)
+        return delta
+
+    def redo(self, pipeline):
+        """되돌린 편집 다시 적용 (적용한 변경 반환, 없으면 None)"""
+        if not self._redo:
+            return None
+        delta = self._redo.pop()
+        apply_delta(pipeline, delta)
+        self._undo.append(delta)
+        return delta
+
+    def clear(self):
+        """모든 기록 삭제"""
+        self._undo.clear()
+        self._redo.clear()
+
+
+class SnapshotStore:
+    """캐시 키별 결과 이미지의 압축 스냅샷 (바이트 예산, LRU 삭제)"""
+
+    def __init__(self, max_bytes=DEFAULT_SNAPSHOT_BYTES,
+                 max_pixels=PROXY_MAX_WIDTH * PROXY_MAX_HEIGHT, level=1):
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.level = level
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, key, image):
+        """결과 이미지 압축 저장 (프록시 크기를 넘으면 축소)"""
+        exact = image.shape[0] * image.shape[1] <= self.max_pixels
+        if not exact:
+            image, _ = make_proxy(image)
+        data = zlib.compress(np.ascontiguousarray(image), self.level)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old[3])
+            self._entries[key] = (image.shape, image.dtype.str, exact, data)
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted[3])
+
+    def put_async(self, key, image):
+        """압축은 별도 스레드에서 (이미지는 읽기 전용이어야 함)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._executor.submit(self.put, key, image)
+
+    def get(self, key):
+        """(이미지, 원래 해상도 여부) 반환, 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        shape, dtype, exact, data = entry
+        image = np.frombuffer(zlib.decompress(data), dtype=dtype).reshape(shape)
+        return image, exact
+
+    def clear(self):
+        """모든 스냅샷 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
@@ -0,0 +1,68 @@
+"""레이어 중간 결과 캐시"""
+import threading
+from collections import OrderedDict
+
+
+class LayerCache:
+    """레이어 스택의 중간 결과를 보관하는 LRU 캐시
+
+    키는 해당 레이어까지 적용된 (레이어 식별자, 파라미터) 접두사이므로
+    앞쪽 레이어가 바뀌지 않았다면 그 지점의 결과를 그대로 재사용할 수 있다.
+    저장된 바이트 수가 예산을 넘으면 가장 오래 쓰이지 않은 결과부터 제거한다.
+    렌더 작업자와 메인 스레드에서 함께 쓰므로 모든 접근은 잠금으로 보호한다.
+    """
+
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """캐시된 결과 반환 (없으면 None)"""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        """결과 저장 후 예산 초과분 제거"""
+        if image.nbytes > self.max_bytes:
+            return
+        # 캐시된 결과는 여러 곳에서 공유되므로 읽기 전용 뷰로 저장
+        # (넘겨받은 배열 자체는 원본 이미지일 수 있으므로 플래그를 바꾸지 않음)
+        image = image.view()
+        image.flags.writeable = False
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key).nbytes
+            self._entries[key] = image
+            self.current_bytes += image.nbytes
+            self._evict()
+
+    def set_budget(self, max_bytes):
+        """메모리 예산 변경"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """모든 캐시 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _evict(self):
+        """예산을 넘는 동안 가장 오래된 결과부터 제거"""
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, image = self._entries.popitem(last=False)
+            self.current_bytes -= image.nbytes
@@ -0,0 +1,95 @@
+"""레이어 채널 배치 (gray / bgr / any)
+
+그레이스케일, 이진화, Canny, Sobel, 라플라시안은 내부적으로 회색 이미지를 만든 뒤
+표시를 위해 다시 BGR로 늘린다. 이런 연산이 이어지면 레이어마다 BGR -> 회색 ->
+BGR 변환이 반복되므로, 스택을 실행할 때는 단일 채널 결과를 돌려주는 회색 커널로
+바꾸고 BGR이 꼭 필요한 레이어 앞이나 스택 끝에서만 한 번 늘린다.
+
+    'gray' : 회색 커널로 바꿔 실행하며 단일 채널 결과를 낸다 (입력은 회색/BGR 모두 가능)
+    'any'  : 채널마다 똑같이 처리하므로 회색 입력은 회색, BGR 입력은 BGR로 낸다
+    'bgr'  : 색 정보를 섞으므로 3채널 입력이 필요하다 (등록되지 않은 연산의 기본값)
+
+회색 이미지를 세 채널에 복제한 BGR에 채널별 연산을 적용한 결과는 회색 이미지에
+적용한 결과를 복제한 것과 같고, 복제된 BGR을 다시 회색으로 바꾸면 원래 값이
+그대로 나오므로 최종 결과는 원래 함수들을 순서대로 실행한 것과 비트 단위로 같다.
+"""
+import cv2
+
+import image_processing.filters as filters
+import image_processing.transforms as transforms
+from image_processing.buffer_pool import scratch_buffer
+
+
+# BGR 결과를 내는 연산 -> 단일 채널 결과를 내는 커널
+GRAY_KERNELS = {
+    filters.apply_grayscale: filters.to_gray,
+    filters.apply_threshold: filters.threshold_gray,
+    filters.apply_canny: filters.canny_gray,
+    filters.apply_sobel: filters.sobel_gray,
+    filters.apply_laplacian: filters.laplacian_gray,
+}
+
+# 채널마다 독립적으로 처리하는 연산 (회색 입력을 그대로 받음)
+CHANNEL_INDEPENDENT = {
+    filters.apply_gaussian_blur,
+    filters.apply_gaussian_sigma,
+    filters.apply_sharpening,
+    filters.apply_erode,
+    filters.apply_dilate,
+    filters.apply_histogram_stretching,
+    filters.apply_emboss,
+    filters.apply_median_blur,
+    filters.apply_unsharp_mask,
+    filters.apply_opening,
+    filters.apply_closing,
+    transforms.adjust_brightness,
+    transforms.adjust_contrast,
+    transforms.scale_image,
+    transforms.translate_image,
+    transforms.rotate_image,
+}
+
+
+def layer_layout(func):
+    """연산의 채널 배치 ('gray', 'any', 'bgr')"""
+    if func in GRAY_KERNELS:
+        return 'gray'
+    if func in CHANNEL_INDEPENDENT:
+        return 'any'
+    return 'bgr'
+
+
+def expand_to_bgr(image, dst=None):
+    """단일 채널 이미지를 3채널 BGR로 늘림 (이미 3채널이면 그대로)"""
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR, dst=dst)
+    return image
+
+
+def _expand_before(func):
+    """회색 입력을 BGR로 늘린 뒤 실행하는 함수"""
+    def run(image, dst=None, **params):
+        expanded = expand_to_bgr(image, scratch_buffer('expanded', image.shape[:2] + (3,), image.dtype))
+        return func(expanded, dst=dst, **params)
+    return run
+
+
+def plan_layouts(steps, gray=False):
+    """(이름, 함수, 파라미터, 캐시 키) 단계에서 회색 커널을 쓰고
+    BGR이 필요한 레이어 앞에만 채널 확장을 넣은 단계 목록
+
+    gray는 첫 단계의 입력이 이미 단일 채널인지 여부이며,
+    마지막 결과가 회색일 수 있으므로 호출한 쪽에서 expand_to_bgr로 늘려야 한다.
+    """
+    planned = []
+    for name, func, params, key in steps:
+        layout = layer_layout(func)
+        if layout == 'gray':
+            planned.append((name, GRAY_KERNELS[func], params, key))
+            gray = True
+        elif layout == 'bgr' and gray:
+            planned.append((name, _expand_before(func), params, key))
+            gray = False
+        else:
+            planned.append((name, func, params, key))
+    return planned
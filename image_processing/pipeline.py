@@ -0,0 +1,226 @@
+"""레이어 파이프라인
+
+레이어는 함수 대신 연산 이름과 파라미터만 담은 LayerSpec으로 저장되므로
+해시(캐시 키), 피클(작업자 프로세스 전달), JSON 저장이 모두 가능하다.
+Tk 없이도 같은 레이어 스택을 실행할 수 있다.
+"""
+import json
+from dataclasses import dataclass, replace
+
+import image_processing.filters as filters
+import image_processing.transforms as transforms
+from image_processing.errors import LayerError, RenderCancelled
+from image_processing.fusion import fuse_steps
+from image_processing.layouts import expand_to_bgr, plan_layouts
+from image_processing.proxy import scale_layer_params
+
+
+# 연산 이름 -> 실제 함수
+OPS = {
+    'grayscale': filters.apply_grayscale,
+    'gaussian_blur': filters.apply_gaussian_blur,
+    'gaussian_sigma': filters.apply_gaussian_sigma,
+    'sharpening': filters.apply_sharpening,
+    'canny': filters.apply_canny,
+    'sobel': filters.apply_sobel,
+    'laplacian': filters.apply_laplacian,
+    'erode': filters.apply_erode,
+    'dilate': filters.apply_dilate,
+    'threshold': filters.apply_threshold,
+    'histogram_stretching': filters.apply_histogram_stretching,
+    'histogram_eq': filters.apply_histogram_eq,
+    'sepia': filters.apply_sepia,
+    'emboss': filters.apply_emboss,
+    'median_blur': filters.apply_median_blur,
+    'unsharp_mask': filters.apply_unsharp_mask,
+    'opening': filters.apply_opening,
+    'closing': filters.apply_closing,
+    'brightness': transforms.adjust_brightness,
+    'contrast': transforms.adjust_contrast,
+    'scale': transforms.scale_image,
+    'translate': transforms.translate_image,
+    'rotate': transforms.rotate_image,
+}
+
+
+def _freeze(value):
+    """JSON 리스트 등을 해시 가능한 튜플로 변환"""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class LayerSpec:
+    """레이어 하나의 직렬화 가능한 설명 (연산 이름 + 파라미터)"""
+
+    op: str
+    params: tuple = ()
+    name: str = ''
+    enabled: bool = True
+
+    @classmethod
+    def create(cls, op, params=None, name='', enabled=True):
+        """파라미터 딕셔너리로 스펙 생성"""
+        if op not in OPS:
+            raise ValueError(f"알 수 없는 연산: {op}")
+        items = tuple(sorted((k, _freeze(v)) for k, v in (params or {}).items()))
+        return cls(op, items, name or op, enabled)
+
+    @property
+    def func(self):
+        return OPS[self.op]
+
+    @property
+    def kwargs(self):
+        return dict(self.params)
+
+    @property
+    def key(self):
+        """캐시 키 (표시 이름과 활성 상태는 결과에 영향이 없으므로 제외)"""
+        return (self.op, self.params)
+
+    def to_dict(self):
+        return {'op': self.op, 'params': self.kwargs,
+                'name': self.name, 'enabled': self.enabled}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls.create(data['op'], data.get('params'), data.get('name', ''),
+                          data.get('enabled', True))
+
+
+def run_layers(source, steps, cache=None, is_cancelled=None, fuse=True, hooks=(),
+               layouts=True, pool=None):
+    """(이름, 함수, 파라미터, 캐시 키) 단계들을 순서대로 적용
+
+    캐시에 남아 있는 가장 깊은 중간 결과부터 다시 시작하고,
+    is_cancelled()가 참이 되면 레이어 사이에서 RenderCancelled로 중단한다.
+    fuse가 참이면 다시 계산할 구간의 연속된 화소 단위 연산을 한 번에 적용한다.
+    hooks의 각 객체는 실제로 실행되는 단계마다 before_layer(이름, 캐시 키)와
+    after_layer(이름, 캐시 키, 결과)로 호출된다 (profiling.LayerProfiler 참고).
+    layouts가 참이면 회색 결과를 내는 레이어 사이에서는 단일 채널로 계산하고
+    (캐시에도 단일 채널로 저장) 마지막에 BGR로 늘린다.
+    캐시 없이 pool(buffer_pool.BufferPool)을 주면 각 레이어의 출력을 풀의 버퍼에
+    쓰고 다 쓴 입력 버퍼를 돌려주어 두 버퍼를 번갈아 쓴다. 반환된 결과도 풀의
+    버퍼이므로 다 쓴 뒤 pool.release로 돌려주면 다음 실행에서 다시 쓴다.
+    """
+    result = source
+    start = 0
+    if cache is not None:
+        for i in range(len(steps) - 1, -1, -1):
+            cached = cache.get(steps[i][3])
+            if cached is not None:
+                result = cached
+                start = i + 1
+                break
+
+    # 바뀐 지점 이후의 레이어만 순서대로 적용
+    remaining = steps[start:]
+    if layouts:
+        remaining = plan_layouts(remaining, gray=result.ndim == 2)
+    if fuse:
+        remaining = fuse_steps(remaining)
+    # 캐시에 남는 중간 결과는 재사용할 수 없으므로 캐시가 없을 때만 풀 사용
+    use_pool = pool is not None and cache is None
+    try:
+        for name, func, params, key in remaining:
+            if is_cancelled is not None and is_cancelled():
+                raise RenderCancelled()
+            for hook in hooks:
+                hook.before_layer(name, key)
+            try:
+                if use_pool:
+                    result = pool.call(func, result, params, key)
+                else:
+                    result = func(result, **params)
+            except Exception as e:
+                raise LayerError(name, e) from e
+            for hook in hooks:
+                hook.after_layer(name, key, result)
+            if cache is not None:
+                cache.put(key, result)
+        if layouts and source.ndim == 3 and result.ndim == 2:
+            if use_pool:
+                result = pool.call(expand_to_bgr, result, {}, 'expand_to_bgr')
+            else:
+                result = expand_to_bgr(result)
+    except BaseException:
+        # 중단되거나 실패하면 작업 중이던 버퍼를 풀에 돌려줌
+        if use_pool:
+            pool.release(result)
+        raise
+    return result
+
+
+class Pipeline:
+    """LayerSpec 목록과 그 실행기 (GUI, 배치 처리 공용)"""
+
+    def __init__(self, layers=None, cache=None):
+        self.layers = list(layers or [])
+        self.cache = cache
+
+    def __len__(self):
+        return len(self.layers)
+
+    def add(self, spec):
+        """레이어 추가"""
+        self.layers.append(spec)
+
+    def insert(self, index, spec):
+        """지정한 위치에 레이어 추가"""
+        self.layers.insert(index, spec)
+
+    def remove(self, index):
+        """레이어 삭제"""
+        return self.layers.pop(index)
+
+    def set_enabled(self, index, enabled):
+        """레이어 활성화 상태 변경"""
+        self.layers[index] = replace(self.layers[index], enabled=enabled)
+
+    def clear(self):
+        """모든 레이어 삭제"""
+        self.layers.clear()
+
+    @property
+    def enabled_layers(self):
+        return [spec for spec in self.layers if spec.enabled]
+
+    def steps(self, scale=1.0, root=()):
+        """활성 레이어별 (이름, 함수, 파라미터, 캐시 키) 목록
+
+        캐시 키는 root에 해당 레이어까지의 스펙 키를 이어 붙인 접두사이며,
+        scale이 1보다 작으면 커널 크기와 이동량을 축소 비율에 맞게 보정한다.
+        """
+        steps = []
+        prefix = tuple(root) + (scale,)
+        for spec in self.enabled_layers:
+            prefix = prefix + (spec.key,)
+            params = scale_layer_params(spec.func, spec.kwargs, scale)
+            steps.append((spec.name, spec.func, params, prefix))
+        return steps
+
+    def run(self, image, scale=1.0, root=(), is_cancelled=None, fuse=True, hooks=(),
+            layouts=True, pool=None):
+        """이미지에 활성 레이어를 순서대로 적용"""
+        return run_layers(image, self.steps(scale, root), self.cache, is_cancelled, fuse, hooks,
+                          layouts, pool)
+
+    def to_dict(self):
+        return {'layers': [spec.to_dict() for spec in self.layers]}
+
+    @classmethod
+    def from_dict(cls, data, cache=None):
+        return cls([LayerSpec.from_dict(item) for item in data.get('layers', [])], cache)
+
+    def save(self, path):
+        """JSON 파일로 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path, cache=None):
+        """JSON 파일에서 불러오기"""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), cache)
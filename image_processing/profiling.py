@@ -0,0 +1,127 @@
+"""레이어별 실행 시간 / 메모리 측정
+
+run_layers에 hooks로 넘기는 객체는 before_layer(name, key)와
+after_layer(name, key, result) 두 메서드를 가지면 된다. 여러 작업자 스레드에서
+동시에 호출될 수 있으므로 LayerProfiler는 측정 시작 시점을 스레드별로 두고, 기록은
+잠금으로 보호한다. tracemalloc의 최대 메모리는 프로세스 전체 값이라 다른 스레드가
+동시에 실행 중이면 그만큼 섞여 들어간다.
+
+합쳐진(fused) 단계는 마지막 레이어의 캐시 키로 한 번만 기록되고, 캐시에서
+가져온 레이어는 실행되지 않으므로 이전 기록이 그대로 남는다.
+"""
+import csv
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+
+# 이동 평균에 쓰는 최근 실행 횟수
+DEFAULT_WINDOW = 10
+
+EXPORT_FIELDS = ['name', 'calls', 'last_ms', 'avg_ms', 'total_ms',
+                 'last_peak_bytes', 'output_bytes']
+
+
+class LayerProfiler:
+    """캐시 키별 마지막 / 이동 평균 실행 시간과 메모리 기록"""
+
+    def __init__(self, track_memory=False, window=DEFAULT_WINDOW):
+        self.track_memory = track_memory
+        self.window = window
+        self._lock = threading.Lock()
+        self._records = {}
+        # 스레드별 측정 시작 시각과 메모리 기준값
+        self._local = threading.local()
+
+    def before_layer(self, name, key):
+        """레이어 실행 직전"""
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._local.memory_base = tracemalloc.get_traced_memory()[0]
+        self._local.started = time.perf_counter()
+
+    def after_layer(self, name, key, result):
+        """레이어 실행 직후"""
+        elapsed = time.perf_counter() - self._local.started
+        peak = None
+        if self.track_memory and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1] - getattr(self._local, 'memory_base', 0)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                record = {'name': name, 'calls': 0, 'total_s': 0.0,
+                          'recent': deque(maxlen=self.window)}
+                self._records[key] = record
+            record['name'] = name
+            record['calls'] += 1
+            record['total_s'] += elapsed
+            record['recent'].append(elapsed)
+            record['last_s'] = elapsed
+            record['last_peak_bytes'] = peak
+            record['output_bytes'] = getattr(result, 'nbytes', 0)
+
+    def set_track_memory(self, enabled):
+        """메모리 측정 켜기/끄기 (끄면 tracemalloc도 중지)"""
+        self.track_memory = enabled
+        if not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def stats(self, key):
+        """캐시 키의 기록 (없으면 None)"""
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return None
+            return {
+                'name': record['name'],
+                'calls': record['calls'],
+                'last_ms': record['last_s'] * 1000,
+                'avg_ms': sum(record['recent']) / len(record['recent']) * 1000,
+                'total_ms': record['total_s'] * 1000,
+                'last_peak_bytes': record['last_peak_bytes'],
+                'output_bytes': record['output_bytes'],
+            }
+
+    def describe(self, key):
+        """레이어 목록에 표시할 짧은 문자열"""
+        stats = self.stats(key)
+        if stats is None:
+            return ""
+        text = f"{stats['last_ms']:.1f}ms · 평균 {stats['avg_ms']:.1f}"
+        if stats['last_peak_bytes'] is not None:
+            text += f" · {stats['last_peak_bytes'] / 1e6:.0f}MB"
+        return text
+
+    def rows(self):
+        """내보내기용 기록 목록"""
+        with self._lock:
+            keys = list(self._records)
+        return [self.stats(key) for key in keys]
+
+    def clear(self):
+        """모든 기록 삭제"""
+        with self._lock:
+            self._records.clear()
+
+    def export_csv(self, path):
+        """CSV 파일로 내보내기"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def export_json(self, path):
+        """JSON 파일로 내보내기"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.rows(), f, ensure_ascii=False, indent=2)
+
+    def export(self, path):
+        """확장자에 따라 CSV 또는 JSON으로 내보내기"""
+        if path.lower().endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
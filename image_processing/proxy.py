@@ -0,0 +1,77 @@
+"""저해상도 프록시 미리보기 지원"""
+import inspect
+
+import cv2
+
+import image_processing.filters as filters
+import image_processing.transforms as transforms
+
+
+# 화면 표시 크기(1000x650)의 2배까지만 프록시에서 처리
+PROXY_MAX_WIDTH = 2000
+PROXY_MAX_HEIGHT = 1300
+
+
+def make_proxy(image, max_width=PROXY_MAX_WIDTH, max_height=PROXY_MAX_HEIGHT):
+    """표시용 축소 이미지와 축소 비율 반환 (축소가 필요 없으면 원본 그대로)"""
+    height, width = image.shape[:2]
+    scale = min(max_width / width, max_height / height, 1.0)
+    if scale >= 1.0:
+        return image, 1.0
+    new_width = max(1, int(round(width * scale)))
+    new_height = max(1, int(round(height * scale)))
+    proxy = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    return proxy, scale
+
+
+def _default_param(func, name):
+    """함수 시그니처에 정의된 파라미터 기본값"""
+    return inspect.signature(func).parameters[name].default
+
+
+def _odd(value, minimum=1):
+    """가장 가까운 홀수 (minimum 이상)"""
+    value = max(minimum, int(round(value)))
+    return value if value % 2 == 1 else value + 1
+
+
+def _scale_kernel(name, minimum=1):
+    """커널 크기 파라미터를 축소 비율에 맞추는 함수 생성"""
+    def scaler(func, params, scale):
+        kernel_size = params.get(name, _default_param(func, name))
+        if isinstance(kernel_size, tuple):
+            return {name: tuple(_odd(k * scale, minimum) for k in kernel_size)}
+        return {name: _odd(kernel_size * scale, minimum)}
+    return scaler
+
+
+def _scale_value(*names):
+    """거리 단위 파라미터(시그마, 이동량)를 축소 비율에 맞추는 함수 생성"""
+    def scaler(func, params, scale):
+        return {name: params.get(name, _default_param(func, name)) * scale
+                for name in names}
+    return scaler
+
+
+# 공간 크기를 갖는 파라미터만 등록 (3x3 고정 커널, 비율 기반 변환은 그대로 사용)
+PARAM_SCALERS = {
+    filters.apply_gaussian_blur: _scale_kernel('kernel_size'),
+    filters.apply_gaussian_sigma: _scale_value('sigma'),
+    filters.apply_median_blur: _scale_kernel('ksize', minimum=3),
+    filters.apply_erode: _scale_kernel('kernel_size'),
+    filters.apply_dilate: _scale_kernel('kernel_size'),
+    filters.apply_opening: _scale_kernel('kernel_size'),
+    filters.apply_closing: _scale_kernel('kernel_size'),
+    filters.apply_unsharp_mask: _scale_value('sigma'),
+    transforms.translate_image: _scale_value('tx', 'ty'),
+}
+
+
+def scale_layer_params(func, params, scale):
+    """프록시 해상도에서 같은 모양이 나오도록 레이어 파라미터 보정"""
+    scaler = PARAM_SCALERS.get(func)
+    if scaler is None or scale == 1.0:
+        return params
+    scaled = dict(params)
+    scaled.update(scaler(func, params, scale))
+    return scaled
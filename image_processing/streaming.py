@@ -0,0 +1,259 @@
+"""동영상 / 카메라 스트리밍 처리
+
+cv2.VideoCapture에서 읽은 프레임을 작업자 스레드에서 레이어 스택에 통과시킨다.
+읽기와 처리는 서로 다른 스레드에서 돌며, 그 사이와 처리 결과 뒤에는 가장 최근
+항목 하나만 담는 칸(_LatestSlot)을 둔다. 처리가 밀리면 아직 가져가지 않은
+프레임을 새 프레임으로 덮어쓰므로(버린 프레임으로 집계) 화면은 늦어지지 않고
+항상 최신 프레임을 보여 준다.
+
+동영상 파일은 원래 FPS에 맞춰 읽는다. 녹화하면서 파일을 처리할 때처럼 모든
+프레임이 필요하면 drop_frames=False로 두어 처리 스레드가 가져갈 때까지 읽기를
+기다리게 한다.
+
+단계별 지연(읽기, 처리, 저장, 표시)과 읽은 시점부터 화면에 그려지기까지의 전체
+지연은 최근 프레임들의 이동 평균으로 기록한다.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from image_processing.buffer_pool import BufferPool
+from image_processing.layouts import expand_to_bgr
+from image_processing.pipeline import run_layers
+
+
+# 이동 평균 / FPS 계산에 쓰는 최근 프레임 수
+DEFAULT_WINDOW = 30
+
+# 확장자별 VideoWriter 코덱
+VIDEO_CODECS = {
+    '.avi': 'MJPG',
+    '.mp4': 'mp4v',
+    '.mov': 'mp4v',
+}
+
+STAGES = ('read', 'process', 'write', 'display', 'latency')
+
+
+class _LatestSlot:
+    """가장 최근 항목 하나만 보관하는 칸"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._item = None
+
+    def put(self, item):
+        """항목 넣기 (가져가지 않은 항목을 덮어썼으면 True)"""
+        with self._condition:
+            replaced = self._item is not None
+            self._item = item
+            self._condition.notify_all()
+            return replaced
+
+    def put_wait(self, item, stopped):
+        """칸이 빌 때까지 기다렸다가 넣기 (stopped()가 참이 되면 포기)"""
+        with self._condition:
+            while self._item is not None:
+                if stopped():
+                    return
+                self._condition.wait(0.1)
+            self._item = item
+            self._condition.notify_all()
+
+    def take(self, timeout=None):
+        """항목 꺼내기 (timeout 안에 없으면 None)"""
+        with self._condition:
+            if self._item is None and timeout:
+                self._condition.wait(timeout)
+            item, self._item = self._item, None
+            self._condition.notify_all()
+            return item
+
+
+def open_video_writer(path, fps, size):
+    """확장자에 맞는 코덱으로 VideoWriter 열기 (size: (너비, 높이))"""
+    ext = os.path.splitext(path)[1].lower()
+    codec = VIDEO_CODECS.get(ext, 'MJPG')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, size)
+    if not writer.isOpened():
+        raise ValueError(f"영상을 저장할 수 없습니다: {path}")
+    return writer
+
+
+class VideoStream:
+    """VideoCapture 프레임을 레이어 스택에 통과시키는 스트리밍 처리
+
+    source는 동영상 파일 경로나 카메라 번호이다. steps는 run_layers와 같은
+    (이름, 함수, 파라미터, 캐시 키) 목록이며 set_steps로 실행 중에 바꿀 수 있다.
+    결과는 poll()로 메인 스레드에서 가져간다.
+    """
+
+    def __init__(self, source, steps=(), output_path=None, drop_frames=True,
+                 hooks=(), window=DEFAULT_WINDOW):
+        self.source = source
+        self.output_path = output_path
+        self.drop_frames = drop_frames
+        self.hooks = hooks
+        self.fps = 0.0
+        self.frames_read = 0
+        self.frames_processed = 0
+        self.dropped_input = 0
+        self.dropped_display = 0
+        self.error = None
+        self.finished = False
+        self._steps = list(steps)
+        self._lock = threading.Lock()
+        self._timings = {stage: deque(maxlen=window) for stage in STAGES}
+        self._processed_at = deque(maxlen=window)
+        self._input = _LatestSlot()
+        self._output = _LatestSlot()
+        self._stop = threading.Event()
+        self._capture = None
+        self._writer = None
+        self._threads = []
+
+    @property
+    def is_file(self):
+        return not isinstance(self.source, int)
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        """캡처 열고 읽기 / 처리 스레드 시작"""
+        self._capture = cv2.VideoCapture(self.source)
+        if not self._capture.isOpened():
+            raise ValueError(f"영상을 열 수 없습니다: {self.source}")
+        self.fps = self._capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self._threads = [
+            threading.Thread(target=self._read_loop, name="video-read", daemon=True),
+            threading.Thread(target=self._process_loop, name="video-process", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """스레드를 멈추고 캡처 / 저장 파일 닫기"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        if self._capture is not None:
+            self._capture.release()
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    def set_steps(self, steps):
+        """다음 프레임부터 적용할 레이어 단계"""
+        self._steps = list(steps)
+
+    def poll(self):
+        """새로 처리된 (원본 프레임, 결과, 읽은 시각) (없으면 None)"""
+        return self._output.take()
+
+    def record_display(self, captured_at, elapsed):
+        """메인 스레드에서 표시에 걸린 시간과 전체 지연 기록"""
+        self._record('display', elapsed)
+        self._record('latency', time.perf_counter() - captured_at)
+
+    def stats(self):
+        """FPS, 단계별 평균 지연(ms), 버린 프레임 수"""
+        with self._lock:
+            latencies = {stage: sum(values) / len(values) * 1000 if values else 0.0
+                         for stage, values in self._timings.items()}
+            times = list(self._processed_at)
+        fps = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0.0
+        return {
+            'fps': fps,
+            'latency_ms': latencies,
+            'frames_read': self.frames_read,
+            'frames_processed': self.frames_processed,
+            'dropped': self.dropped_input + self.dropped_display,
+        }
+
+    def describe(self):
+        """상태바에 표시할 짧은 문자열"""
+        stats = self.stats()
+        ms = stats['latency_ms']
+        text = (f"{stats['fps']:.1f} FPS · 읽기 {ms['read']:.1f}ms · 처리 {ms['process']:.1f}ms"
+                f" · 표시 {ms['display']:.1f}ms · 지연 {ms['latency']:.0f}ms · 버린 프레임 {stats['dropped']}")
+        if self.output_path:
+            text += f" · 저장 {ms['write']:.1f}ms"
+        return text
+
+    def _record(self, stage, seconds):
+        with self._lock:
+            self._timings[stage].append(seconds)
+
+    def _read_loop(self):
+        """읽기 스레드 (파일은 원래 FPS에 맞춰 읽음)"""
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            begin = time.perf_counter()
+            ok, frame = self._capture.read()
+            if not ok:
+                break
+            self._record('read', time.perf_counter() - begin)
+            item = (frame, begin)
+            self.frames_read += 1
+            if not self.drop_frames:
+                self._input.put_wait(item, self._stop.is_set)
+                continue
+            if self._input.put(item):
+                self.dropped_input += 1
+            if self.is_file:
+                delay = started + self.frames_read / self.fps - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+        self.finished = True
+
+    def _process_loop(self):
+        """처리 스레드 (레이어 스택 적용, 선택적으로 저장)"""
+        # 같은 크기의 프레임이 계속 들어오므로 중간 결과 버퍼를 번갈아 씀
+        pool = BufferPool()
+        while not self._stop.is_set():
+            item = self._input.take(timeout=0.1)
+            if item is None:
+                if self.finished:
+                    break
+                continue
+            frame, captured_at = item
+            begin = time.perf_counter()
+            try:
+                result = run_layers(frame, self._steps, hooks=self.hooks, pool=pool)
+            except Exception as e:
+                self.error = e
+                continue
+            # 결과는 메인 스레드로 넘어가므로 풀 버퍼는 돌려주고 복사본을 넘김
+            output = result.copy() if result is not frame else frame
+            pool.release(result)
+            self._record('process', time.perf_counter() - begin)
+            self.error = None
+
+            if self.output_path:
+                begin = time.perf_counter()
+                self._write(output)
+                self._record('write', time.perf_counter() - begin)
+
+            with self._lock:
+                self._processed_at.append(time.perf_counter())
+            self.frames_processed += 1
+            if self._output.put((frame, output, captured_at)):
+                self.dropped_display += 1
+
+    def _write(self, image):
+        """처리된 프레임 저장 (첫 프레임 크기로 VideoWriter 열기)"""
+        image = expand_to_bgr(image)
+        if self._writer is None:
+            height, width = image.shape[:2]
+            try:
+                self._writer = open_video_writer(self.output_path, self.fps, (width, height))
+            except ValueError as e:
+                self.error = e
+                self.output_path = None
+                return
+        self._writer.write(image)
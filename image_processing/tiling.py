@@ -0,0 +1,222 @@
+"""타일 단위 실행 (후광 겹침으로 이음매 없이 이어 붙임)
+
+각 연산은 출력 화소 하나를 만들기 위해 주변 몇 화소가 필요한지(공간 지지 반경)를
+선언한다. 레이어 스택 전체의 반경 합만큼 타일을 넓혀(후광) 계산한 뒤 가운데만
+잘라 붙이면 전체 이미지를 한 번에 처리한 결과와 화소 단위로 같다. 이미지
+가장자리에서는 후광이 잘리지만, 그 경계가 실제 이미지 경계와 같으므로 OpenCV의
+경계 처리도 전체 처리와 동일하다.
+
+시그마로 정하는 커널은 자료형마다 크기가 다르므로(uint8은 3σ, 그 외는 4σ) 반경은
+입력 이미지의 자료형으로 구한다.
+
+화소 단위로 같으려면 각 연산의 결과가 화소 위치와 무관해야 한다. cv2.transform은
+uint8이 아닌 입력에서 SIMD 본체와 나머지 화소의 반올림이 ±1 달라 잘라 낸 영역과
+전체 이미지의 같은 화소가 어긋나므로, 색 행렬 연산(세피아)은 그런 입력을 화소마다
+직접 계산한다(filters.apply_sepia). benchmarks.check_equivalence가 모든 타일 가능
+연산을 uint8 / uint16으로 검사한다.
+
+히스토그램 스트레칭/평활화처럼 전체 통계가 필요한 연산, Canny의 히스테리시스처럼
+영향 범위가 정해지지 않은 연산, 크기나 위치를 바꾸는 기하학적 변환은 반경이
+None이며 이런 레이어가 있으면 타일 처리할 수 없다.
+
+시그마 블러(gaussian_sigma)는 큰 시그마에서 피라미드로 근사하므로(blur 참고) 후광도
+피라미드가 퍼뜨리는 범위(blur.support_radius)로 잡는다. 다만 타일마다 피라미드 격자의
+위치가 달라 타일 결과와 전체 결과가 화소 단위로 같지는 않고, 둘 다 정확한 가우시안과의
+오차 한도 안에서만 일치한다.
+"""
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import image_processing.filters as filters
+import image_processing.transforms as transforms
+from image_processing.blur import kernel_radius, support_radius
+from image_processing.buffer_pool import BufferPool
+from image_processing.pipeline import RenderCancelled, run_layers
+
+
+DEFAULT_TILE_SIZE = 1024
+
+
+def _param(func, params, name):
+    """레이어 파라미터 (없으면 함수 기본값)"""
+    if name in params:
+        return params[name]
+    return inspect.signature(func).parameters[name].default
+
+
+def _radius(size):
+    """커널 크기 -> 반경"""
+    if isinstance(size, tuple):
+        return max(k // 2 for k in size)
+    return size // 2
+
+
+def _kernel_support(name, passes=1):
+    """커널 크기 파라미터로 반경을 구하는 함수 생성 (passes: 커널 적용 횟수)"""
+    def support(func, params, dtype):
+        radius = _radius(_param(func, params, name)) * passes
+        if 'iterations' in inspect.signature(func).parameters:
+            radius *= _param(func, params, 'iterations')
+        return radius
+    return support
+
+
+def _fixed_support(radius):
+    return lambda func, params, dtype: radius
+
+
+def _sigma_support(func, params, dtype):
+    """cv2.GaussianBlur가 시그마로 정하는 커널 크기의 반경 (자료형을 모르면 더 큰 쪽)"""
+    return kernel_radius(_param(func, params, 'sigma'), np.float32 if dtype is None else dtype)
+
+
+def _blur_support(func, params, dtype):
+    """gaussian_sigma의 반경 (피라미드 방식은 커널보다 넓게 퍼질 수 있음)"""
+    return support_radius(_param(func, params, 'sigma'), np.float32 if dtype is None else dtype)
+
+
+def _non_local(func, params, dtype):
+    return None
+
+
+# 연산별 공간 지지 반경 (None = 타일로 나눌 수 없음)
+SPATIAL_SUPPORT = {
+    filters.apply_grayscale: _fixed_support(0),
+    filters.apply_threshold: _fixed_support(0),
+    filters.apply_sepia: _fixed_support(0),
+    transforms.adjust_brightness: _fixed_support(0),
+    transforms.adjust_contrast: _fixed_support(0),
+    filters.apply_sharpening: _fixed_support(1),
+    filters.apply_emboss: _fixed_support(1),
+    filters.apply_sobel: _fixed_support(1),
+    filters.apply_laplacian: _fixed_support(1),
+    filters.apply_gaussian_blur: _kernel_support('kernel_size'),
+    filters.apply_gaussian_sigma: _blur_support,
+    filters.apply_median_blur: _kernel_support('ksize'),
+    filters.apply_erode: _kernel_support('kernel_size'),
+    filters.apply_dilate: _kernel_support('kernel_size'),
+    filters.apply_opening: _kernel_support('kernel_size', passes=2),
+    filters.apply_closing: _kernel_support('kernel_size', passes=2),
+    filters.apply_unsharp_mask: _sigma_support,
+    filters.apply_canny: _non_local,
+    filters.apply_histogram_stretching: _non_local,
+    filters.apply_histogram_eq: _non_local,
+    transforms.scale_image: _non_local,
+    transforms.translate_image: _non_local,
+    transforms.rotate_image: _non_local,
+}
+
+
+def layer_halo(func, params, dtype=None):
+    """레이어 하나의 공간 지지 반경 (dtype: 입력 자료형, 타일 처리 불가면 None)"""
+    support = SPATIAL_SUPPORT.get(func, _non_local)
+    return support(func, params, dtype)
+
+
+def pipeline_halo(steps, dtype=None):
+    """레이어 스택 전체의 후광 크기 (반경의 합, 타일 처리 불가면 None)
+
+    dtype은 입력 이미지의 자료형이다. 모르면 자료형마다 다른 반경 중 큰 쪽을 쓴다.
+    """
+    total = 0
+    for _, func, params, _ in steps:
+        radius = layer_halo(func, params, dtype)
+        if radius is None:
+            return None
+        total += radius
+    return total
+
+
+def non_tileable_layers(steps):
+    """타일로 나눌 수 없는 레이어 이름 목록"""
+    return [name for name, func, params, _ in steps if layer_halo(func, params) is None]
+
+
+def tile_grid(height, width, tile_size):
+    """(y0, y1, x0, x1) 타일 영역 목록"""
+    return [(y, min(y + tile_size, height), x, min(x + tile_size, width))
+            for y in range(0, height, tile_size)
+            for x in range(0, width, tile_size)]
+
+
+def tiles_in_rect(height, width, tile_size, rect):
+    """영역 (y0, y1, x0, x1)과 겹치는 타일 영역 목록 (tile_grid와 같은 격자)"""
+    y0, y1, x0, x1 = rect
+    return [(y, min(y + tile_size, height), x, min(x + tile_size, width))
+            for y in range(y0 // tile_size * tile_size, min(y1, height), tile_size)
+            for x in range(x0 // tile_size * tile_size, min(x1, width), tile_size)]
+
+
+def render_tile(image, steps, rect, halo, pool=None):
+    """후광을 붙여 한 영역을 계산한 뒤 가운데만 반환
+
+    pool을 주면 반환된 영역은 풀 버퍼의 뷰이므로 다 쓴 뒤 pool.release로 돌려준다.
+    """
+    height, width = image.shape[:2]
+    y0, y1, x0, x1 = rect
+    hy0, hy1 = max(0, y0 - halo), min(height, y1 + halo)
+    hx0, hx1 = max(0, x0 - halo), min(width, x1 + halo)
+    # 메모리 맵 원본에서도 이 영역만 읽도록 연속 배열로 복사
+    region = np.ascontiguousarray(image[hy0:hy1, hx0:hx1])
+    result = run_layers(region, steps, pool=pool)
+    return result[y0 - hy0:y1 - hy0, x0 - hx0:x1 - hx0]
+
+
+def run_tiled(image, steps, tile_size=DEFAULT_TILE_SIZE, workers=1, out=None,
+              is_cancelled=None):
+    """레이어 스택을 타일 단위로 실행
+
+    out에 미리 할당한 배열(메모리 맵 포함)을 주면 결과를 그 안에 바로 쓴다.
+    출력 모양을 미리 알 수 없으면 out에 (모양, 자료형)을 받아 배열을 만드는 함수를
+    주면 첫 타일을 계산한 뒤 호출한다.
+    최대 메모리는 이미지 크기가 아니라 (타일 + 후광) 크기 x 작업자 수에 비례한다.
+    """
+    halo = pipeline_halo(steps, image.dtype)
+    if halo is None:
+        names = ", ".join(non_tileable_layers(steps))
+        raise ValueError(f"타일로 나눌 수 없는 레이어가 있습니다: {names}")
+
+    height, width = image.shape[:2]
+    tiles = tile_grid(height, width, tile_size)
+
+    def write(rect, tile):
+        nonlocal out
+        y0, y1, x0, x1 = rect
+        if out is None or callable(out):
+            allocate = out or np.empty
+            out = allocate((height, width) + tile.shape[2:], tile.dtype)
+        out[y0:y1, x0:x1] = tile
+
+    def check_cancelled():
+        if is_cancelled is not None and is_cancelled():
+            raise RenderCancelled()
+
+    # 스레드마다 버퍼 풀을 두어 같은 크기의 타일은 같은 버퍼를 다시 씀
+    pools = threading.local()
+
+    def process(rect):
+        pool = getattr(pools, 'pool', None)
+        if pool is None:
+            pool = pools.pool = BufferPool()
+        tile = render_tile(image, steps, rect, halo, pool)
+        write(rect, tile)
+        pool.release(tile)
+
+    # 첫 타일로 출력 채널 수와 자료형을 정한 뒤 나머지는 각 스레드가 바로 기록
+    process(tiles[0])
+    rest = tiles[1:]
+    if workers > 1:
+        # 제출한 타일이 한꺼번에 쌓이지 않도록 작업자 수의 두 배씩 나누어 제출
+        chunk = workers * 2
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for i in range(0, len(rest), chunk):
+                check_cancelled()
+                list(executor.map(process, rest[i:i + chunk]))
+    else:
+        for rect in rest:
+            check_cancelled()
+            process(rect)
+    return out
@@ -1,15 +1,88 @@
 """메인 진입점"""
+import time
+
+# --startup-time 측정 기준 (다른 모듈을 불러오기 전)
+STARTED_AT = time.perf_counter()
+
+import argparse
+import sys
 import tkinter as tk
+
 from ui.gui import ImageProcessingGUI
 
 
-def main():
+# 실행부터 첫 창 표시까지 허용하는 시간 (ms)
+STARTUP_BUDGET_MS = 400
+# 창이 끝내 표시되지 않을 때 측정을 포기하는 시간 (ms)
+STARTUP_TIMEOUT_MS = 10000
+
+
+def measure_startup(root, app, marks):
+    """첫 창 표시와 엔진 준비 시점을 기록한 뒤 창 닫기"""
+    def on_map(event):
+        if event.widget is root and 'window' not in marks:
+            marks['window'] = time.perf_counter()
+            marks['heavy'] = [name for name in ('numpy', 'cv2') if name in sys.modules]
+
+    def wait_engine():
+        if 'window' in marks and app.engine_ready:
+            marks['engine'] = time.perf_counter()
+            root.destroy()
+        else:
+            root.after(1, wait_engine)
+
+    root.bind('<Map>', on_map, add='+')
+    root.after(1, wait_engine)
+    root.after(STARTUP_TIMEOUT_MS, root.destroy)
+
+
+def print_startup_report(marks, budget_ms):
+    """단계별 시작 시간 출력 (예산을 넘으면 False)"""
+    labels = [
+        ('imports', "모듈 불러오기"),
+        ('root', "Tk 창 생성"),
+        ('widgets', "위젯 생성"),
+        ('window', "첫 창 표시"),
+        ('engine', "엔진 준비"),
+    ]
+    print("⏱️ 시작 시간 (실행 시점 기준)")
+    for key, label in labels:
+        if key in marks:
+            print(f"  {label:<12} {(marks[key] - STARTED_AT) * 1000:8.1f}ms")
+        else:
+            print(f"  {label:<12}        -")
+    if 'window' not in marks:
+        print("❌ 창이 표시되지 않았습니다")
+        return False
+    heavy = ", ".join(marks['heavy']) or "없음"
+    print(f"  첫 창 표시 전에 불러온 무거운 모듈: {heavy}")
+    window_ms = (marks['window'] - STARTED_AT) * 1000
+    ok = window_ms <= budget_ms
+    print(f"{'✅' if ok else '❌'} 첫 창 표시 {window_ms:.1f}ms / 예산 {budget_ms}ms")
+    return ok
+
+
+def main(argv=None):
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="Image Processing Studio")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="첫 창 표시까지의 시간을 측정해 출력하고 종료")
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help=f"--startup-time의 첫 창 표시 시간 예산 (기본: {STARTUP_BUDGET_MS}ms)")
+    args = parser.parse_args(argv)
+
+    marks = {'imports': time.perf_counter()}
     root = tk.Tk()
+    marks['root'] = time.perf_counter()
     app = ImageProcessingGUI(root)
+    marks['widgets'] = time.perf_counter()
+    if args.startup_time:
+        measure_startup(root, app, marks)
     root.mainloop()
+    if args.startup_time:
+        return 0 if print_startup_report(marks, args.budget_ms) else 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
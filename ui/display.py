@@ -0,0 +1,54 @@
+"""화면 표시용 이미지 축소
+
+원본 크기 이미지를 통째로 색 변환한 뒤 줄이면 표시할 때마다 전체 화소를 여러 번
+읽게 된다. 먼저 표시 크기로 줄인 다음 작은 결과만 색 변환한다.
+
+모든 축소는 영역 평균(INTER_AREA)으로 해서 건너뛴 화소가 물결무늬(모아레)로
+남지 않게 한다. OpenCV의 INTER_AREA는 정수 배율이 아니면 느리므로, 표시 크기의
+4배 이상인 이미지는 2:1 영역 평균으로 반씩 줄여 2배 이내로 만든 뒤 마지막에 한 번
+더 영역 평균으로 맞춘다 (8000x6000 -> 866x650이 한 번에 줄이면 약 190 ms, 반씩
+줄이면 약 55 ms).
+
+반씩 줄여도 원본 화소를 모두 읽어야 하므로, DISPLAY_SAMPLE_PIXELS보다 큰 이미지만
+예외적으로 최근접 화소로 2배 크기까지 솎아낸 뒤 줄인다. 건너뛴 행은 읽지 않으므로
+원본 크기와 거의 무관하게 몇 ms 안에 끝나지만 모아레가 생길 수 있다.
+"""
+import cv2
+
+from image_processing.buffer_pool import scratch_buffer
+
+
+DISPLAY_MAX_WIDTH = 1000
+DISPLAY_MAX_HEIGHT = 650
+
+# 이보다 화소가 많으면 최근접 화소로 솎아냄 (16000x12000을 반씩 줄이면 약 170 ms)
+DISPLAY_SAMPLE_PIXELS = 100_000_000
+
+
+def shrink_for_display(image, size):
+    """(너비, 높이)로 줄인 uint8 이미지 (임시 버퍼를 재사용하므로 바로 복사해서 써야 함)"""
+    height, width = image.shape[:2]
+    new_width, new_height = size
+    if (new_width, new_height) == (width, height):
+        return image
+    channels = image.shape[2:]
+    if width < new_width or height < new_height:
+        interpolation = cv2.INTER_LINEAR
+    elif width * height > DISPLAY_SAMPLE_PIXELS and width > new_width * 2 and height > new_height * 2:
+        image = cv2.resize(image, (new_width * 2, new_height * 2),
+                           dst=scratch_buffer('display_sampled', (new_height * 2, new_width * 2) + channels, image.dtype),
+                           interpolation=cv2.INTER_NEAREST)
+        interpolation = cv2.INTER_AREA
+    else:
+        step = 0
+        while width >= new_width * 4 and height >= new_height * 4:
+            # 홀수 크기는 마지막 행/열을 버려 정확히 2:1로 줄임
+            width, height = width // 2, height // 2
+            image = cv2.resize(image[:height * 2, :width * 2], (width, height),
+                               dst=scratch_buffer(f'display_half{step}', (height, width) + channels, image.dtype),
+                               interpolation=cv2.INTER_AREA)
+            step += 1
+        interpolation = cv2.INTER_AREA
+    return cv2.resize(image, size,
+                      dst=scratch_buffer('display', (new_height, new_width) + channels, image.dtype),
+                      interpolation=interpolation)
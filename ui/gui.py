@@ -1,14 +1,45 @@
 """메인 GUI 클래스"""
-import cv2
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
+import time
+from tkinter import ttk, messagebox, filedialog
 
 from .components import ModernButton
+from .histogram_panel import HistogramPanel
+from .layer_list import LayerList
+from .render_worker import RenderWorker
 from .theme import Theme
-import image_processing.filters as filters
-import image_processing.transforms as transforms
-from utils.file_handler import load_image_file, save_image_file
+from image_processing.errors import LayerError, RenderCancelled
+from image_processing.layer_cache import LayerCache
+from image_processing.profiling import LayerProfiler
+from utils.lazy_import import lazy_import
+
+# cv2 / numpy / PIL을 끌어오는 모듈은 첫 창을 띄운 뒤 처음 쓸 때 불러옴 (init_engine 참고)
+ImageTk = lazy_import('PIL.ImageTk')
+file_handler = lazy_import('utils.file_handler')
+filters = lazy_import('image_processing.filters')
+histogram = lazy_import('image_processing.histogram')
+history = lazy_import('image_processing.history')
+layouts = lazy_import('image_processing.layouts')
+pipeline = lazy_import('image_processing.pipeline')
+proxy = lazy_import('image_processing.proxy')
+streaming = lazy_import('image_processing.streaming')
+tiling = lazy_import('image_processing.tiling')
+transforms = lazy_import('image_processing.transforms')
+image_viewer = lazy_import('ui.viewer')
+
+# 스트리밍 중 처리된 프레임을 확인하는 간격
+STREAM_POLL_MS = 10
+
+# 불러오기 / 저장 진행률을 상태바에 갱신하는 간격
+IO_POLL_MS = 100
+
+# 블러 강도 트랙바 (0~100) -> 시그마 범위 (로그 눈금, 0이면 블러 없음)
+BLUR_SIGMA_MIN = 0.5
+BLUR_SIGMA_MAX = 64.0
+
+# 히스토그램 계산 간격 (렌더 중에는 끝날 때까지 미룸)
+HISTOGRAM_INTERVAL_MS = 150
 
 
 class ImageProcessingGUI:
@@ -22,8 +53,45 @@ class ImageProcessingGUI:
         self.original_image = None
         self.current_image = None
         
-        # 레이어 시스템
-        self.layers = []
+        # 레이어 중간 결과 캐시 (앞쪽이 바뀌지 않은 레이어는 재계산하지 않음)
+        self.layer_cache = LayerCache(max_bytes=512 * 1024 * 1024)
+        self.image_token = 0
+        
+        # 트랙바 미리보기 기준 이미지 (레이어 목록이 바뀔 때만 무효화)
+        self.preview_base = None
+        # 레이어로 확정되지 않은 트랙바 미리보기 변환 (func, params)
+        self.preview_layer = None
+        
+        # 프록시 모드: 상호작용 중에는 축소 이미지에서 레이어를 계산
+        self.proxy_enabled = True
+        self.proxy_image = None
+        self.proxy_scale = 1.0
+        
+        # 필터 계산은 백그라운드 작업자에서 실행 (최신 요청만 유지)
+        self.render_worker = RenderWorker(self.root)
+        
+        # 확대 / 이동 뷰 (프록시보다 확대하면 보이는 원본 타일만 따로 계산)
+        self.detail_worker = RenderWorker(self.root)
+        self.drag_start = None
+        
+        # 불러오기 / 저장은 별도 작업자에서 (Esc로 취소)
+        self.io_worker = RenderWorker(self.root)
+        self.io_title = ""
+        self.io_progress = None
+        self.io_active = False
+        
+        # 히스토그램은 표시된 이미지의 표본에서 별도 작업자로 (같은 상태면 캐시 사용)
+        self.histogram_worker = RenderWorker(self.root)
+        self.histogram_pending = None
+        self.histogram_scheduled = False
+        self.histogram_key = None
+        
+        # 동영상 / 카메라 스트리밍 (멈추면 마지막 프레임을 정지 이미지로 계속 편집)
+        self.video_stream = None
+        self.stream_frame = None
+        
+        # 레이어별 실행 시간 기록 (레이어 목록 옆에 표시)
+        self.layer_profiler = LayerProfiler()
         
         # 색상 팔레트
         self.colors = Theme.get_theme('light')
@@ -31,6 +99,40 @@ class ImageProcessingGUI:
         # GUI 구성
         self.create_widgets()
         
+        # 단축키
+        self.root.bind('<Control-z>', lambda e: self.undo())
+        self.root.bind('<Control-y>', lambda e: self.redo())
+        self.root.bind('<Control-Z>', lambda e: self.redo())
+        self.root.bind('<Escape>', lambda e: self.cancel_io())
+        
+        # 파이프라인 / 뷰 등 cv2, numpy가 필요한 객체는 첫 창이 그려진 뒤에 만듦
+        self.engine_ready = False
+        self.root.bind('<Map>', self.on_first_map, add='+')
+    
+    def on_first_map(self, event):
+        """창이 처음 표시되면 남은 초기화를 유휴 시간에 실행"""
+        if event.widget is self.root and not self.engine_ready:
+            self.root.after_idle(self.init_engine)
+    
+    def init_engine(self):
+        """무거운 모듈을 불러오고 레이어 시스템 / 뷰 / 실행 취소 기록 생성 (한 번만)"""
+        if self.engine_ready:
+            return
+        
+        # 레이어 시스템 (Tk와 무관한 파이프라인 객체)
+        self.pipeline = pipeline.Pipeline(cache=self.layer_cache)
+        
+        # 확대 / 이동 뷰
+        self.viewer = image_viewer.ImageViewer()
+        
+        # 실행 취소 / 다시 실행 (캐시에서 밀려난 결과는 압축 스냅샷으로 보관)
+        self.history = history.EditHistory()
+        self.snapshots = history.SnapshotStore()
+        
+        # 상태별 히스토그램 결과
+        self.histogram_cache = histogram.HistogramCache()
+        self.engine_ready = True
+        
     def create_widgets(self):
         header_canvas = tk.Canvas(self.root, height=100, bg=self.colors['primary'], 
                                  highlightthickness=0)
@@ -61,6 +163,16 @@ class ImageProcessingGUI:
                                 width=180, height=50)
         btn_reset.pack(side=tk.LEFT, padx=8)
         
+        btn_proxy = ModernButton(button_frame, "⚡ 미리보기 모드", self.toggle_proxy_mode,
+                                self.colors['info'], self.colors['primary'],
+                                width=180, height=50)
+        btn_proxy.pack(side=tk.LEFT, padx=8)
+        
+        btn_stream = ModernButton(button_frame, "🎥 영상 스트리밍", self.toggle_video_stream,
+                                 self.colors['info'], self.colors['primary'],
+                                 width=180, height=50)
+        btn_stream.pack(side=tk.LEFT, padx=8)
+        
         # 메인 컨테이너
         main_container = tk.Frame(self.root, bg=self.colors['light'])
         main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
@@ -156,8 +268,11 @@ class ImageProcessingGUI:
         # 4. 히스토그램 평활화
         self.create_category_button(scrollable_frame, "📊 히스토그램 평활화", self.apply_histogram_eq)
         
-        # 5. 블러링
-        self.create_category_button(scrollable_frame, "💨 블러링", self.apply_gaussian_blur)
+        # 5. 블러링 (트랙바 버튼)
+        blur_btn_frame = self.create_category_button(scrollable_frame, "💨 블러링", lambda: self.toggle_trackbar_section('blur'))
+        self.trackbar_buttons['blur'] = blur_btn_frame
+        self.trackbar_sections['blur'] = None
+        self.blur_section_visible = False
         
         # 6. 샤프닝
         self.create_category_button(scrollable_frame, "✨ 샤프닝", self.apply_sharpening)
@@ -220,6 +335,14 @@ class ImageProcessingGUI:
                                     relief=tk.FLAT, bd=0)
         self.image_label.pack(expand=True, fill=tk.BOTH)
         
+        # 휠로 확대/축소, 끌어서 이동, 더블클릭으로 전체 보기 / 1:1 전환
+        self.image_label.bind("<MouseWheel>", lambda e: self.zoom_view(e, e.delta > 0))
+        self.image_label.bind("<Button-4>", lambda e: self.zoom_view(e, True))
+        self.image_label.bind("<Button-5>", lambda e: self.zoom_view(e, False))
+        self.image_label.bind("<ButtonPress-1>", self.start_pan)
+        self.image_label.bind("<B1-Motion>", self.pan_view)
+        self.image_label.bind("<Double-Button-1>", self.toggle_zoom)
+        
         # 레이어 패널 (오른쪽)
         self.create_layer_panel(right_panel)
         
@@ -244,6 +367,10 @@ class ImageProcessingGUI:
         title_frame = tk.Frame(layer_panel, bg=self.colors['sidebar'])
         title_frame.pack(fill=tk.X, pady=(0, 15))
         
+        # 히스토그램 (레이어 목록 위)
+        self.histogram_panel = HistogramPanel(layer_panel, self.colors)
+        self.histogram_panel.pack(fill=tk.X, pady=(0, 10))
+        
         tk.Label(title_frame, text="📚 레이어", bg=self.colors['sidebar'], 
                 fg=self.colors['text_dark'],
                 font=('Segoe UI', 16, 'bold')).pack(anchor='w')
@@ -293,6 +420,11 @@ class ImageProcessingGUI:
                                           justify=tk.CENTER)
         self.layer_empty_label.pack(pady=30)
         
+        # 레이어 행 (편집할 때 바뀐 행만 고침)
+        self.layer_list = LayerList(layer_scrollable_frame, self.colors,
+                                    self.toggle_layer, self.remove_layer,
+                                    self.layer_empty_label)
+        
         # 스크롤바와 캔버스 배치
         layer_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         layer_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -301,6 +433,18 @@ class ImageProcessingGUI:
         layer_control_frame = tk.Frame(layer_panel, bg=self.colors['sidebar'])
         layer_control_frame.pack(fill=tk.X, pady=(10, 0))
         
+        # 실행 취소 / 다시 실행 버튼
+        history_frame = tk.Frame(layer_control_frame, bg=self.colors['sidebar'])
+        history_frame.pack(fill=tk.X, pady=(0, 5))
+        for text, command in (("↶ 실행 취소", self.undo), ("↷ 다시 실행", self.redo)):
+            tk.Button(history_frame, text=text,
+                     command=command,
+                     bg=self.colors['btn_bg'],
+                     fg=self.colors['text_dark'],
+                     font=('Segoe UI', 9),
+                     relief=tk.FLAT, padx=10, pady=6,
+                     cursor='hand2').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 2))
+        
         # 모든 레이어 적용 버튼
         apply_all_btn = tk.Button(layer_control_frame, text="✅ 모두 적용",
                                  command=self.apply_all_layers,
@@ -322,6 +466,24 @@ class ImageProcessingGUI:
                                  cursor='hand2',
                                  activebackground=self.colors['danger_hover'])
         clear_all_btn.pack(fill=tk.X)
+        
+        # 레이어별 성능 기록
+        self.track_memory_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(layer_control_frame, text="메모리 측정",
+                      variable=self.track_memory_var,
+                      command=lambda: self.layer_profiler.set_track_memory(self.track_memory_var.get()),
+                      bg=self.colors['sidebar'],
+                      fg=self.colors['text_dark'],
+                      activebackground=self.colors['sidebar'],
+                      font=('Segoe UI', 8)).pack(anchor='w', pady=(5, 0))
+        export_btn = tk.Button(layer_control_frame, text="📊 성능 기록 내보내기",
+                              command=self.export_layer_stats,
+                              bg=self.colors['btn_bg'],
+                              fg=self.colors['text_dark'],
+                              font=('Segoe UI', 9),
+                              relief=tk.FLAT, padx=10, pady=6,
+                              cursor='hand2')
+        export_btn.pack(fill=tk.X, pady=(5, 0))
     
     def create_section_title(self, parent, text):
         """섹션 제목 생성"""
@@ -398,7 +560,7 @@ class ImageProcessingGUI:
     
     def hide_all_trackbars(self):
         """모든 트랙바 섹션 숨기기"""
-        for section_type in ['brightness', 'contrast', 'scale', 'translation', 'rotation']:
+        for section_type in ['brightness', 'contrast', 'blur', 'scale', 'translation', 'rotation']:
             trackbar_frame = self.trackbar_sections.get(section_type)
             if trackbar_frame is not None:
                 if section_type == 'brightness' and self.brightness_section_visible:
@@ -407,6 +569,9 @@ class ImageProcessingGUI:
                 elif section_type == 'contrast' and self.contrast_section_visible:
                     trackbar_frame.pack_forget()
                     self.contrast_section_visible = False
+                elif section_type == 'blur' and self.blur_section_visible:
+                    trackbar_frame.pack_forget()
+                    self.blur_section_visible = False
                 elif section_type == 'scale' and self.scale_section_visible:
                     trackbar_frame.pack_forget()
                     self.scale_section_visible = False
@@ -427,6 +592,8 @@ class ImageProcessingGUI:
                 self.brightness_scale.set(0)
             if hasattr(self, 'contrast_scale'):
                 self.contrast_scale.set(1.0)
+            if hasattr(self, 'blur_scale'):
+                self.blur_scale.set(0)
             if hasattr(self, 'scale_scale'):
                 self.scale_scale.set(100)
             if hasattr(self, 'translation_x_scale'):
@@ -438,7 +605,7 @@ class ImageProcessingGUI:
     def toggle_trackbar_section(self, section_type):
         """트랙바 섹션 표시/숨김 토글"""
         # 다른 트랙바들 숨기기
-        for other_type in ['brightness', 'contrast', 'scale', 'translation', 'rotation']:
+        for other_type in ['brightness', 'contrast', 'blur', 'scale', 'translation', 'rotation']:
             if other_type != section_type:
                 other_frame = self.trackbar_sections.get(other_type)
                 if other_frame is not None:
@@ -448,6 +615,9 @@ class ImageProcessingGUI:
                     elif other_type == 'contrast' and self.contrast_section_visible:
                         other_frame.pack_forget()
                         self.contrast_section_visible = False
+                    elif other_type == 'blur' and self.blur_section_visible:
+                        other_frame.pack_forget()
+                        self.blur_section_visible = False
                     elif other_type == 'scale' and self.scale_section_visible:
                         other_frame.pack_forget()
                         self.scale_section_visible = False
@@ -470,6 +640,8 @@ class ImageProcessingGUI:
                 trackbar_frame = self.create_brightness_section(btn_frame)
             elif section_type == 'contrast':
                 trackbar_frame = self.create_contrast_section(btn_frame)
+            elif section_type == 'blur':
+                trackbar_frame = self.create_blur_section(btn_frame)
             elif section_type == 'scale':
                 trackbar_frame = self.create_scale_section(btn_frame)
             elif section_type == 'translation':
@@ -485,6 +657,8 @@ class ImageProcessingGUI:
                 self.brightness_section_visible = True
             elif section_type == 'contrast':
                 self.contrast_section_visible = True
+            elif section_type == 'blur':
+                self.blur_section_visible = True
             elif section_type == 'scale':
                 self.scale_section_visible = True
             elif section_type == 'translation':
@@ -507,6 +681,13 @@ class ImageProcessingGUI:
                 else:
                     trackbar_frame.pack(fill=tk.X, pady=5, padx=15, after=btn_frame)
                     self.contrast_section_visible = True
+            elif section_type == 'blur':
+                if self.blur_section_visible:
+                    trackbar_frame.pack_forget()
+                    self.blur_section_visible = False
+                else:
+                    trackbar_frame.pack(fill=tk.X, pady=5, padx=15, after=btn_frame)
+                    self.blur_section_visible = True
             elif section_type == 'scale':
                 if self.scale_section_visible:
                     trackbar_frame.pack_forget()
@@ -604,21 +785,8 @@ class ImageProcessingGUI:
         brightness = int(float(value))
         self.brightness_value_label.config(text=str(brightness))
         
-        # 원본 이미지에서 시작하여 레이어 적용 후 밝기 조절 (미리보기)
-        base_image = self.original_image.copy()
-        for layer in self.layers:
-            if layer['enabled']:
-                try:
-                    if layer['params']:
-                        base_image = layer['func'](base_image, **layer['params'])
-                    else:
-                        base_image = layer['func'](base_image)
-                except Exception:
-                    pass
-        
-        # 밝기 조절 적용 (미리보기)
-        self.current_image = transforms.adjust_brightness(base_image, brightness)
-        self.display_image(self.current_image)
+        # 레이어 스택 결과 위에 밝기 조절만 적용 (미리보기)
+        self.request_preview(transforms.adjust_brightness, {'value': brightness})
         self.status_bar.config(text=f"☀️ 밝기 미리보기: {brightness:+d}")
     
     def apply_brightness_layer(self):
@@ -630,9 +798,7 @@ class ImageProcessingGUI:
         if brightness == 0:
             return  # 0이면 레이어 추가 안 함
         
-        # 람다 함수로 밝기 조절 함수 생성
-        brightness_func = lambda img, b=brightness: transforms.adjust_brightness(img, b)
-        self.add_layer(f"☀️ 밝기 {brightness:+d}", brightness_func)
+        self.add_layer(f"☀️ 밝기 {brightness:+d}", 'brightness', {'value': brightness})
         self.status_bar.config(text=f"✅ 밝기 레이어 추가됨: {brightness:+d}")
     
     def reset_brightness(self):
@@ -712,20 +878,8 @@ class ImageProcessingGUI:
         contrast = float(value)
         self.contrast_value_label.config(text=f"{contrast:.2f}")
         
-        # 원본 이미지에서 시작하여 레이어 적용 후 대비 조절 (미리보기)
-        base_image = self.original_image.copy()
-        for layer in self.layers:
-            if layer['enabled']:
-                try:
-                    if layer['params']:
-                        base_image = layer['func'](base_image, **layer['params'])
-                    else:
-                        base_image = layer['func'](base_image)
-                except Exception:
-                    pass
-        
-        self.current_image = transforms.adjust_contrast(base_image, contrast)
-        self.display_image(self.current_image)
+        # 레이어 스택 결과 위에 대비 조절만 적용 (미리보기)
+        self.request_preview(transforms.adjust_contrast, {'value': contrast})
         self.status_bar.config(text=f"🎨 명암 대비 미리보기: {contrast:.2f}")
     
     def apply_contrast_layer(self):
@@ -737,9 +891,7 @@ class ImageProcessingGUI:
         if contrast == 1.0:
             return  # 1.0이면 레이어 추가 안 함
         
-        # 람다 함수로 대비 조절 함수 생성
-        contrast_func = lambda img, c=contrast: transforms.adjust_contrast(img, c)
-        self.add_layer(f"🎨 명암 대비 {contrast:.2f}", contrast_func)
+        self.add_layer(f"🎨 명암 대비 {contrast:.2f}", 'contrast', {'value': contrast})
         self.status_bar.config(text=f"✅ 명암 대비 레이어 추가됨: {contrast:.2f}")
     
     def reset_contrast(self):
@@ -749,6 +901,107 @@ class ImageProcessingGUI:
             self.apply_all_layers()
             self.status_bar.config(text="↻ 명암 대비 트랙바 리셋됨")
     
+    def create_blur_section(self, parent_frame):
+        """블러 강도 섹션 (시그마 트랙바)"""
+        trackbar_frame = tk.Frame(self.scrollable_frame, bg=self.colors['btn_bg'], relief=tk.FLAT, bd=1)
+        
+        self.blur_value_label = tk.Label(trackbar_frame, text="σ 0", 
+                                         bg=self.colors['btn_bg'],
+                                         fg=self.colors['primary'],
+                                         font=('Segoe UI', 14, 'bold'))
+        self.blur_value_label.pack(pady=8)
+        
+        style = ttk.Style()
+        style.configure("Blur.Horizontal.TScale",
+                       background=self.colors['primary'],
+                       troughcolor='#E0E6ED',
+                       borderwidth=0,
+                       lightcolor=self.colors['primary'],
+                       darkcolor=self.colors['primary'])
+        
+        self.blur_scale = ttk.Scale(trackbar_frame, from_=0, to=100,
+                                   orient=tk.HORIZONTAL,
+                                   style="Blur.Horizontal.TScale",
+                                   command=self.on_blur_change)
+        self.blur_scale.set(0)
+        self.blur_scale.pack(fill=tk.X, padx=15, pady=8)
+        
+        range_frame = tk.Frame(trackbar_frame, bg=self.colors['btn_bg'])
+        range_frame.pack(fill=tk.X, padx=15)
+        tk.Label(range_frame, text="약하게", 
+                bg=self.colors['btn_bg'], fg=self.colors['text_gray'],
+                font=('Segoe UI', 8)).pack(side=tk.LEFT)
+        tk.Label(range_frame, text=f"σ {BLUR_SIGMA_MAX:g}", 
+                bg=self.colors['btn_bg'], fg=self.colors['text_gray'],
+                font=('Segoe UI', 8)).pack(side=tk.RIGHT)
+        
+        # 버튼 프레임
+        button_frame = tk.Frame(trackbar_frame, bg=self.colors['btn_bg'])
+        button_frame.pack(pady=10)
+        
+        # 적용 버튼
+        apply_btn = tk.Button(button_frame, text="✅ 적용", 
+                             command=self.apply_blur_layer,
+                             bg=self.colors['success'], 
+                             fg='white',
+                             font=('Segoe UI', 9, 'bold'),
+                             relief=tk.FLAT, padx=15, pady=5,
+                             cursor='hand2',
+                             activebackground=self.colors['success_hover'])
+        apply_btn.pack(side=tk.LEFT, padx=5)
+        
+        # 리셋 버튼
+        reset_btn = tk.Button(button_frame, text="↻ 리셋", 
+                             command=self.reset_blur,
+                             bg=self.colors['btn_hover'], 
+                             fg=self.colors['text_dark'],
+                             font=('Segoe UI', 9, 'bold'),
+                             relief=tk.FLAT, padx=15, pady=5,
+                             cursor='hand2',
+                             activebackground=self.colors['primary'])
+        reset_btn.pack(side=tk.LEFT, padx=5)
+        
+        return trackbar_frame
+    
+    def get_blur_sigma(self, strength):
+        """블러 강도 (0~100) -> 시그마 (로그 눈금, 0이면 블러 없음)"""
+        strength = float(strength)
+        if strength <= 0:
+            return 0.0
+        sigma = BLUR_SIGMA_MIN * (BLUR_SIGMA_MAX / BLUR_SIGMA_MIN) ** (strength / 100)
+        return round(sigma, 1)
+    
+    def on_blur_change(self, value):
+        """블러 트랙바 값 변경 시 (미리보기만)"""
+        if self.original_image is None:
+            return
+        
+        sigma = self.get_blur_sigma(value)
+        self.blur_value_label.config(text=f"σ {sigma:g}")
+        
+        # 레이어 스택 결과 위에 블러만 적용 (미리보기)
+        self.request_preview(filters.apply_gaussian_sigma, {'sigma': sigma})
+        self.status_bar.config(text=f"💨 블러 미리보기: σ {sigma:g}")
+    
+    def apply_blur_layer(self):
+        """블러를 레이어로 적용"""
+        if self.original_image is None:
+            return
+        
+        sigma = self.get_blur_sigma(self.blur_scale.get())
+        if sigma == 0:
+            return  # 0이면 레이어 추가 안 함
+        
+        self.add_layer(f"💨 블러 σ {sigma:g}", 'gaussian_sigma', {'sigma': sigma})
+        self.status_bar.config(text=f"✅ 블러 레이어 추가됨: σ {sigma:g}")
+    
+    def reset_blur(self):
+        """블러 트랙바 리셋"""
+        self.blur_scale.set(0)
+        if self.original_image is not None:
+            self.apply_all_layers()
+            self.status_bar.config(text="↻ 블러 트랙바 리셋됨")
+    
     def create_scale_section(self, parent_frame):
         """확대/축소 섹션"""
         trackbar_frame = tk.Frame(self.scrollable_frame, bg=self.colors['btn_bg'], relief=tk.FLAT, bd=1)
@@ -819,20 +1072,8 @@ class ImageProcessingGUI:
         scale_percent = int(float(value))
         self.scale_value_label.config(text=f"{scale_percent}%")
         
-        # 원본 이미지에서 시작하여 레이어 적용 후 확대/축소 (미리보기)
-        base_image = self.original_image.copy()
-        for layer in self.layers:
-            if layer['enabled']:
-                try:
-                    if layer['params']:
-                        base_image = layer['func'](base_image, **layer['params'])
-                    else:
-                        base_image = layer['func'](base_image)
-                except Exception:
-                    pass
-        
-        self.current_image = transforms.scale_image(base_image, scale_percent)
-        self.display_image(self.current_image)
+        # 레이어 스택 결과 위에 확대/축소만 적용 (미리보기)
+        self.request_preview(transforms.scale_image, {'scale_percent': scale_percent})
         self.status_bar.config(text=f"🔍 확대/축소 미리보기: {scale_percent}%")
     
     def apply_scale_layer(self):
@@ -844,9 +1085,8 @@ class ImageProcessingGUI:
         if scale_percent == 100:
             return  # 100%이면 레이어 추가 안 함
         
-        # 람다 함수로 확대/축소 함수 생성
-        scale_func = lambda img, s=scale_percent: transforms.scale_image(img, s)
-        self.add_layer(f"🔍 확대/축소 {scale_percent}%", scale_func)
+        self.add_layer(f"🔍 확대/축소 {scale_percent}%", 'scale',
+                       {'scale_percent': scale_percent})
         self.status_bar.config(text=f"✅ 확대/축소 레이어 추가됨: {scale_percent}%")
     
     def reset_scale(self):
@@ -933,20 +1173,8 @@ class ImageProcessingGUI:
         self.translation_x_label.config(text=str(tx))
         self.translation_y_label.config(text=str(ty))
         
-        # 원본 이미지에서 시작하여 레이어 적용 후 평행이동 (미리보기)
-        base_image = self.original_image.copy()
-        for layer in self.layers:
-            if layer['enabled']:
-                try:
-                    if layer['params']:
-                        base_image = layer['func'](base_image, **layer['params'])
-                    else:
-                        base_image = layer['func'](base_image)
-                except Exception:
-                    pass
-        
-        self.current_image = transforms.translate_image(base_image, tx, ty)
-        self.display_image(self.current_image)
+        # 레이어 스택 결과 위에 평행이동만 적용 (미리보기)
+        self.request_preview(transforms.translate_image, {'tx': tx, 'ty': ty})
         self.status_bar.config(text=f"↔️ 평행이동 미리보기: X={tx}, Y={ty}")
     
     def apply_translation_layer(self):
@@ -959,9 +1187,7 @@ class ImageProcessingGUI:
         if tx == 0 and ty == 0:
             return  # 0, 0이면 레이어 추가 안 함
         
-        # 람다 함수로 평행이동 함수 생성
-        translation_func = lambda img, x=tx, y=ty: transforms.translate_image(img, x, y)
-        self.add_layer(f"↔️ 평행이동 X={tx} Y={ty}", translation_func)
+        self.add_layer(f"↔️ 평행이동 X={tx} Y={ty}", 'translate', {'tx': tx, 'ty': ty})
         self.status_bar.config(text=f"✅ 평행이동 레이어 추가됨: X={tx}, Y={ty}")
     
     def reset_translation(self):
@@ -1042,20 +1268,8 @@ class ImageProcessingGUI:
         angle = int(float(value))
         self.rotation_value_label.config(text=f"{angle}°")
         
-        # 원본 이미지에서 시작하여 레이어 적용 후 회전 (미리보기)
-        base_image = self.original_image.copy()
-        for layer in self.layers:
-            if layer['enabled']:
-                try:
-                    if layer['params']:
-                        base_image = layer['func'](base_image, **layer['params'])
-                    else:
-                        base_image = layer['func'](base_image)
-                except Exception:
-                    pass
-        
-        self.current_image = transforms.rotate_image(base_image, angle)
-        self.display_image(self.current_image)
+        # 레이어 스택 결과 위에 회전만 적용 (미리보기)
+        self.request_preview(transforms.rotate_image, {'angle': angle})
         self.status_bar.config(text=f"🔄 회전 미리보기: {angle}°")
     
     def apply_rotation_layer(self):
@@ -1067,9 +1281,7 @@ class ImageProcessingGUI:
         if angle == 0:
             return  # 0도이면 레이어 추가 안 함
         
-        # 람다 함수로 회전 함수 생성
-        rotation_func = lambda img, a=angle: transforms.rotate_image(img, a)
-        self.add_layer(f"🔄 회전 {angle}°", rotation_func)
+        self.add_layer(f"🔄 회전 {angle}°", 'rotate', {'angle': angle})
         self.status_bar.config(text=f"✅ 회전 레이어 추가됨: {angle}°")
     
     def reset_rotation(self):
@@ -1080,49 +1292,196 @@ class ImageProcessingGUI:
             self.status_bar.config(text="↻ 회전 트랙바 리셋됨")
     
     def load_image(self):
-        """이미지 파일 불러오기"""
-        image, file_path = load_image_file()
-        if image is not None:
-            self.original_image = image
-            self.current_image = self.original_image.copy()
-            # 레이어 초기화
-            self.layers.clear()
-            self.update_layer_display()
-            self.display_image(self.current_image)
-            # 모든 트랙바 리셋
-            if hasattr(self, 'brightness_scale'):
-                self.brightness_scale.set(0)
-            if hasattr(self, 'contrast_scale'):
-                self.contrast_scale.set(1.0)
-            if hasattr(self, 'scale_scale'):
-                self.scale_scale.set(100)
-            if hasattr(self, 'translation_x_scale'):
-                self.translation_x_scale.set(0)
-                self.translation_y_scale.set(0)
-            if hasattr(self, 'rotation_scale'):
-                self.rotation_scale.set(0)
-            import os
-            filename = os.path.basename(file_path)
-            self.status_bar.config(text=f"✅ 이미지 로드 완료: {filename}")
+        """이미지 파일 불러오기 (축소 디코딩한 미리보기를 먼저 표시하고 원본은 백그라운드에서)"""
+        self.init_engine()
+        file_path = file_handler.ask_open_path()
+        if not file_path:
+            return
+        if self.video_stream is not None:
+            self.stop_video_stream()
+        self.render_worker.cancel()
+        filename = os.path.basename(file_path)
+        worker = self.io_worker
+        max_width, max_height = self.viewer.width, self.viewer.height
+        report = self.report_io_progress
+        
+        def job(is_cancelled):
+            report("미리보기", None)
+            preview, factor = file_handler.read_preview(file_path, max_width, max_height)
+            if preview is not None:
+                worker.post(self.on_preview_loaded, (preview, factor))
+            if is_cancelled():
+                raise RenderCancelled()
+            image = file_handler.read_image(file_path, report, is_cancelled)
+            if image is None:
+                raise ValueError("이미지를 불러올 수 없습니다.")
+            if is_cancelled():
+                raise RenderCancelled()
+            report("프록시 생성", None)
+            proxy_image, proxy_scale = proxy.make_proxy(image)
+            return image, proxy_image, proxy_scale, filename
+        
+        self.start_io(f"불러오기: {filename}", job, self.on_image_loaded)
+    
+    def on_preview_loaded(self, loaded):
+        """축소 디코딩한 미리보기 표시 (메인 스레드)"""
+        preview, factor = loaded
+        self.viewer.set_image(preview, 1.0 / factor)
+        self.refresh_view()
+    
+    def on_image_loaded(self, loaded):
+        """원본 디코딩 완료 (메인 스레드)"""
+        image, proxy_image, proxy_scale, filename = loaded
+        self.original_image = image
+        self.proxy_image, self.proxy_scale = proxy_image, proxy_scale
+        self.current_image = self.get_source_image()
+        # 이전 이미지의 중간 결과는 더 이상 쓸 수 없음
+        self.image_token += 1
+        self.layer_cache.clear()
+        self.layer_profiler.clear()
+        self.history.clear()
+        self.snapshots.clear()
+        self.preview_base = None
+        self.preview_layer = None
+        self.render_worker.cancel()
+        # 레이어 초기화
+        self.pipeline.clear()
+        self.update_layer_display()
+        self.display_image(self.current_image, self.get_detail_key())
+        # 모든 트랙바 리셋
+        if hasattr(self, 'brightness_scale'):
+            self.brightness_scale.set(0)
+        if hasattr(self, 'contrast_scale'):
+            self.contrast_scale.set(1.0)
+        if hasattr(self, 'scale_scale'):
+            self.scale_scale.set(100)
+        if hasattr(self, 'translation_x_scale'):
+            self.translation_x_scale.set(0)
+            self.translation_y_scale.set(0)
+        if hasattr(self, 'rotation_scale'):
+            self.rotation_scale.set(0)
+        if hasattr(self, 'blur_scale'):
+            self.blur_scale.set(0)
+        self.status_bar.config(text=f"✅ 이미지 로드 완료: {filename}")
     
     def save_image(self):
-        """처리된 이미지 저장"""
-        if save_image_file(self.current_image):
-            self.status_bar.config(text="💾 이미지 저장 완료")
+        """처리된 이미지 저장 (원본 해상도로 다시 계산하고 인코딩까지 백그라운드에서)"""
+        if self.current_image is None:
+            messagebox.showwarning("⚠️ 경고", "저장할 이미지가 없습니다.")
+            return
+        file_path = file_handler.ask_save_path()
+        if not file_path:
+            return
+        filename = os.path.basename(file_path)
+        report = self.report_io_progress
+        # 스트리밍 중이면 지금 보이는 처리된 프레임을 저장
+        image = self.current_image if self.video_stream is not None else None
+        source = self.original_image
+        steps = self.get_render_steps(1.0)
+        preview_layer = self.preview_layer
+        cache = self.layer_cache
+        
+        def job(is_cancelled):
+            result = image
+            if result is None:
+                report("원본 해상도 렌더링", None)
+                # 원본 해상도 실행 시간은 레이어 목록의 표시 해상도 기록과 섞지 않음
+                result = pipeline.run_layers(source, steps, cache, is_cancelled)
+                if preview_layer is not None:
+                    func, params = preview_layer
+                    result = func(result, **params)
+            if not file_handler.write_image(file_path, result, report, is_cancelled):
+                raise ValueError("이미지를 저장할 수 없습니다.")
+            return filename
+        
+        self.start_io(f"저장: {filename}", job, self.on_image_saved)
+    
+    def on_image_saved(self, filename):
+        """저장 완료 (메인 스레드)"""
+        self.status_bar.config(text=f"💾 이미지 저장 완료: {filename}")
+        messagebox.showinfo("✅ 완료", "이미지가 저장되었습니다.")
+    
+    # 백그라운드 불러오기 / 저장
+    def start_io(self, title, job, on_done):
+        """불러오기 / 저장 작업 시작 (이전 작업은 취소)"""
+        self.io_title = title
+        self.io_progress = None
+        self.io_active = True
+        
+        def done(result):
+            self.io_active = False
+            on_done(result)
+        
+        self.io_worker.submit(job, done, self.on_io_error)
+        self.status_bar.config(text=f"⏳ {title} (Esc: 취소)")
+        self.root.after(IO_POLL_MS, self.poll_io_progress)
+    
+    def report_io_progress(self, stage, fraction):
+        """작업자 스레드에서 진행 단계 기록 (fraction: 0~1, 모르면 None)"""
+        self.io_progress = (stage, fraction)
+    
+    def poll_io_progress(self):
+        """진행률을 상태바에 표시 (메인 스레드)"""
+        if not self.io_active:
+            return
+        if self.io_progress is not None:
+            stage, fraction = self.io_progress
+            percent = f" {fraction * 100:.0f}%" if fraction is not None else ""
+            self.status_bar.config(text=f"⏳ {self.io_title} · {stage}{percent} (Esc: 취소)")
+        self.root.after(IO_POLL_MS, self.poll_io_progress)
+    
+    def cancel_io(self):
+        """진행 중인 불러오기 / 저장 취소"""
+        if not self.io_active:
+            return
+        self.io_active = False
+        self.io_worker.cancel()
+        self.status_bar.config(text=f"✖ 취소됨: {self.io_title}")
+        if self.current_image is not None and self.viewer.image is not self.current_image:
+            # 미리보기만 표시된 상태였으면 이전 이미지로 되돌림
+            self.display_image(self.current_image, self.get_detail_key() if self.preview_layer is None else None)
+    
+    def on_io_error(self, error):
+        """불러오기 / 저장 오류 표시 (메인 스레드)"""
+        self.io_active = False
+        if isinstance(error, LayerError):
+            self.on_render_error(error)
+            return
+        self.status_bar.config(text=f"❌ {self.io_title}")
+        messagebox.showerror("❌ 오류", str(error))
+    
+    def toggle_proxy_mode(self):
+        """프록시(축소) 미리보기 모드와 원본 해상도 모드 전환"""
+        self.proxy_enabled = not self.proxy_enabled
+        if self.original_image is None:
+            return
+        self.preview_base = None
+        self.preview_layer = None
+        self.apply_all_layers()
+        if self.proxy_enabled:
+            self.status_bar.config(text="⚡ 미리보기 모드: 축소 이미지에서 빠르게 계산합니다")
+        else:
+            self.status_bar.config(text="🖼️ 원본 해상도 모드: 전체 해상도로 계산합니다")
     
     def reset_image(self):
         """원본 이미지로 되돌리기"""
         if self.original_image is not None:
-            self.current_image = self.original_image.copy()
-            # 레이어 초기화
-            self.layers.clear()
+            # 레이어 초기화 (실행 취소로 되돌릴 수 있음)
+            if self.pipeline.layers:
+                self.record_edit(('replace', tuple(self.pipeline.layers), ()))
+            self.current_image = self.get_source_image()
+            self.preview_base = None
+            self.preview_layer = None
+            self.render_worker.cancel()
             self.update_layer_display()
-            self.display_image(self.current_image)
+            self.display_image(self.current_image, self.get_detail_key())
             # 모든 트랙바 리셋
             if hasattr(self, 'brightness_scale'):
                 self.brightness_scale.set(0)
             if hasattr(self, 'contrast_scale'):
                 self.contrast_scale.set(1.0)
+            if hasattr(self, 'blur_scale'):
+                self.blur_scale.set(0)
             if hasattr(self, 'scale_scale'):
                 self.scale_scale.set(100)
             if hasattr(self, 'translation_x_scale'):
@@ -1134,35 +1493,158 @@ class ImageProcessingGUI:
         else:
             messagebox.showwarning("⚠️ 경고", "원본 이미지가 없습니다.")
     
-    def display_image(self, img):
-        """이미지를 GUI에 표시"""
+    def display_image(self, img, detail_key=None):
+        """이미지를 GUI에 표시 (detail_key: 확대했을 때 원본 타일을 계산할 상태 키)"""
         if img is None:
             return
-        
-        # OpenCV는 BGR, PIL은 RGB를 사용하므로 변환
-        if len(img.shape) == 3:
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        self.viewer.set_image(img, self.get_render_scale(), detail_key)
+        self.refresh_view()
+        self.request_histogram(img, detail_key)
+    
+    def refresh_view(self):
+        """현재 확대 / 이동 상태로 보이는 영역만 다시 그림
+        (크기가 같으면 PhotoImage를 다시 만들지 않고 덮어씀)"""
+        img_pil = self.viewer.render()
+        photo = getattr(self.image_label, 'image', None)
+        if photo is not None and (photo.width(), photo.height()) == img_pil.size:
+            photo.paste(img_pil)
         else:
-            img_rgb = img
-        
-        # 화면 크기에 맞게 이미지 리사이즈
-        max_width = 1000
-        max_height = 650
-        
-        height, width = img_rgb.shape[:2]
-        scale = min(max_width/width, max_height/height, 1.0)
-        
-        new_width = int(width * scale)
-        new_height = int(height * scale)
-        
-        img_resized = cv2.resize(img_rgb, (new_width, new_height))
+            img_tk = ImageTk.PhotoImage('RGB', img_pil.size)
+            img_tk.paste(img_pil)
+            self.image_label.config(image=img_tk, text="", bg='#F5F6FA')
+            self.image_label.image = img_tk
+        self.request_detail()
+    
+    def request_histogram(self, image, detail_key=None):
+        """표시한 이미지의 히스토그램 갱신 (같은 상태면 캐시 사용, 계산은 모아서 백그라운드에서)"""
+        key = None if detail_key is None else (detail_key, self.get_render_scale())
+        result = self.histogram_cache.get(key) if key is not None else None
+        if key is not None and (key == self.histogram_key or result is not None):
+            # 이미 표시 중이거나 계산해 둔 상태면 대기 중인 계산은 버림
+            self.histogram_pending = None
+            self.histogram_worker.cancel()
+            if key != self.histogram_key:
+                self.show_histogram(key, result)
+            return
+        self.histogram_pending = (image, key)
+        if not self.histogram_scheduled:
+            self.histogram_scheduled = True
+            self.root.after(HISTOGRAM_INTERVAL_MS, self.update_histogram)
+    
+    def update_histogram(self):
+        """대기 중인 히스토그램 계산 시작 (렌더 중이면 미리보기가 늦어지지 않도록 미룸)"""
+        if self.histogram_pending is None:
+            self.histogram_scheduled = False
+            return
+        if self.render_worker.busy or self.detail_worker.busy:
+            self.root.after(HISTOGRAM_INTERVAL_MS, self.update_histogram)
+            return
+        self.histogram_scheduled = False
+        image, key = self.histogram_pending
+        self.histogram_pending = None
         
-        # PIL Image로 변환 후 Tkinter에 표시
-        img_pil = Image.fromarray(img_resized)
-        img_tk = ImageTk.PhotoImage(img_pil)
+        def job(is_cancelled):
+            return key, histogram.compute_histogram(image)
         
-        self.image_label.config(image=img_tk, text="", bg='#F5F6FA')
-        self.image_label.image = img_tk
+        self.histogram_worker.submit(job, self.on_histogram_computed)
+    
+    def on_histogram_computed(self, computed):
+        """히스토그램 계산 완료 (메인 스레드)"""
+        key, result = computed
+        if key is not None:
+            self.histogram_cache.put(key, result)
+        self.show_histogram(key, result)
+    
+    def show_histogram(self, key, result):
+        """히스토그램 패널 갱신"""
+        self.histogram_key = key
+        self.histogram_panel.show(result, histogram.describe_channel)
+    
+    def view_point(self, event):
+        """레이블 좌표 -> 뷰 좌표 (레이블 안에서 가운데 정렬된 만큼 보정)"""
+        x = event.x - (self.image_label.winfo_width() - self.viewer.width) / 2
+        y = event.y - (self.image_label.winfo_height() - self.viewer.height) / 2
+        return x, y
+    
+    def zoom_view(self, event, zoom_in):
+        """마우스 위치를 고정한 채로 확대 / 축소"""
+        if not self.engine_ready or self.viewer.image is None:
+            return
+        factor = image_viewer.ZOOM_STEP if zoom_in else 1 / image_viewer.ZOOM_STEP
+        self.viewer.zoom_at(factor, *self.view_point(event))
+        self.refresh_view()
+        self.status_bar.config(text=f"🔍 {self.viewer.zoom * 100:.0f}%")
+    
+    def toggle_zoom(self, event):
+        """전체 보기와 1:1(원본 화소) 보기 전환"""
+        if not self.engine_ready or self.viewer.image is None:
+            return
+        if self.viewer.fitted:
+            self.viewer.zoom_at(1.0 / self.viewer.zoom, *self.view_point(event))
+        else:
+            self.viewer.fit()
+        self.refresh_view()
+        self.status_bar.config(text=f"🔍 {self.viewer.zoom * 100:.0f}%")
+    
+    def start_pan(self, event):
+        """끌기 시작 위치 기억"""
+        self.drag_start = (event.x, event.y)
+    
+    def pan_view(self, event):
+        """끈 만큼 이동"""
+        if not self.engine_ready or self.viewer.image is None or self.drag_start is None:
+            return
+        dx, dy = event.x - self.drag_start[0], event.y - self.drag_start[1]
+        self.drag_start = (event.x, event.y)
+        self.viewer.pan(dx, dy)
+        self.refresh_view()
+    
+    def get_detail_key(self):
+        """원본 해상도 결과의 캐시 키 (레이어가 없으면 이미지 식별자)"""
+        steps = self.get_render_steps(1.0)
+        return steps[-1][3] if steps else (self.image_token,)
+    
+    def request_detail(self):
+        """프록시보다 확대했으면 보이는 영역과 겹치는 원본 해상도 타일만 백그라운드에서 계산"""
+        viewer = self.viewer
+        if viewer.detail_key is None or not viewer.needs_detail():
+            return
+        steps = self.get_render_steps(1.0)
+        source = self.original_image
+        halo = tiling.pipeline_halo(steps, source.dtype)
+        if halo is None:
+            # 전체 통계가 필요한 레이어가 있으면 프록시 결과를 확대해서 보여 줌
+            return
+        height, width = source.shape[:2]
+        tile_size = image_viewer.DETAIL_TILE_SIZE
+        rects = [rect for rect in tiling.tiles_in_rect(height, width, tile_size, viewer.visible_rect())
+                 if rect not in viewer.detail]
+        if not rects:
+            return
+        detail_key = viewer.detail_key
+        cache = self.layer_cache
+        
+        def job(is_cancelled):
+            tiles = {}
+            for rect in rects:
+                if is_cancelled():
+                    raise RenderCancelled()
+                key = detail_key + (('tile',) + rect,)
+                tile = cache.get(key)
+                if tile is None:
+                    # 후광까지 계산한 배열을 붙잡고 있지 않도록 가운데만 복사해 보관
+                    tile = tiling.render_tile(source, steps, rect, halo).copy()
+                    cache.put(key, tile)
+                tiles[rect] = tile
+            return detail_key, tiles
+        
+        self.detail_worker.submit(job, self.on_detail_rendered, self.on_render_error)
+    
+    def on_detail_rendered(self, rendered):
+        """원본 해상도 타일 계산 완료 (메인 스레드)"""
+        detail_key, tiles = rendered
+        self.viewer.add_detail(detail_key, tiles)
+        self.refresh_view()
     
     def check_image(self):
         """이미지가 로드되었는지 확인"""
@@ -1177,256 +1659,398 @@ class ImageProcessingGUI:
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("⚫ 그레이스케일", filters.apply_grayscale)
-    
-    def apply_gaussian_blur(self):
-        """가우시안 블러"""
-        if not self.check_image():
-            return
-        self.hide_all_trackbars()
-        self.add_layer("🌫️ 가우시안 블러", filters.apply_gaussian_blur)
+        self.add_layer("⚫ 그레이스케일", 'grayscale')
     
     def apply_sharpening(self):
         """샤프닝 효과"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("✨ 샤프닝", filters.apply_sharpening)
+        self.add_layer("✨ 샤프닝", 'sharpening')
     
     def apply_canny(self):
         """Canny 엣지 검출"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("🔍 Canny", filters.apply_canny)
+        self.add_layer("🔍 Canny", 'canny')
     
     def apply_sobel(self):
         """Sobel 엣지 검출"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("📐 Sobel", filters.apply_sobel)
+        self.add_layer("📐 Sobel", 'sobel')
     
     def apply_laplacian(self):
         """라플라시안 필터"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("🔲 Laplacian", filters.apply_laplacian)
+        self.add_layer("🔲 Laplacian", 'laplacian')
     
     def apply_erode(self):
         """침식 효과"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("⬇️ 침식", filters.apply_erode)
+        self.add_layer("⬇️ 침식", 'erode')
     
     def apply_dilate(self):
         """팽창 효과"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("⬆️ 팽창", filters.apply_dilate)
+        self.add_layer("⬆️ 팽창", 'dilate')
     
     def apply_threshold(self):
         """이진화"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("◼️ 이진화", filters.apply_threshold)
+        self.add_layer("◼️ 이진화", 'threshold')
     
     def apply_histogram_stretching(self):
         """히스토그램 스트레칭"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("📈 히스토그램 스트레칭", filters.apply_histogram_stretching)
+        self.add_layer("📈 히스토그램 스트레칭", 'histogram_stretching')
     
     def apply_histogram_eq(self):
         """히스토그램 평활화"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("📊 히스토그램 평활화", filters.apply_histogram_eq)
+        self.add_layer("📊 히스토그램 평활화", 'histogram_eq')
     
     def apply_sepia(self):
         """세피아 톤 효과"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("📷 세피아", filters.apply_sepia)
+        self.add_layer("📷 세피아", 'sepia')
     
     def apply_emboss(self):
         """엠보싱 효과"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("🎭 엠보싱", filters.apply_emboss)
+        self.add_layer("🎭 엠보싱", 'emboss')
     
     def apply_opening(self):
         """모폴로지 열림 (Opening) = 침식 후 팽창"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("⚙️ 열림", filters.apply_opening)
+        self.add_layer("⚙️ 열림", 'opening')
     
     def apply_closing(self):
         """모폴로지 닫힘 (Closing) = 팽창 후 침식"""
         if not self.check_image():
             return
         self.hide_all_trackbars()
-        self.add_layer("⚙️ 닫힘", filters.apply_closing)
+        self.add_layer("⚙️ 닫힘", 'closing')
     
     # 레이어 관리 메서드들
-    def add_layer(self, name, func, params=None):
+    def add_layer(self, name, op, params=None):
         """레이어 추가"""
-        if params is None:
-            params = {}
-        
-        layer = {
-            'name': name,
-            'enabled': True,
-            'func': func,
-            'params': params
-        }
-        self.layers.append(layer)
+        self.record_edit(('add', len(self.pipeline), pipeline.LayerSpec.create(op, params, name)))
         self.update_layer_display()
         self.apply_all_layers()
     
     def remove_layer(self, index):
         """레이어 삭제"""
-        if 0 <= index < len(self.layers):
-            self.layers.pop(index)
+        if 0 <= index < len(self.pipeline):
+            self.record_edit(('remove', index, self.pipeline.layers[index]))
             self.update_layer_display()
             self.apply_all_layers()
     
     def toggle_layer(self, index):
         """레이어 활성화/비활성화 토글"""
-        if 0 <= index < len(self.layers):
-            self.layers[index]['enabled'] = not self.layers[index]['enabled']
+        if 0 <= index < len(self.pipeline):
+            self.record_edit(('enable', index, not self.pipeline.layers[index].enabled))
             self.update_layer_display()
             self.apply_all_layers()
     
+    # 실행 취소 / 다시 실행
+    def get_state_key(self):
+        """현재 레이어 상태의 최종 결과 캐시 키 (활성 레이어가 없으면 None)"""
+        steps = self.get_render_steps(self.get_render_scale())
+        return steps[-1][3] if steps else None
+    
+    def snapshot_current_state(self):
+        """떠나는 상태의 결과를 압축 스냅샷으로 보관 (백그라운드에서 압축)"""
+        key = self.get_state_key()
+        if key is not None and self.preview_base is not None:
+            self.snapshots.put_async(key, self.preview_base)
+    
+    def record_edit(self, delta):
+        """레이어 편집을 기록한 뒤 파이프라인에 적용"""
+        self.snapshot_current_state()
+        self.history.record(delta)
+        history.apply_delta(self.pipeline, delta)
+    
+    def undo(self):
+        """마지막 레이어 편집 되돌리기"""
+        if self.original_image is None or not self.history.can_undo:
+            return
+        self.snapshot_current_state()
+        delta = self.history.undo(self.pipeline)
+        self.restore_state(f"↶ 실행 취소: {history.describe_delta(delta)}")
+    
+    def redo(self):
+        """되돌린 레이어 편집 다시 적용"""
+        if self.original_image is None or not self.history.can_redo:
+            return
+        self.snapshot_current_state()
+        delta = self.history.redo(self.pipeline)
+        self.restore_state(f"↷ 다시 실행: {history.describe_delta(delta)}")
+    
+    def restore_state(self, message):
+        """되돌아간 상태의 결과를 캐시 / 스냅샷에서 바로 표시 (없으면 다시 계산)"""
+        self.preview_base = None
+        self.preview_layer = None
+        self.update_layer_display()
+        key = self.get_state_key()
+        result, exact = None, False
+        if key is None:
+            result, exact = self.get_source_image(), True
+        else:
+            cached = self.layer_cache.get(key)
+            if cached is not None:
+                result, exact = layouts.expand_to_bgr(cached), True
+            else:
+                snapshot = self.snapshots.get(key)
+                if snapshot is not None:
+                    result, exact = snapshot
+                    if exact:
+                        self.layer_cache.put(key, result)
+        if exact:
+            self.render_worker.cancel()
+            self.current_image = result
+            self.preview_base = result
+            self.display_image(result, self.get_detail_key())
+        else:
+            # 축소 스냅샷이 있으면 먼저 보여 주고 원래 해상도는 다시 계산
+            if result is not None:
+                self.display_image(result)
+            self.apply_all_layers()
+        self.status_bar.config(text=message)
+    
+    def get_source_image(self):
+        """레이어 계산의 시작 이미지 (프록시 모드면 축소 이미지)"""
+        if self.proxy_enabled and self.proxy_image is not None:
+            return self.proxy_image
+        return self.original_image
+    
+    def get_render_scale(self):
+        """현재 계산 해상도의 원본 대비 비율"""
+        if self.proxy_enabled and self.proxy_image is not None:
+            return self.proxy_scale
+        return 1.0
+    
+    def get_render_steps(self, scale=1.0):
+        """활성 레이어별 (이름, 함수, 파라미터, 캐시 키) 목록"""
+        return self.pipeline.steps(scale, root=(self.image_token,))
+    
     def apply_all_layers(self):
-        """모든 활성화된 레이어 적용"""
+        """모든 활성화된 레이어 적용 (렌더는 작업자 스레드에서 실행)"""
+        self.preview_base = None
+        self.preview_layer = None
+        if self.video_stream is not None:
+            # 스트리밍 중에는 다음 프레임부터 바뀐 레이어가 적용됨
+            self.video_stream.set_steps(self.get_render_steps(1.0))
+            return
         if self.original_image is None:
             return
         
-        # 원본 이미지에서 시작
-        result = self.original_image.copy()
-        
-        # 활성화된 레이어들을 순서대로 적용
-        for layer in self.layers:
-            if layer['enabled']:
-                try:
-                    if layer['params']:
-                        result = layer['func'](result, **layer['params'])
-                    else:
-                        result = layer['func'](result)
-                except Exception as e:
-                    self.status_bar.config(text=f"⚠️ 레이어 적용 오류: {layer['name']}")
-                    return
+        # 작업자 스레드에서 Tk 상태를 읽지 않도록 필요한 값은 미리 복사
+        source = self.get_source_image()
+        steps = self.get_render_steps(self.get_render_scale())
+        cache = self.layer_cache
+        hooks = (self.layer_profiler,)
         
-        self.current_image = result
-        self.display_image(self.current_image)
+        def job(is_cancelled):
+            start = time.perf_counter()
+            result = pipeline.run_layers(source, steps, cache, is_cancelled, hooks=hooks)
+            return result, time.perf_counter() - start
         
-        enabled_count = sum(1 for layer in self.layers if layer['enabled'])
+        self.render_worker.submit(job, self.on_layers_rendered, self.on_render_error)
+        
+        enabled_count = len(steps)
         self.status_bar.config(text=f"✅ {enabled_count}개 레이어 적용됨")
     
+    def request_preview(self, func, params):
+        """확정된 레이어 스택 결과 위에 트랙바 변환 하나만 적용해 미리보기"""
+        self.preview_layer = (func, params)
+        if self.video_stream is not None:
+            self.video_stream.set_steps(self.get_render_steps(1.0) + [("미리보기", func, params, None)])
+            return
+        
+        base = self.preview_base
+        source = self.get_source_image()
+        scale = self.get_render_scale()
+        steps = self.get_render_steps(scale) if base is None else None
+        scaled = proxy.scale_layer_params(func, params, scale)
+        cache = self.layer_cache
+        hooks = (self.layer_profiler,)
+        
+        def job(is_cancelled):
+            stack = base
+            if stack is None:
+                stack = pipeline.run_layers(source, steps, cache, is_cancelled, hooks=hooks)
+            if is_cancelled():
+                raise RenderCancelled()
+            return stack, func(stack, **scaled)
+        
+        self.render_worker.submit(job, self.on_preview_rendered, self.on_render_error)
+    
+    def on_layers_rendered(self, rendered):
+        """레이어 스택 렌더 완료 (메인 스레드)"""
+        result, elapsed = rendered
+        self.current_image = result
+        self.preview_base = result
+        self.display_image(self.current_image, self.get_detail_key())
+        enabled_count = len(self.pipeline.enabled_layers)
+        self.status_bar.config(text=f"✅ {enabled_count}개 레이어 적용됨 · {elapsed * 1000:.1f}ms")
+        self.update_layer_costs()
+    
+    def on_preview_rendered(self, results):
+        """트랙바 미리보기 렌더 완료 (메인 스레드)"""
+        stack, preview = results
+        self.preview_base = stack
+        self.current_image = preview
+        self.display_image(self.current_image)
+    
+    # 동영상 / 카메라 스트리밍
+    def toggle_video_stream(self):
+        """스트리밍 시작 (카메라 또는 동영상 파일) / 중지"""
+        self.init_engine()
+        if self.video_stream is not None:
+            self.stop_video_stream()
+            return
+        use_camera = messagebox.askyesnocancel("🎥 영상 스트리밍",
+                                               "카메라를 사용할까요?\n(아니요: 동영상 파일 선택)")
+        if use_camera is None:
+            return
+        if use_camera:
+            source = 0
+        else:
+            source = filedialog.askopenfilename(
+                title="동영상 선택",
+                filetypes=[("Video files", "*.mp4 *.avi *.mov *.mkv"), ("All files", "*.*")]
+            )
+            if not source:
+                return
+        output_path = None
+        if messagebox.askyesno("⏺ 녹화", "처리된 영상을 파일로 저장할까요?"):
+            output_path = filedialog.asksaveasfilename(
+                defaultextension=".avi",
+                filetypes=[(ext[1:].upper(), f"*{ext}") for ext in streaming.VIDEO_CODECS]
+            ) or None
+        self.start_video_stream(source, output_path)
+    
+    def start_video_stream(self, source, output_path=None):
+        """프레임을 작업자 스레드에서 레이어 스택에 통과시키며 표시"""
+        # 파일을 녹화할 때는 프레임을 버리지 않고 모두 처리
+        drop_frames = isinstance(source, int) or output_path is None
+        stream = streaming.VideoStream(source, self.get_render_steps(1.0), output_path,
+                             drop_frames=drop_frames)
+        try:
+            stream.start()
+        except ValueError as e:
+            messagebox.showerror("❌ 오류", str(e))
+            return
+        self.render_worker.cancel()
+        self.preview_base = None
+        self.video_stream = stream
+        self.status_bar.config(text="🎥 스트리밍 시작")
+        self.root.after(STREAM_POLL_MS, self.poll_video_stream)
+    
+    def poll_video_stream(self):
+        """처리된 최신 프레임 표시 (메인 스레드)"""
+        stream = self.video_stream
+        if stream is None:
+            return
+        item = stream.poll()
+        if item is not None:
+            frame, result, captured_at = item
+            start = time.perf_counter()
+            self.stream_frame = frame
+            self.current_image = result
+            self.viewer.set_image(result)
+            self.refresh_view()
+            stream.record_display(captured_at, time.perf_counter() - start)
+            text = f"🎥 {stream.describe()}"
+            if stream.error is not None:
+                text += f" · ⚠️ {stream.error}"
+            self.status_bar.config(text=text)
+        elif not stream.running:
+            # 동영상 파일이 끝남
+            self.stop_video_stream()
+            return
+        self.root.after(STREAM_POLL_MS, self.poll_video_stream)
+    
+    def stop_video_stream(self):
+        """스트리밍 중지 후 마지막 프레임을 정지 이미지로 편집"""
+        stream = self.video_stream
+        self.video_stream = None
+        stream.stop()
+        if self.stream_frame is not None:
+            self.original_image = self.stream_frame
+            self.proxy_image, self.proxy_scale = proxy.make_proxy(self.original_image)
+            self.current_image = self.get_source_image()
+            self.image_token += 1
+            self.stream_frame = None
+            self.apply_all_layers()
+        self.status_bar.config(text=f"⏹ 스트리밍 중지 · 프레임 {stream.frames_processed}개 처리")
+    
+    def on_render_error(self, error):
+        """렌더 오류 표시 (메인 스레드)"""
+        if isinstance(error, LayerError):
+            self.status_bar.config(text=f"⚠️ 레이어 적용 오류: {error.layer_name}")
+        else:
+            self.status_bar.config(text=f"⚠️ 렌더 오류: {error}")
+    
     def clear_all_layers(self):
-        """모든 레이어 삭제"""
-        self.layers.clear()
+        """모든 레이어 삭제 (실행 취소로 되돌릴 수 있음)"""
+        self.init_engine()
+        if self.pipeline.layers:
+            self.record_edit(('replace', tuple(self.pipeline.layers), ()))
+        self.preview_base = None
+        self.preview_layer = None
+        self.render_worker.cancel()
         self.update_layer_display()
         if self.original_image is not None:
-            self.current_image = self.original_image.copy()
-            self.display_image(self.current_image)
+            self.current_image = self.get_source_image()
+            self.display_image(self.current_image, self.get_detail_key())
             self.status_bar.config(text="🗑️ 모든 레이어 삭제됨")
     
-    def update_layer_display(self):
-        """레이어 UI 업데이트"""
-        # 기존 레이어 위젯들 제거
-        for widget in self.layer_scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.layers:
-            # 레이어가 없을 때 메시지 표시
-            self.layer_empty_label = tk.Label(self.layer_scrollable_frame, 
-                                              text="레이어가 없습니다\n\n필터를 적용하면\n여기에 표시됩니다",
-                                              bg=self.colors['sidebar'],
-                                              fg='#95A5A6',
-                                              font=('Segoe UI', 10),
-                                              justify=tk.CENTER)
-            self.layer_empty_label.pack(pady=30)
-            return
-        
-        # 각 레이어를 순서대로 표시 (최신 레이어가 아래에)
-        for i in range(len(self.layers)):
-            layer = self.layers[i]
-            self.create_layer_item(i, layer)
+    def get_layer_costs(self):
+        """레이어 인덱스별 실행 시간 문자열 (비활성 레이어는 빈 문자열)"""
+        steps = self.get_render_steps(self.get_render_scale())
+        keys = iter(step[3] for step in steps)
+        costs = []
+        for layer in self.pipeline.layers:
+            key = next(keys, None) if layer.enabled else None
+            costs.append(self.layer_profiler.describe(key) if key is not None else "")
+        return costs
     
-    def create_layer_item(self, index, layer):
-        """레이어 아이템 UI 생성"""
-        # 고정 높이를 가진 레이어 프레임
-        layer_frame = tk.Frame(self.layer_scrollable_frame, 
-                              bg=self.colors['btn_bg'],
-                              relief=tk.FLAT,
-                              bd=1)
-        layer_frame.pack(fill=tk.X, pady=5, padx=5)
-        
-        # 체크박스 (활성화/비활성화)
-        var = tk.BooleanVar(value=layer['enabled'])
-        
-        # 체크박스 상태 변경 핸들러
-        def on_checkbox_change(*args):
-            enabled = var.get()
-            # 레이어 상태 업데이트
-            if 0 <= index < len(self.layers):
-                self.layers[index]['enabled'] = enabled
-                # 레이블 스타일 업데이트
-                name_label.config(
-                    fg=self.colors['text_dark'] if enabled else self.colors['text_gray'],
-                    font=('Segoe UI', 9, 'bold' if enabled else 'normal')
-                )
-                # 모든 레이어 다시 적용
-                self.apply_all_layers()
-        
-        # 텍스트가 길면 말줄임표 처리
-        def truncate_text(text, max_chars=18):
-            """텍스트가 너무 길면 말줄임표로 처리"""
-            if len(text) > max_chars:
-                return text[:max_chars-3] + '...'
-            return text
-        
-        display_name = truncate_text(layer['name'], 18)
-        
-        # 체크박스 생성 (command 사용)
-        checkbox = tk.Checkbutton(layer_frame,
-                                 variable=var,
-                                 bg=self.colors['btn_bg'],
-                                 activebackground=self.colors['btn_bg'],
-                                 command=on_checkbox_change)
-        checkbox.pack(side=tk.LEFT, padx=8, pady=10)
-        
-        # 레이어 이름 (고정 너비로 텍스트 오버플로우 처리)
-        name_label = tk.Label(layer_frame,
-                             text=display_name,
-                             bg=self.colors['btn_bg'],
-                             fg=self.colors['text_dark'] if layer['enabled'] else self.colors['text_gray'],
-                             font=('Segoe UI', 9, 'bold' if layer['enabled'] else 'normal'),
-                             anchor='w',
-                             width=18)  # 고정 너비 (문자 단위)
-        name_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5), pady=10)
-        
-        # 삭제 버튼
-        delete_btn = tk.Button(layer_frame,
-                              text="✕",
-                              command=lambda idx=index: self.remove_layer(idx),
-                              bg=self.colors['danger'],
-                              fg='white',
-                              font=('Segoe UI', 8),
-                              relief=tk.FLAT,
-                              width=2,
-                              height=1,
-                              cursor='hand2',
-                              activebackground=self.colors['danger_hover'])
-        delete_btn.pack(side=tk.RIGHT, padx=5, pady=10)
+    def update_layer_costs(self):
+        """레이어 목록의 실행 시간 표시 갱신"""
+        self.layer_list.set_costs(self.get_layer_costs())
+    
+    def export_layer_stats(self):
+        """레이어별 성능 기록을 CSV / JSON으로 저장"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")]
+        )
+        if file_path:
+            self.layer_profiler.export(file_path)
+            self.status_bar.config(text="📊 성능 기록 저장 완료")
+    
+    def update_layer_display(self):
+        """레이어 UI 업데이트 (최신 레이어가 아래에)"""
+        self.layer_list.update(self.pipeline.layers, self.get_layer_costs())
@@ -0,0 +1,58 @@
+"""히스토그램 패널"""
+import tkinter as tk
+
+
+# 채널별 선 색
+CHANNEL_COLORS = {'L': '#607D8B', 'B': '#5B9FED', 'G': '#78C2AD', 'R': '#EC8D8D', 'A': '#B0BEC5'}
+
+
+class HistogramPanel(tk.Frame):
+    """채널별 히스토그램 곡선과 통계 표시
+
+    곡선 / 글자 항목은 처음 한 번만 만들고 이후에는 좌표와 글자만 바꾼다.
+    """
+
+    def __init__(self, parent, colors, width=270, height=90):
+        super().__init__(parent, bg=colors['sidebar'])
+        self.colors = colors
+        self.width = width
+        self.height = height
+        self.canvas = tk.Canvas(self, width=width, height=height, bg=colors['btn_bg'],
+                                highlightthickness=0)
+        self.canvas.pack(fill=tk.X)
+        self.stats_label = tk.Label(self, text="이미지를 불러오면 표시됩니다",
+                                    bg=colors['sidebar'], fg=colors['text_gray'],
+                                    font=('Segoe UI', 8), justify=tk.LEFT, anchor='w')
+        self.stats_label.pack(fill=tk.X, pady=(4, 0))
+        self._lines = {}
+
+    def show(self, results, describe):
+        """compute_histogram 결과 표시 (describe: 채널 통계 -> 한 줄 문자열)"""
+        # 범위 양 끝의 포화 막대가 곡선을 납작하게 만들지 않도록 안쪽 구간으로 높이를 맞춤
+        peak = max((float(stats['hist'][1:-1].max()) for stats in results), default=0.0)
+        peak = peak or max((float(stats['hist'].max()) for stats in results), default=0.0) or 1.0
+        names = [stats['name'] for stats in results]
+        for name in list(self._lines):
+            if name not in names:
+                self.canvas.delete(self._lines.pop(name))
+        for stats in results:
+            hist = stats['hist']
+            step = self.width / max(1, len(hist) - 1)
+            coords = []
+            for i, value in enumerate(hist):
+                coords.append(i * step)
+                coords.append(self.height - min(1.0, value / peak) * (self.height - 2))
+            line = self._lines.get(stats['name'])
+            if line is None:
+                self._lines[stats['name']] = self.canvas.create_line(
+                    *coords, fill=CHANNEL_COLORS.get(stats['name'], self.colors['text_gray']))
+            else:
+                self.canvas.coords(line, *coords)
+        self.stats_label.config(text="\n".join(describe(stats) for stats in results))
+
+    def clear(self):
+        """곡선과 통계 지우기"""
+        for line in self._lines.values():
+            self.canvas.delete(line)
+        self._lines = {}
+        self.stats_label.config(text="")
@@ -0,0 +1,182 @@
+"""레이어 목록 패널
+
+레이어를 추가 / 삭제 / 토글할 때마다 모든 행을 지우고 다시 만들면 레이어 수에
+비례하는 위젯을 매번 새로 만들게 된다. 표시 중인 LayerSpec 목록과 새 목록을 앞뒤에서
+비교해 달라진 구간의 행만 다시 설정하고, 행이 모자라면 그 자리에 끼워 넣고 남으면
+떼어 낸다. 떼어 낸 행은 버리지 않고 보관했다가 다음에 추가되는 레이어에 다시 쓴다.
+
+편집은 한 번에 레이어 하나만 바꾸므로 위젯 작업은 목록 길이와 무관하다. 비교 자체는
+목록 길이만큼 걸리지만 불변 LayerSpec끼리의 비교라 위젯 작업에 비하면 무시할 만하다.
+실행 시간 표시도 글자가 바뀐 행만 갱신한다.
+"""
+import tkinter as tk
+
+
+# 떼어 낸 행을 다시 쓰려고 보관하는 최대 개수
+MAX_SPARE_ROWS = 20
+
+
+def truncate_text(text, max_chars=18):
+    """텍스트가 너무 길면 말줄임표로 처리"""
+    if len(text) > max_chars:
+        return text[:max_chars-3] + '...'
+    return text
+
+
+def changed_range(old, new):
+    """앞뒤의 같은 항목을 뺀 달라진 구간 (시작, old 끝, new 끝)"""
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
+
+
+class LayerRow(tk.Frame):
+    """레이어 한 줄 (체크박스, 이름, 실행 시간, 삭제 버튼)"""
+
+    def __init__(self, parent, colors, on_toggle, on_remove):
+        super().__init__(parent, bg=colors['btn_bg'], relief=tk.FLAT, bd=1)
+        self.colors = colors
+        self.layer = None
+        self.cost_text = ""
+        self.var = tk.BooleanVar(value=True)
+
+        # 체크박스 (활성화/비활성화)
+        checkbox = tk.Checkbutton(self,
+                                  variable=self.var,
+                                  bg=colors['btn_bg'],
+                                  activebackground=colors['btn_bg'],
+                                  command=lambda: on_toggle(self))
+        checkbox.pack(side=tk.LEFT, padx=8, pady=10)
+
+        # 레이어 이름과 실행 시간
+        text_frame = tk.Frame(self, bg=colors['btn_bg'])
+        text_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5), pady=6)
+
+        # 레이어 이름 (고정 너비로 텍스트 오버플로우 처리)
+        self.name_label = tk.Label(text_frame,
+                                   bg=colors['btn_bg'],
+                                   anchor='w',
+                                   width=18)  # 고정 너비 (문자 단위)
+        self.name_label.pack(fill=tk.X)
+
+        # 마지막 / 평균 실행 시간 (합쳐서 실행된 레이어는 마지막 레이어에만 표시)
+        self.cost_label = tk.Label(text_frame,
+                                   bg=colors['btn_bg'],
+                                   fg=colors['text_gray'],
+                                   font=('Segoe UI', 7),
+                                   anchor='w')
+        self.cost_label.pack(fill=tk.X)
+
+        # 삭제 버튼
+        delete_btn = tk.Button(self,
+                               text="✕",
+                               command=lambda: on_remove(self),
+                               bg=colors['danger'],
+                               fg='white',
+                               font=('Segoe UI', 8),
+                               relief=tk.FLAT,
+                               width=2,
+                               height=1,
+                               cursor='hand2',
+                               activebackground=colors['danger_hover'])
+        delete_btn.pack(side=tk.RIGHT, padx=5, pady=10)
+
+    def set_layer(self, layer):
+        """표시할 레이어 (같은 레이어면 아무것도 하지 않음)"""
+        if layer == self.layer:
+            return
+        self.layer = layer
+        self.var.set(layer.enabled)
+        self.name_label.config(
+            text=truncate_text(layer.name, 18),
+            fg=self.colors['text_dark'] if layer.enabled else self.colors['text_gray'],
+            font=('Segoe UI', 9, 'bold' if layer.enabled else 'normal')
+        )
+
+    def set_cost(self, text):
+        """실행 시간 표시 (바뀐 경우만 갱신)"""
+        if text != self.cost_text:
+            self.cost_text = text
+            self.cost_label.config(text=text)
+
+
+class LayerList:
+    """LayerRow 목록을 LayerSpec 목록에 맞춰 필요한 행만 고치는 패널
+
+    on_toggle(인덱스) / on_remove(인덱스)는 행을 누른 시점의 위치로 호출된다.
+    """
+
+    def __init__(self, parent, colors, on_toggle, on_remove, empty_label=None):
+        self.parent = parent
+        self.colors = colors
+        self.on_toggle = on_toggle
+        self.on_remove = on_remove
+        self.empty_label = empty_label
+        self.rows = []
+        self.spare = []
+
+    def update(self, layers, costs=None):
+        """레이어 목록 반영 (costs: 인덱스별 실행 시간 문자열)"""
+        layers = list(layers)
+        start, old_end, new_end = changed_range([row.layer for row in self.rows], layers)
+
+        # 겹치는 구간은 기존 행을 다시 설정
+        shared = min(old_end, new_end)
+        for index in range(start, shared):
+            self.rows[index].set_layer(layers[index])
+
+        # 남는 행은 떼어 내고, 모자라면 그 자리에 끼워 넣음
+        if old_end > new_end:
+            for row in self.rows[shared:old_end]:
+                self._release(row)
+            del self.rows[shared:old_end]
+        for index in range(shared, new_end):
+            row = self._take()
+            row.set_layer(layers[index])
+            if index < len(self.rows):
+                row.pack(fill=tk.X, pady=5, padx=5, before=self.rows[index])
+            else:
+                row.pack(fill=tk.X, pady=5, padx=5)
+            self.rows.insert(index, row)
+
+        if self.empty_label is not None:
+            if layers:
+                self.empty_label.pack_forget()
+            else:
+                self.empty_label.pack(pady=30)
+        if costs is not None:
+            self.set_costs(costs)
+
+    def set_costs(self, costs):
+        """인덱스별 실행 시간 문자열 표시"""
+        for row, text in zip(self.rows, costs):
+            row.set_cost(text)
+
+    def _take(self):
+        """보관한 행을 꺼내거나 새로 만듦"""
+        if self.spare:
+            return self.spare.pop()
+        return LayerRow(self.parent, self.colors, self._toggled, self._removed)
+
+    def _release(self, row):
+        """행을 떼어 내 보관 (보관 한도를 넘으면 삭제)"""
+        row.pack_forget()
+        if len(self.spare) < MAX_SPARE_ROWS:
+            row.layer = None
+            self.spare.append(row)
+        else:
+            row.destroy()
+
+    def _toggled(self, row):
+        if row in self.rows:
+            self.on_toggle(self.rows.index(row))
+
+    def _removed(self, row):
+        if row in self.rows:
+            self.on_remove(self.rows.index(row))
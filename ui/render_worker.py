@@ -0,0 +1,105 @@
+"""백그라운드 렌더 작업자"""
+import queue
+import threading
+import traceback
+
+from image_processing.errors import RenderCancelled
+
+
+class RenderWorker:
+    """최신 요청 하나만 유지하며 별도 스레드에서 렌더를 실행
+
+    새 요청이 들어오면 아직 시작하지 않은 요청은 버리고, 실행 중인 렌더에는
+    취소를 알린다. 결과는 root.after 폴링을 통해 Tk 메인 스레드에서 전달된다.
+    """
+
+    POLL_INTERVAL_MS = 15
+
+    def __init__(self, root):
+        self.root = root
+        self._condition = threading.Condition()
+        self._pending = None
+        self._generation = 0
+        self._running = None
+        self._busy = False
+        self._polling = False
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="render-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, job, on_done, on_error=None):
+        """렌더 요청 (job(is_cancelled)는 작업자 스레드에서 실행)"""
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, job, on_done, on_error)
+            self._condition.notify()
+        self._schedule_poll()
+
+    def post(self, callback, value):
+        """실행 중인 작업이 중간 결과를 메인 스레드로 전달 (작업자 스레드에서 호출,
+        그 사이 새 요청이나 취소가 있었으면 버려짐)"""
+        self._results.put((self._running, callback, value))
+
+    def cancel(self):
+        """대기 중인 요청을 버리고 실행 중인 렌더 취소"""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+
+    @property
+    def busy(self):
+        """렌더가 실행 중이거나 대기 중인지 여부"""
+        with self._condition:
+            return self._busy or self._pending is not None
+
+    def _run(self):
+        """작업자 스레드 루프"""
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                generation, job, on_done, on_error = self._pending
+                self._pending = None
+                self._busy = True
+                self._running = generation
+
+            def is_cancelled(generation=generation):
+                return generation != self._generation
+
+            try:
+                result = job(is_cancelled)
+            except RenderCancelled:
+                pass
+            except Exception as e:
+                self._results.put((generation, on_error, e))
+            else:
+                self._results.put((generation, on_done, result))
+            finally:
+                with self._condition:
+                    self._busy = False
+
+    def _schedule_poll(self):
+        """결과 폴링 시작 (이미 폴링 중이면 무시)"""
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        """메인 스레드에서 완료된 결과 전달"""
+        while True:
+            try:
+                generation, callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # 더 새로운 요청이 있으면 오래된 결과는 버림
+            if generation == self._generation and callback is not None:
+                try:
+                    callback(value)
+                except Exception:
+                    # 콜백 하나가 실패해도 폴링이 멈추면 이후 결과가 전달되지 않으므로 기록만 하고 계속
+                    traceback.print_exc()
+
+        if self.busy or not self._results.empty():
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+        else:
+            self._polling = False
@@ -0,0 +1,222 @@
+"""확대 / 이동 이미지 뷰
+
+뷰는 원본 해상도 좌표로 확대 배율(화면 화소 / 원본 화소)과 화면 중심을 기억한다.
+표시할 결과 이미지는 프록시 해상도일 수 있으므로 결과 이미지와 함께 계산 배율을
+받아 원본 좌표로 맞춘다.
+
+결과 이미지의 해상도 피라미드(1/2, 1/4, ...)는 필요한 단계만 처음 쓸 때 만든다.
+화면에 그릴 때는 배율보다 해상도가 같거나 높은 가장 작은 단계를 골라 보이는 영역만
+잘라 화면 크기로 바꾸므로, 변환과 blit 비용은 이미지 크기가 아니라 화면 크기에
+비례한다. 축소 비율은 항상 2배 미만이라 선형 보간으로 충분하고, 확대할 때는 화소
+경계가 보이도록 최근접 보간을 쓴다.
+
+프록시 결과보다 더 확대하면 화면에 필요한 만큼의 세부가 프록시에 없다. 이때는
+보이는 영역과 겹치는 원본 해상도 타일(detail)만 따로 계산해 받아 프록시 위에
+덮어 그린다.
+"""
+import cv2
+import numpy as np
+from PIL import Image
+
+from .display import DISPLAY_MAX_HEIGHT, DISPLAY_MAX_WIDTH, shrink_for_display
+
+
+MAX_ZOOM = 32.0
+ZOOM_STEP = 1.25
+# 확대했을 때 따로 계산하는 원본 해상도 타일 크기
+DETAIL_TILE_SIZE = 512
+
+
+class ImageViewer:
+    """해상도 피라미드를 쓰는 확대 / 이동 뷰 (Tk와 무관한 계산만 담당)"""
+
+    def __init__(self, width=DISPLAY_MAX_WIDTH, height=DISPLAY_MAX_HEIGHT,
+                 background=(0xF5, 0xF6, 0xFA)):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.image = None
+        self.scale = 1.0
+        self.full_width = 0
+        self.full_height = 0
+        self.zoom = 1.0
+        self.center = (0.0, 0.0)
+        self.fitted = True
+        self.detail_key = None
+        self.detail = {}
+        self._levels = {}
+        self._blanks = {}
+
+    # 상태 설정
+    def set_image(self, image, scale=1.0, detail_key=None):
+        """표시할 결과 이미지 (scale: 원본 대비 계산 배율, detail_key: 세부 타일을 받을 상태 키)"""
+        full_width = image.shape[1] / scale
+        full_height = image.shape[0] / scale
+        same_size = (round(full_width), round(full_height)) == (round(self.full_width), round(self.full_height))
+        self.image = image
+        self.scale = scale
+        self.full_width = full_width
+        self.full_height = full_height
+        self._levels = {0: image}
+        if detail_key is None or detail_key != self.detail_key:
+            self.detail = {}
+        self.detail_key = detail_key
+        if self.fitted or not same_size:
+            self.fit()
+
+    def fit_zoom(self):
+        """화면에 전체가 들어가는 배율 (확대는 하지 않음)"""
+        return min(self.width / self.full_width, self.height / self.full_height, 1.0)
+
+    def fit(self):
+        """전체 보기"""
+        self.zoom = self.fit_zoom()
+        self.center = (self.full_width / 2, self.full_height / 2)
+        self.fitted = True
+
+    def zoom_at(self, factor, x=None, y=None):
+        """화면 좌표 (x, y)를 고정한 채로 배율을 factor배 (기본은 화면 중앙)"""
+        if self.image is None:
+            return
+        if x is None:
+            x, y = self.width / 2, self.height / 2
+        zoom = min(max(self.zoom * factor, self.fit_zoom()), MAX_ZOOM)
+        # 고정할 점의 원본 좌표는 배율이 바뀌어도 같은 화면 위치에 있어야 함
+        px, py = self.to_image(x, y)
+        self.zoom = zoom
+        self.center = (px - (x - self.width / 2) / zoom, py - (y - self.height / 2) / zoom)
+        self.fitted = zoom == self.fit_zoom()
+        self._clamp()
+
+    def pan(self, dx, dy):
+        """화면 화소 단위로 이동"""
+        if self.image is None:
+            return
+        cx, cy = self.center
+        self.center = (cx - dx / self.zoom, cy - dy / self.zoom)
+        self.fitted = False
+        self._clamp()
+
+    def _clamp(self):
+        """이미지가 화면보다 크면 화면 밖으로 벗어나지 않게, 작으면 가운데에"""
+        half_w = self.width / 2 / self.zoom
+        half_h = self.height / 2 / self.zoom
+        cx, cy = self.center
+        cx = min(max(cx, half_w), self.full_width - half_w) if self.full_width > half_w * 2 else self.full_width / 2
+        cy = min(max(cy, half_h), self.full_height - half_h) if self.full_height > half_h * 2 else self.full_height / 2
+        self.center = (cx, cy)
+
+    # 좌표
+    def to_image(self, x, y):
+        """화면 좌표 -> 원본 좌표"""
+        cx, cy = self.center
+        return cx + (x - self.width / 2) / self.zoom, cy + (y - self.height / 2) / self.zoom
+
+    def visible_rect(self):
+        """보이는 영역의 원본 좌표 (y0, y1, x0, x1) (이미지 밖은 잘라냄)"""
+        x0, y0 = self.to_image(0, 0)
+        x1, y1 = self.to_image(self.width, self.height)
+        return (max(0, int(np.floor(y0))), min(round(self.full_height), int(np.ceil(y1))),
+                max(0, int(np.floor(x0))), min(round(self.full_width), int(np.ceil(x1))))
+
+    def needs_detail(self):
+        """결과 이미지보다 화면이 더 세밀한지 (프록시보다 확대한 상태)"""
+        return self.image is not None and self.zoom > self.scale
+
+    def add_detail(self, detail_key, tiles):
+        """원본 해상도 타일 추가 ({(y0, y1, x0, x1): 타일}, 다른 상태의 타일은 무시)"""
+        if detail_key == self.detail_key:
+            self.detail.update(tiles)
+
+    # 피라미드
+    def level(self, index):
+        """결과 이미지의 1 / 2**index 해상도 단계 (처음 쓸 때 바로 아래의 만들어 둔 단계에서 줄임)"""
+        if index not in self._levels:
+            height, width = self.image.shape[:2]
+            size = (max(1, width >> index), max(1, height >> index))
+            source = self._levels[max(k for k in self._levels if k < index)]
+            self._levels[index] = shrink_for_display(source, size).copy()
+        return self._levels[index]
+
+    def choose_level(self):
+        """배율보다 해상도가 같거나 높은 가장 작은 단계 번호"""
+        relative = self.zoom / self.scale
+        index = 0
+        while relative * 2 ** (index + 1) <= 1.0:
+            index += 1
+        return index
+
+    # 그리기
+    def _transform(self, level_scale, x0=0, y0=0):
+        """(x0, y0)에서 시작하는 level_scale 해상도 영역 -> 화면 좌표 (배율, x 이동, y 이동)"""
+        factor = self.zoom / level_scale
+        cx, cy = self.center
+        tx = self.width / 2 + (x0 / level_scale - cx) * self.zoom
+        ty = self.height / 2 + (y0 / level_scale - cy) * self.zoom
+        return factor, tx, ty
+
+    def render(self):
+        """보이는 영역만 화면 크기로 그려 PIL 이미지로 반환 (RGB)"""
+        index = self.choose_level()
+        level = self.level(index)
+        level_scale = self.scale * level.shape[1] / self.image.shape[1]
+        view = self._blank(level.ndim, level.dtype).copy()
+        _warp_into(level, *self._transform(level_scale), view)
+        if self.detail and self.needs_detail():
+            view = self._draw_detail(view)
+        if view.ndim == 2:
+            view = cv2.cvtColor(view, cv2.COLOR_GRAY2RGB)
+        else:
+            view = cv2.cvtColor(view, cv2.COLOR_BGR2RGB)
+        return Image.fromarray(view)
+
+    def _blank(self, ndim, dtype):
+        """배경색으로 채운 화면 크기 배열 (채널 수 / 크기가 바뀔 때만 새로 만듦)"""
+        shape = (self.height, self.width, 3) if ndim == 3 else (self.height, self.width)
+        blank = self._blanks.get(ndim)
+        if blank is None or blank.shape != shape or blank.dtype != dtype:
+            color = self.background if ndim == 3 else int(np.mean(self.background))
+            blank = np.empty(shape, dtype)
+            # 채널이 있는 배열에 튜플을 numpy로 채우면 느리므로 OpenCV로 채움
+            cv2.rectangle(blank, (0, 0), (self.width, self.height), color, -1)
+            self._blanks[ndim] = blank
+        return blank
+
+    def _draw_detail(self, view):
+        """보이는 원본 해상도 타일을 화면 위에 덮어 그림"""
+        y0, y1, x0, x1 = self.visible_rect()
+        for (ty0, ty1, tx0, tx1), tile in self.detail.items():
+            if ty1 <= y0 or ty0 >= y1 or tx1 <= x0 or tx0 >= x1:
+                continue
+            if tile.ndim != view.ndim:
+                tile = cv2.cvtColor(tile, cv2.COLOR_GRAY2BGR) if tile.ndim == 2 else cv2.cvtColor(tile, cv2.COLOR_BGR2GRAY)
+            _warp_into(tile, *self._transform(1.0, tx0, ty0), view)
+        return view
+
+
+def _warp_into(source, factor, tx, ty, view):
+    """source를 화면 좌표로 옮겨 view 위에 그림 (source 밖 화소는 그대로 둠)
+
+    화면에 보이는 source 영역만 잘라 화면 크기로 늘리거나 줄인다. 위치는 화면 화소
+    단위로 반올림되며, 배율이 1이면 (맞춤 보기, 1:1 보기) 보간 없이 복사만 한다.
+    """
+    height, width = view.shape[:2]
+    u0 = max(0, int(np.floor(-tx / factor)))
+    u1 = min(source.shape[1], int(np.ceil((width - tx) / factor)))
+    v0 = max(0, int(np.floor(-ty / factor)))
+    v1 = min(source.shape[0], int(np.ceil((height - ty) / factor)))
+    if u0 >= u1 or v0 >= v1:
+        return
+    x0, x1 = round(u0 * factor + tx), round(u1 * factor + tx)
+    y0, y1 = round(v0 * factor + ty), round(v1 * factor + ty)
+    if x0 >= x1 or y0 >= y1:
+        return
+    crop = source[v0:v1, u0:u1]
+    if crop.shape[:2] != (y1 - y0, x1 - x0):
+        interpolation = cv2.INTER_NEAREST if factor > 1.0 else cv2.INTER_LINEAR
+        crop = cv2.resize(crop, (x1 - x0, y1 - y0), interpolation=interpolation)
+    # 화면 밖으로 걸친 부분은 잘라냄
+    cx, cy = max(0, -x0), max(0, -y0)
+    x0, x1 = max(0, x0), min(width, x1)
+    y0, y1 = max(0, y0), min(height, y1)
+    view[y0:y1, x0:x1] = crop[cy:cy + y1 - y0, cx:cx + x1 - x0]
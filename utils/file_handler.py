@@ -1,18 +1,61 @@
-"""파일 핸들러"""
+"""파일 핸들러
+
+read_image / write_image는 progress(단계, 비율)와 is_cancelled()를 받아 작업자
+스레드에서 실행할 수 있다. cv2.imread / cv2.imencode는 중간에 멈출 수 없으므로
+진행률은 단계 단위로 알리고(비율 None), 취소는 단계 사이와 파일을 나누어 쓰는
+사이에 확인한다. 저장은 임시 파일에 쓴 뒤 바꿔치기하므로 취소하거나 실패해도
+기존 파일이 반쯤 쓰인 채로 남지 않는다.
+
+GUI의 필터와 표시는 3채널 uint8을 가정하므로, 메모리 맵으로 연 이미지가 그 형식이
+아니면 TIFF는 cv2.imread로 다시 읽고 .npy는 8비트 BGR로 바꾼다. 배치 / 타일 처리는
+raw=True로 원래 자료형의 메모리 맵을 그대로 받는다.
+"""
+import os
+
 import cv2
+import numpy as np
+from PIL import Image
 from tkinter import filedialog, messagebox
 
+from image_processing.pipeline import RenderCancelled
+from utils.memmap_io import create_image_memmap, flush, open_image_memmap
+
+
+# 나누어 쓸 때 한 번에 쓰는 크기
+WRITE_CHUNK_BYTES = 4 * 1024 * 1024
+
+# 축소 배율 -> 축소 디코딩 플래그 (JPEG은 DCT 단계에서 줄여 훨씬 빠름)
+REDUCED_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+IMAGE_FILETYPES = [("Image files", "*.jpg *.jpeg *.png *.bmp *.tif"),
+                   ("NumPy", "*.npy"),
+                   ("All files", "*.*")]
+
+SAVE_FILETYPES = [("JPEG", "*.jpg"), ("PNG", "*.png"),
+                  ("BMP", "*.bmp"), ("NumPy", "*.npy"), ("All files", "*.*")]
+
+
+def ask_open_path():
+    """불러올 이미지 경로 선택 (취소하면 빈 문자열)"""
+    return filedialog.askopenfilename(title="이미지 선택", filetypes=IMAGE_FILETYPES)
+
+
+def ask_save_path():
+    """저장할 경로 선택 (취소하면 빈 문자열)"""
+    return filedialog.asksaveasfilename(defaultextension=".jpg", filetypes=SAVE_FILETYPES)
+
 
 def load_image_file():
     """이미지 파일 불러오기"""
-    file_path = filedialog.askopenfilename(
-        title="이미지 선택",
-        filetypes=[("Image files", "*.jpg *.jpeg *.png *.bmp *.tif"), 
-                  ("All files", "*.*")]
-    )
+    file_path = ask_open_path()
     
     if file_path:
-        image = cv2.imread(file_path)
+        image = read_image(file_path)
         if image is not None:
             return image, file_path
         else:
@@ -27,16 +70,146 @@ def save_image_file(image):
         messagebox.showwarning("⚠️ 경고", "저장할 이미지가 없습니다.")
         return False
     
-    file_path = filedialog.asksaveasfilename(
-        defaultextension=".jpg",
-        filetypes=[("JPEG", "*.jpg"), ("PNG", "*.png"), 
-                  ("BMP", "*.bmp"), ("All files", "*.*")]
-    )
+    file_path = ask_save_path()
     
     if file_path:
-        cv2.imwrite(file_path, image)
+        write_image(file_path, image)
         messagebox.showinfo("✅ 완료", "이미지가 저장되었습니다.")
         return True
     return False
 
 
+def _check_cancelled(is_cancelled):
+    if is_cancelled is not None and is_cancelled():
+        raise RenderCancelled()
+
+
+def _open_memmap(file_path):
+    """.npy / 비압축 TIFF면 메모리 맵, 아니면 None (.npy를 열 수 없으면 ValueError)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in ('.npy', '.tif', '.tiff'):
+        try:
+            return open_image_memmap(file_path)
+        except (ValueError, KeyError) as e:
+            # 압축 / 빅 엔디언 16비트 TIFF 등은 일반 디코딩으로 처리
+            if ext == '.npy':
+                raise ValueError(f"이미지를 불러올 수 없습니다: {file_path} ({e})")
+    return None
+
+
+def _is_bgr8(image):
+    """GUI에서 그대로 쓸 수 있는 3채널 uint8 이미지인지 여부"""
+    return image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3
+
+
+def to_bgr8(image):
+    """3채널 uint8 BGR로 변환 (uint16은 상위 8비트, 실수는 0 ~ 1 범위를 0 ~ 255로)"""
+    if image.dtype == np.uint16:
+        image = (image >> 8).astype(np.uint8)
+    elif np.issubdtype(image.dtype, np.floating):
+        image = np.clip(image * 255, 0, 255).astype(np.uint8)
+    elif image.dtype != np.uint8:
+        image = cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+    if image.ndim == 2 or image.shape[2] == 1:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    return np.ascontiguousarray(image[:, :, :3])
+
+
+def image_size(file_path):
+    """디코딩하지 않고 헤더만 읽은 (너비, 높이) (모르면 None)"""
+    try:
+        with Image.open(file_path) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def preview_factor(width, height, max_width, max_height):
+    """max_width x max_height 화면을 채우는 데 충분한 가장 큰 축소 배율 (1, 2, 4, 8)"""
+    fit = min(max_width / width, max_height / height, 1.0)
+    factor = 1
+    while factor < 8 and 1.0 / (factor * 2) >= fit:
+        factor *= 2
+    return factor
+
+
+def read_preview(file_path, max_width, max_height):
+    """화면을 채울 만큼만 줄여 빠르게 디코딩한 미리보기 -> (이미지, 축소 배율)
+    (읽을 수 없으면 (None, 1))"""
+    try:
+        memmap = _open_memmap(file_path)
+    except ValueError:
+        return None, 1
+    # TIFF가 3채널 uint8이 아니면 cv2.imread의 축소 디코딩으로 처리
+    if memmap is not None and (_is_bgr8(memmap) or file_path.lower().endswith('.npy')):
+        height, width = memmap.shape[:2]
+        factor = preview_factor(width, height, max_width, max_height)
+        # 건너뛴 행은 읽지 않으므로 원본 크기에 비해 빠름
+        preview = memmap[::factor, ::factor]
+        return (np.ascontiguousarray(preview) if _is_bgr8(preview) else to_bgr8(preview)), factor
+    size = image_size(file_path)
+    factor = preview_factor(*size, max_width, max_height) if size else 1
+    preview = cv2.imread(file_path, REDUCED_FLAGS[factor])
+    return preview, factor
+
+
+def read_image(file_path, progress=None, is_cancelled=None, raw=False):
+    """이미지 읽기 (.npy / 비압축 TIFF는 전체를 풀지 않고 메모리 맵으로 열기)
+
+    raw가 거짓이면 3채널 uint8이 아닌 메모리 맵은 GUI에서 쓸 수 있게 8비트 BGR로 읽는다.
+    """
+    try:
+        memmap = _open_memmap(file_path)
+    except ValueError:
+        return None
+    if memmap is not None:
+        if raw or _is_bgr8(memmap):
+            return memmap
+        if file_path.lower().endswith('.npy'):
+            _check_cancelled(is_cancelled)
+            if progress is not None:
+                progress("변환", None)
+            return to_bgr8(memmap)
+    _check_cancelled(is_cancelled)
+    if progress is not None:
+        progress("디코딩", None)
+    return cv2.imread(file_path)
+
+
+def write_image(file_path, image, progress=None, is_cancelled=None):
+    """이미지 쓰기 (.npy는 메모리 맵으로 바로 기록, 취소하면 RenderCancelled)"""
+    root, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+    # 확장자로 형식을 정하므로 임시 파일도 같은 확장자로
+    temp_path = f"{root}.part{ext}"
+    try:
+        if ext == '.npy':
+            out = create_image_memmap(temp_path, image.shape, image.dtype)
+            rows = max(1, WRITE_CHUNK_BYTES // max(1, image[0].nbytes))
+            for y in range(0, image.shape[0], rows):
+                _check_cancelled(is_cancelled)
+                out[y:y + rows] = image[y:y + rows]
+                if progress is not None:
+                    progress("쓰기", min(1.0, (y + rows) / image.shape[0]))
+            flush(out)
+            del out
+        else:
+            if progress is not None:
+                progress("인코딩", None)
+            ok, encoded = cv2.imencode(ext, image)
+            if not ok:
+                return False
+            data = encoded.reshape(-1)
+            with open(temp_path, 'wb') as f:
+                for start in range(0, len(data), WRITE_CHUNK_BYTES):
+                    _check_cancelled(is_cancelled)
+                    f.write(data[start:start + WRITE_CHUNK_BYTES])
+                    if progress is not None:
+                        progress("쓰기", min(1.0, (start + WRITE_CHUNK_BYTES) / len(data)))
+        os.replace(temp_path, file_path)
+        return True
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,24 @@
+"""처음 쓸 때 불러오는 모듈
+
+cv2, numpy, PIL처럼 불러오는 데 오래 걸리는 모듈을 끌어오는 모듈을 lazy_import로
+가져오면 모듈 객체만 먼저 만들고, 실제 실행은 속성에 처음 접근할 때 한다.
+importlib.util.LazyLoader는 Python 3.11에서 여러 스레드가 동시에 처음 접근하면
+안전하지 않으므로, 이렇게 가져온 모듈은 메인 스레드에서 먼저 쓰도록 한다.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """속성에 처음 접근할 때 실행되는 모듈 (이미 불러온 모듈이면 그대로 반환)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
@@ -0,0 +1,209 @@
+"""메모리 맵 이미지 입출력 (.npy / raw / 비압축 TIFF)
+
+cv2.imread / cv2.imwrite는 이미지 전체를 메모리에 풀어야 하지만, 비압축 형식은
+파일을 그대로 np.memmap으로 열 수 있다. 타일 실행과 함께 쓰면 수 GB 이미지도
+타일 크기만큼의 메모리로 처리할 수 있다.
+
+TIFF는 RGB 순서로 저장되므로 채널 축을 뒤집은 뷰(복사 없음)를 돌려주어
+OpenCV와 같은 BGR 순서로 다룰 수 있게 한다.
+"""
+import os
+import struct
+
+import numpy as np
+
+
+MEMMAP_EXTENSIONS = ('.npy', '.raw', '.bin', '.tif', '.tiff')
+
+# TIFF 태그
+_TAG_WIDTH = 256
+_TAG_HEIGHT = 257
+_TAG_BITS = 258
+_TAG_COMPRESSION = 259
+_TAG_PHOTOMETRIC = 262
+_TAG_STRIP_OFFSETS = 273
+_TAG_SAMPLES = 277
+_TAG_ROWS_PER_STRIP = 278
+_TAG_STRIP_BYTES = 279
+_TAG_PLANAR = 284
+
+# TIFF 자료형 -> (struct 형식, 크기)
+_TIFF_TYPES = {1: ('B', 1), 3: ('H', 2), 4: ('I', 4)}
+
+
+def is_memmap_format(path):
+    """메모리 맵으로 열 수 있는 확장자인지 여부"""
+    return os.path.splitext(path)[1].lower() in MEMMAP_EXTENSIONS
+
+
+def _read_tiff_tags(f):
+    """첫 번째 IFD의 태그 읽기 -> (바이트 순서, {태그: 값 목록})"""
+    order = f.read(2)
+    if order == b'II':
+        endian = '<'
+    elif order == b'MM':
+        endian = '>'
+    else:
+        raise ValueError("TIFF 파일이 아닙니다")
+    magic, ifd_offset = struct.unpack(endian + 'HI', f.read(6))
+    if magic != 42:
+        raise ValueError("BigTIFF 등 지원하지 않는 TIFF 형식입니다")
+
+    f.seek(ifd_offset)
+    (count,) = struct.unpack(endian + 'H', f.read(2))
+    tags = {}
+    for _ in range(count):
+        tag, typ, n, value = struct.unpack(endian + 'HHI4s', f.read(12))
+        if typ not in _TIFF_TYPES:
+            continue
+        fmt, size = _TIFF_TYPES[typ]
+        if n * size <= 4:
+            raw = value[:n * size]
+        else:
+            (offset,) = struct.unpack(endian + 'I', value)
+            position = f.tell()
+            f.seek(offset)
+            raw = f.read(n * size)
+            f.seek(position)
+        tags[tag] = list(struct.unpack(endian + fmt * n, raw))
+    return endian, tags
+
+
+def _check_native(dtype):
+    """여러 바이트 자료형이 현재 시스템의 바이트 순서인지 확인 (아니면 ValueError)
+
+    OpenCV 함수는 바이트 순서가 다른 배열(>u2 등)을 받지 않거나 잘못 읽는다.
+    변환하려면 전체를 복사해야 하므로 메모리 맵으로는 열지 않는다.
+    """
+    if dtype.itemsize > 1 and not dtype.isnative:
+        raise ValueError(f"바이트 순서가 다른 {dtype.itemsize * 8}비트 이미지는 메모리 맵으로 열 수 없습니다")
+
+
+def _open_tiff(path, mode):
+    """비압축, 연속 스트립 TIFF를 메모리 맵으로 열기"""
+    with open(path, 'rb') as f:
+        endian, tags = _read_tiff_tags(f)
+
+    if tags.get(_TAG_COMPRESSION, [1])[0] != 1:
+        raise ValueError("압축된 TIFF는 메모리 맵으로 열 수 없습니다")
+    if tags.get(_TAG_PLANAR, [1])[0] != 1:
+        raise ValueError("채널 분리(planar) TIFF는 지원하지 않습니다")
+
+    width = tags[_TAG_WIDTH][0]
+    height = tags[_TAG_HEIGHT][0]
+    samples = tags.get(_TAG_SAMPLES, [1])[0]
+    bits = tags.get(_TAG_BITS, [8])[0]
+    if bits not in (8, 16):
+        raise ValueError(f"지원하지 않는 비트 수입니다: {bits}")
+    dtype = np.dtype(np.uint8 if bits == 8 else endian + 'u2')
+    # 빅 엔디언(MM) 16비트 TIFF는 일반 디코딩(cv2.imread)으로 처리하도록 거절
+    _check_native(dtype)
+
+    # 스트립이 빈틈없이 이어져 있어야 하나의 배열로 볼 수 있음
+    offsets = tags[_TAG_STRIP_OFFSETS]
+    counts = tags[_TAG_STRIP_BYTES]
+    for offset, count, next_offset in zip(offsets, counts, offsets[1:]):
+        if offset + count != next_offset:
+            raise ValueError("스트립이 연속되지 않은 TIFF는 메모리 맵으로 열 수 없습니다")
+
+    shape = (height, width, samples) if samples > 1 else (height, width)
+    array = np.memmap(path, dtype=dtype, mode=mode, offset=offsets[0], shape=shape)
+    if samples >= 3:
+        # RGB -> BGR 순서의 뷰 (cv2.imread처럼 알파 채널은 제외)
+        return array[:, :, 2::-1]
+    return array
+
+
+def open_image_memmap(path, shape=None, dtype=np.uint8, writable=False):
+    """이미지 파일을 메모리 맵 배열로 열기
+
+    raw / bin 파일은 헤더가 없으므로 shape(과 dtype)를 반드시 지정해야 한다.
+    """
+    mode = 'r+' if writable else 'r'
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        array = np.load(path, mmap_mode=mode)
+        _check_native(array.dtype)
+        return array
+    if ext in ('.tif', '.tiff'):
+        return _open_tiff(path, mode)
+    if ext in ('.raw', '.bin'):
+        if shape is None:
+            raise ValueError("raw 파일은 shape를 지정해야 합니다")
+        return np.memmap(path, dtype=dtype, mode=mode, shape=tuple(shape))
+    raise ValueError(f"메모리 맵을 지원하지 않는 형식입니다: {ext}")
+
+
+def _write_tiff_header(path, shape, dtype):
+    """단일 스트립 비압축 TIFF 헤더를 쓰고 화소 데이터 시작 위치 반환"""
+    height, width = shape[:2]
+    samples = shape[2] if len(shape) == 3 else 1
+    if samples not in (1, 3):
+        raise ValueError("TIFF 출력은 1채널 또는 3채널만 지원합니다")
+    bits = dtype.itemsize * 8
+    data_bytes = height * width * samples * dtype.itemsize
+    if data_bytes >= 2 ** 32:
+        raise ValueError("4GB 이상은 일반 TIFF로 저장할 수 없습니다 (.npy 사용)")
+
+    entries = 10
+    ifd_offset = 8
+    bits_offset = ifd_offset + 2 + entries * 12 + 4
+    data_offset = bits_offset + 2 * samples
+    data_offset += data_offset % 2
+
+    def entry(tag, typ, count, value):
+        if typ == 3 and count == 1:
+            return struct.pack('<HHIHH', tag, typ, count, value, 0)
+        return struct.pack('<HHII', tag, typ, count, value)
+
+    photometric = 2 if samples == 3 else 1
+    # 채널별 비트 수가 4바이트를 넘으면 IFD 뒤에 따로 기록
+    bits_entry = entry(_TAG_BITS, 3, samples, bits if samples == 1 else bits_offset)
+
+    with open(path, 'wb') as f:
+        f.write(b'II' + struct.pack('<HI', 42, ifd_offset))
+        f.write(struct.pack('<H', entries))
+        f.write(entry(_TAG_WIDTH, 4, 1, width))
+        f.write(entry(_TAG_HEIGHT, 4, 1, height))
+        f.write(bits_entry)
+        f.write(entry(_TAG_COMPRESSION, 3, 1, 1))
+        f.write(entry(_TAG_PHOTOMETRIC, 3, 1, photometric))
+        f.write(entry(_TAG_STRIP_OFFSETS, 4, 1, data_offset))
+        f.write(entry(_TAG_SAMPLES, 3, 1, samples))
+        f.write(entry(_TAG_ROWS_PER_STRIP, 4, 1, height))
+        f.write(entry(_TAG_STRIP_BYTES, 4, 1, data_bytes))
+        f.write(entry(_TAG_PLANAR, 3, 1, 1))
+        f.write(struct.pack('<I', 0))
+        f.write(struct.pack('<' + 'H' * samples, *([bits] * samples)))
+        f.write(b'\0' * (data_offset - f.tell()))
+        # 화소 영역만큼 파일 크기 확보 (실제 디스크 할당은 쓰기 시점)
+        f.truncate(data_offset + data_bytes)
+    return data_offset
+
+
+def create_image_memmap(path, shape, dtype=np.uint8):
+    """결과를 바로 써 넣을 수 있는 메모리 맵 출력 배열 생성 (BGR 순서로 쓰기)"""
+    dtype = np.dtype(dtype)
+    shape = tuple(shape)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    if ext in ('.tif', '.tiff'):
+        offset = _write_tiff_header(path, shape, dtype)
+        array = np.memmap(path, dtype=dtype, mode='r+', offset=offset, shape=shape)
+        if len(shape) == 3 and shape[2] == 3:
+            # BGR로 쓰면 파일에는 RGB로 저장되는 뷰
+            return array[:, :, ::-1]
+        return array
+    if ext in ('.raw', '.bin'):
+        return np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+    raise ValueError(f"메모리 맵을 지원하지 않는 형식입니다: {ext}")
+
+
+def flush(array):
+    """메모리 맵(또는 그 뷰)의 변경 내용을 디스크에 반영"""
+    base = array
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    if base is not None:
+        base.flush()